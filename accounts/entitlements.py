@@ -0,0 +1,137 @@
+"""
+Per-request memoized view of what a user can access.
+
+Access checks (User.has_active_subscription, get_free_ai_remaining,
+Document.can_use_ai, get_ai_usage_display, ...) used to query the
+subscription, document packs and free AI usage again on every call. They now
+read an Entitlements object that loads each of those at most once.
+
+Within a request, EntitlementsMiddleware keeps one Entitlements per user id,
+so request.user and document.user (separate instances of the same user)
+share it. Outside a request (jobs, management commands) it is memoized on
+the user instance:
+
+    entitlements = get_entitlements(document.user)
+    if entitlements.has_subscription:
+        ...
+
+Writes that change usage (Document.record_ai_usage, User.use_document_credit)
+call invalidate() so later checks in the same request see the new values.
+"""
+import contextvars
+from functools import cached_property
+
+from django.conf import settings
+
+_request_store = contextvars.ContextVar('entitlements_store', default=None)
+
+# Values loaded from the database; dropped by invalidate()
+_MEMOIZED = ('subscription', 'document_credits', 'free_ai_used')
+
+
+class Entitlements:
+    """Subscription, credits, free AI remaining and unlimited access for one user."""
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def unlimited(self):
+        """Admin/staff have unlimited access."""
+        return self.user.is_staff or self.user.is_superuser
+
+    @cached_property
+    def subscription(self):
+        """The user's Subscription (any status) or None."""
+        from .models import Subscription
+        return Subscription.objects.filter(user_id=self.user.pk).first()
+
+    @property
+    def active_subscription(self):
+        subscription = self.subscription
+        return subscription if subscription is not None and subscription.is_active else None
+
+    @property
+    def has_subscription(self):
+        return self.active_subscription is not None
+
+    @cached_property
+    def document_credits(self):
+        """Remaining document credits across all packs."""
+        from django.db.models import F, Sum
+        from django.db.models.functions import Greatest
+        from .models import DocumentPack
+
+        return DocumentPack.objects.filter(user_id=self.user.pk).aggregate(
+            total=Sum(Greatest(F('documents_included') - F('documents_used'), 0))
+        )['total'] or 0
+
+    @cached_property
+    def free_ai_used(self):
+        """Free AI generations used across the user's draft documents."""
+        from django.db.models import Sum
+        from documents.models import Document
+
+        return Document.objects.filter(user_id=self.user.pk, payment_status='draft').aggregate(
+            total=Sum('ai_generations_used')
+        )['total'] or 0
+
+    @property
+    def free_ai_remaining(self):
+        if self.unlimited:
+            return 999  # Unlimited
+        return max(0, settings.FREE_AI_GENERATIONS - self.free_ai_used)
+
+    @property
+    def can_use_free_ai(self):
+        return self.unlimited or self.free_ai_used < settings.FREE_AI_GENERATIONS
+
+    @property
+    def subscription_ai_remaining(self):
+        # Read live from the subscription so record_ai_use() is reflected
+        subscription = self.active_subscription
+        return subscription.get_ai_remaining() if subscription else 0
+
+    @property
+    def can_use_subscription_ai(self):
+        subscription = self.active_subscription
+        return subscription.can_use_ai() if subscription else False
+
+    def summary(self):
+        """Access summary for display (User.get_access_summary)."""
+        return {
+            'has_subscription': self.has_subscription,
+            'subscription': self.active_subscription,
+            'document_credits': self.document_credits,
+            'free_ai_remaining': self.free_ai_remaining,
+            'has_unlimited': self.unlimited,
+        }
+
+    def invalidate(self):
+        """Forget loaded values after a write that changes usage or credits."""
+        for name in _MEMOIZED:
+            self.__dict__.pop(name, None)
+
+
+def get_entitlements(user):
+    """Entitlements for a user, shared across the current request (or memoized on the instance)."""
+    store = _request_store.get()
+    if store is not None and user.pk is not None:
+        entitlements = store.get(user.pk)
+        if entitlements is None:
+            entitlements = store[user.pk] = Entitlements(user)
+        return entitlements
+
+    entitlements = user.__dict__.get('_entitlements')
+    if entitlements is None:
+        entitlements = user.__dict__['_entitlements'] = Entitlements(user)
+    return entitlements
+
+
+def start_request():
+    """Begin a request-scoped store. Returns a token for end_request()."""
+    return _request_store.set({})
+
+
+def end_request(token):
+    _request_store.reset(token)
@@ -0,0 +1,22 @@
+"""
+Request middleware for the accounts app.
+"""
+from . import entitlements
+
+
+class EntitlementsMiddleware:
+    """
+    Scope Entitlements to the request, so every access check made while
+    handling it - on request.user or on document.user - shares one set of
+    subscription/credit/usage lookups.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = entitlements.start_request()
+        try:
+            return self.get_response(request)
+        finally:
+            entitlements.end_request(token)
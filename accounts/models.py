@@ -1,3 +1,5 @@
+import threading
+
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.conf import settings
@@ -116,30 +118,27 @@ class User(AbstractBaseUser, PermissionsMixin):
             parts.append(city_state_zip)
         return '\n'.join(filter(None, parts))
 
+    @property
+    def entitlements(self):
+        """Memoized access checks for this user (see accounts.entitlements)."""
+        from .entitlements import get_entitlements
+        return get_entitlements(self)
+
     def has_unlimited_access(self):
         """Check if user has unlimited access (admin/staff)."""
-        return self.is_staff or self.is_superuser
+        return self.entitlements.unlimited
 
     def get_total_free_ai_uses(self):
         """Get total free AI generations used across all draft documents."""
-        return self.documents.filter(
-            payment_status='draft'
-        ).aggregate(
-            total=models.Sum('ai_generations_used')
-        )['total'] or 0
+        return self.entitlements.free_ai_used
 
     def can_use_free_ai(self):
         """Check if user can still use free AI generations."""
-        if self.has_unlimited_access():
-            return True
-        return self.get_total_free_ai_uses() < settings.FREE_AI_GENERATIONS
+        return self.entitlements.can_use_free_ai
 
     def get_free_ai_remaining(self):
         """Get remaining free AI generations for this user."""
-        if self.has_unlimited_access():
-            return 999  # Unlimited
-        remaining = settings.FREE_AI_GENERATIONS - self.get_total_free_ai_uses()
-        return max(0, remaining)
+        return self.entitlements.free_ai_remaining
 
     def get_total_referral_earnings(self):
         """Get total earnings from all promo codes."""
@@ -201,29 +200,21 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def has_active_subscription(self):
         """Check if user has an active subscription."""
-        try:
-            return self.subscription.is_active()
-        except Subscription.DoesNotExist:
-            return False
+        return self.entitlements.has_subscription
 
     def get_subscription(self):
         """Get user's subscription or None."""
-        try:
-            return self.subscription
-        except Subscription.DoesNotExist:
-            return None
+        return self.entitlements.subscription
 
     def get_document_credits(self):
         """Get total remaining document credits from packs."""
-        return sum(
-            pack.documents_remaining()
-            for pack in self.document_packs.all()
-        )
+        return self.entitlements.document_credits
 
     def use_document_credit(self):
         """Use a document credit from oldest pack. Returns True if successful."""
         for pack in self.document_packs.order_by('created_at'):
             if pack.use_document():
+                self.entitlements.invalidate()
                 return True
         return False
 
@@ -239,15 +230,11 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def get_subscription_ai_remaining(self):
         """Get remaining AI uses from subscription."""
-        if self.has_active_subscription():
-            return self.subscription.get_ai_remaining()
-        return 0
+        return self.entitlements.subscription_ai_remaining
 
     def can_use_subscription_ai(self):
         """Check if user can use AI via subscription."""
-        if self.has_active_subscription():
-            return self.subscription.can_use_ai()
-        return False
+        return self.entitlements.can_use_subscription_ai
 
     def can_use_video_analysis(self):
         """
@@ -281,22 +268,7 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def get_access_summary(self):
         """Get a summary of user's current access for display."""
-        summary = {
-            'has_subscription': False,
-            'subscription': None,
-            'document_credits': 0,
-            'free_ai_remaining': 0,
-            'has_unlimited': self.has_unlimited_access(),
-        }
-
-        if self.has_active_subscription():
-            summary['has_subscription'] = True
-            summary['subscription'] = self.get_subscription()
-
-        summary['document_credits'] = self.get_document_credits()
-        summary['free_ai_remaining'] = self.get_free_ai_remaining()
-
-        return summary
+        return self.entitlements.summary()
 
 
 class SiteSettings(models.Model):
@@ -433,6 +405,11 @@ class SiteSettings(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # In-process cache for get_settings()
+    _cached = None
+    _cached_checked_at = 0.0
+    _cache_lock = threading.RLock()  # get_or_create -> save() -> clear_cache() re-enters
+
     class Meta:
         verbose_name = 'Site Settings'
         verbose_name_plural = 'Site Settings'
@@ -445,6 +422,7 @@ class SiteSettings(models.Model):
         is_new = not SiteSettings.objects.filter(pk=1).exists()
         self.pk = 1
         super().save(*args, **kwargs)
+        SiteSettings.clear_cache()
 
         # Auto-create legal documents if this is the first save
         if is_new:
@@ -562,9 +540,35 @@ class SiteSettings(models.Model):
 
     @classmethod
     def get_settings(cls):
-        """Get or create the singleton settings instance."""
-        settings, created = cls.objects.get_or_create(pk=1)
-        return settings
+        """
+        Get the singleton settings instance from the in-process cache.
+
+        The cached instance is reused until its version stamp (updated_at)
+        changes, which is re-read at most every SITE_SETTINGS_CHECK_SECONDS;
+        a save in this process replaces it immediately. Treat the returned
+        instance as read-only - load a fresh one to edit it.
+        """
+        import time
+
+        interval = getattr(settings, 'SITE_SETTINGS_CHECK_SECONDS', 30)
+        with cls._cache_lock:
+            now = time.monotonic()
+            cached = cls._cached
+            if cached is not None and now - cls._cached_checked_at < interval:
+                return cached
+
+            stamp = cls.objects.filter(pk=1).values_list('updated_at', flat=True).first()
+            if cached is None or stamp is None or stamp != cached.updated_at:
+                cached, created = cls.objects.get_or_create(pk=1)
+                cls._cached = cached
+            cls._cached_checked_at = now
+            return cached
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop the cached instance; the next get_settings() reloads it."""
+        with cls._cache_lock:
+            cls._cached = None
 
 
 class LegalDocument(models.Model):
@@ -714,7 +718,7 @@ class Subscription(models.Model):
 
     def can_use_ai(self):
         """Check if subscriber can use AI."""
-        if not self.is_active():
+        if not self.is_active:
             return False
         return self.ai_uses_this_period < self.get_ai_limit()
 
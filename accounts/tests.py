@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from .middleware import EntitlementsMiddleware
+from .models import DocumentPack, SiteSettings
+
+
+class EntitlementsTests(TestCase):
+    """Access checks load the subscription, credits and free AI usage once."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='member@example.com', password='pw')
+        DocumentPack.objects.create(
+            user=self.user, pack_type='3pack', documents_included=3,
+            stripe_payment_id='pi_test', amount_paid=Decimal('99.00'),
+        )
+
+    def in_request(self, view):
+        return EntitlementsMiddleware(view)(RequestFactory().get('/'))
+
+    def test_request_shares_lookups_across_user_instances(self):
+        User = get_user_model()
+
+        def view(request):
+            # request.user and document.user are separate instances of one user
+            request_user, document_user = User.objects.get(pk=self.user.pk), User.objects.get(pk=self.user.pk)
+            with self.assertNumQueries(3):
+                request_user.get_access_summary()
+                document_user.get_access_summary()
+                self.assertFalse(document_user.has_active_subscription())
+                self.assertEqual(document_user.get_document_credits(), 3)
+            return HttpResponse()
+
+        self.in_request(view)
+
+    def test_each_request_starts_fresh(self):
+        def view(request):
+            get_user_model().objects.get(pk=self.user.pk).get_document_credits()
+            return HttpResponse()
+
+        with self.assertNumQueries(2):
+            self.in_request(view)
+        with self.assertNumQueries(2):
+            self.in_request(view)
+
+    def test_credit_use_invalidates(self):
+        def view(request):
+            user = get_user_model().objects.get(pk=self.user.pk)
+            self.assertEqual(user.get_document_credits(), 3)
+            self.assertTrue(user.use_document_credit())
+            self.assertEqual(user.get_document_credits(), 2)
+            return HttpResponse()
+
+        self.in_request(view)
+
+
+class SiteSettingsCacheTests(TestCase):
+    def setUp(self):
+        SiteSettings.clear_cache()
+        self.addCleanup(SiteSettings.clear_cache)
+
+    def test_served_from_process_cache(self):
+        SiteSettings.get_settings()
+        with self.assertNumQueries(0):
+            SiteSettings.get_settings()
+
+    def test_save_replaces_cached_instance(self):
+        site = SiteSettings.objects.get(pk=SiteSettings.get_settings().pk)
+        site.save()
+        self.assertIsNot(SiteSettings.get_settings(), site)
+        self.assertEqual(SiteSettings.get_settings().updated_at, site.updated_at)
@@ -337,12 +337,9 @@ def subscribe(request, plan):
         return redirect('accounts:pricing')
 
     # Check if user already has active subscription
-    try:
-        if request.user.subscription.is_active():
-            messages.info(request, 'You already have an active subscription.')
-            return redirect('accounts:subscription_manage')
-    except Subscription.DoesNotExist:
-        pass
+    if request.user.has_active_subscription():
+        messages.info(request, 'You already have an active subscription.')
+        return redirect('accounts:subscription_manage')
 
     # Get price ID based on plan
     if plan == 'monthly':
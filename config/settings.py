@@ -36,12 +36,15 @@ SITE_ID = 1
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files in production
+    'public_pages.prerender.PrerenderedPagesMiddleware',  # Pre-rendered public pages (PRERENDER_PUBLIC_PAGES)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.EntitlementsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'documents.middleware.AICallContextMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -191,6 +194,107 @@ ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@1983law.com')
 
 # OpenAI API Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))  # Max concurrent requests per process (async fan-out)
+PROMPT_REGISTRY_CHECK_SECONDS = 5          # Max seconds before other processes pick up an AIPrompt edit
+AI_INPUT_TOKEN_BUDGET = 12000              # Default token budget for case inputs (AIPrompt.max_input_tokens overrides)
+
+# Complaint generation (DocumentGenerator) - AI sections run in parallel under the 120s gunicorn timeout
+DOCUMENT_GENERATION_WORKERS = 4            # Concurrent AI section calls per complaint
+DOCUMENT_SECTION_TIMEOUT = 60              # Seconds per AI section call
+DOCUMENT_GENERATION_TIMEOUT = 100          # Overall seconds before unfinished sections get placeholder text
+
+# =============================================================================
+# AI RESPONSE CACHE (shared across users, see documents/services/ai_response_cache.py)
+# =============================================================================
+AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', '1') == '1'
+AI_CACHE_MAX_ENTRIES = 5000                # LRU eviction above this many entries
+
+# TTL in seconds per prompt type (0 = don't cache). Location-only lookups change rarely.
+AI_CACHE_TTL = {
+    'default': 0,
+    'parse_story': 60 * 60 * 24,                       # 1 day (wizard retries, re-parses)
+    'suggest_relief': 60 * 60 * 24,                    # 1 day
+    'review_document': 60 * 60,                        # 1 hour
+    'find_law_enforcement': 60 * 60 * 24 * 30,         # 30 days
+    'identify_officer_agency': 60 * 60 * 24 * 30,      # 30 days
+    'lookup_agency_address': 60 * 60 * 24 * 30,        # 30 days
+    'lookup_agency_address_parse': 60 * 60 * 24 * 30,  # 30 days
+    'lookup_federal_court': 60 * 60 * 24 * 90,         # 90 days
+    'lookup_federal_court_parse': 60 * 60 * 24 * 90,   # 90 days
+}
+
+# Jurisdiction records (saved agency/address lookups) - refresh policy
+JURISDICTION_REFRESH_DAYS = 90             # Re-fetch GPT-sourced agency data after this many days
+JURISDICTION_VERIFIED_REFRESH_DAYS = 365   # Staff-verified records are only flagged stale after this
+
+# Batch court lookups (CourtLookupService.lookup_many) - GPT fallback for cities not in the offline data
+COURT_LOOKUP_BATCH_CONCURRENCY = 4         # Concurrent GPT fallback lookups
+COURT_LOOKUP_BATCH_RATE = 2.0              # Max GPT fallback lookups started per second
+
+# =============================================================================
+# AI CALL LOG (token/cost accounting, see documents/services/ai_call_log.py)
+# =============================================================================
+AI_CALL_LOG_ENABLED = os.getenv('AI_CALL_LOG_ENABLED', '1') == '1'
+AI_CALL_LOG_BATCH_SIZE = 50                # Flush as soon as this many calls are buffered
+AI_CALL_LOG_FLUSH_SECONDS = 10             # ...or at least this often
+
+# USD per 1M tokens (input, output). Longest matching prefix wins; unknown models cost 0.
+AI_MODEL_PRICING = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1': (2.00, 8.00),
+}
+AI_WEB_SEARCH_CALL_COST = 0.025            # USD per Responses API call with web search
+
+# =============================================================================
+# BACKGROUND JOB QUEUE (processed by `python manage.py run_workers`)
+# =============================================================================
+JOB_QUEUE_CONCURRENCY = int(os.getenv('JOB_QUEUE_CONCURRENCY', '2'))          # Worker threads per process
+JOB_QUEUE_POLL_INTERVAL = float(os.getenv('JOB_QUEUE_POLL_INTERVAL', '1.0'))  # Seconds between polls when idle
+JOB_QUEUE_MAX_ATTEMPTS = 3                 # Attempts before a job is failed for good
+JOB_QUEUE_VISIBILITY_TIMEOUT = 300         # Seconds before a running job is considered stuck
+JOB_QUEUE_RETRY_BACKOFF = 15               # Seconds before first retry (doubles each attempt)
+JOB_QUEUE_RETRY_BACKOFF_MAX = 300          # Max seconds between retries
+JOB_QUEUE_RECOVERY_INTERVAL = 60           # Seconds between stuck-job recovery sweeps
+
+# Job progress events (documents:job_events stream, see documents/services/event_bus.py)
+EVENT_BUS_BACKEND = os.getenv('EVENT_BUS_BACKEND', 'auto')  # 'postgres' (LISTEN/NOTIFY), 'memory' (dev), or 'auto'
+JOB_EVENTS_MAX_SECONDS = 120               # Stream lifetime before the browser reconnects
+JOB_EVENTS_HEARTBEAT_SECONDS = 15          # Keep-alive comment interval (also detects closed connections)
+
+# =============================================================================
+# PDF ARTIFACT STORE (see documents/services/artifact_store.py)
+# =============================================================================
+# Filesystem by default (the directory must be shared by web and worker instances).
+# Set PDF_ARTIFACT_BACKEND=s3 for S3 or an S3-compatible service (e.g. MinIO locally
+# with PDF_ARTIFACT_S3_ENDPOINT_URL=http://localhost:9000). S3 requires boto3.
+if os.getenv('PDF_ARTIFACT_BACKEND', 'filesystem') == 's3':
+    PDF_ARTIFACT_STORE = {
+        'BACKEND': 'documents.services.artifact_store.S3ArtifactStore',
+        'OPTIONS': {
+            'bucket': os.getenv('PDF_ARTIFACT_S3_BUCKET', ''),
+            'prefix': os.getenv('PDF_ARTIFACT_S3_PREFIX', 'pdf-artifacts/'),
+            'endpoint_url': os.getenv('PDF_ARTIFACT_S3_ENDPOINT_URL', ''),
+            'region_name': os.getenv('PDF_ARTIFACT_S3_REGION', ''),
+            'access_key_id': os.getenv('PDF_ARTIFACT_S3_ACCESS_KEY_ID', ''),
+            'secret_access_key': os.getenv('PDF_ARTIFACT_S3_SECRET_ACCESS_KEY', ''),
+        },
+    }
+else:
+    PDF_ARTIFACT_STORE = {
+        'BACKEND': 'documents.services.artifact_store.FileSystemArtifactStore',
+        'OPTIONS': {
+            'root': os.getenv('PDF_ARTIFACT_ROOT', str(BASE_DIR / 'pdf_artifacts')),
+        },
+    }
+PDF_ARTIFACT_RETENTION_DAYS = 30           # cleanup_pdf_artifacts deletes artifacts older than this
+
+# WeasyPrint render pool (see documents/services/pdf_render_service.py)
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))  # Render processes per web/worker process (0 = render in-process)
+PDF_RENDER_MAX_TASKS_PER_WORKER = 50       # Renders before a render process is replaced (caps memory growth)
+PDF_RENDER_TIMEOUT = 90                    # Seconds to wait for a render
 
 # Supadata API Configuration (YouTube transcript extraction)
 SUPADATA_API_KEY = os.getenv('SUPADATA_API_KEY', '')
@@ -198,6 +302,16 @@ SUPADATA_API_KEY = os.getenv('SUPADATA_API_KEY', '')
 # App Branding
 APP_NAME = os.getenv('APP_NAME', '1983law.com')  # Used in footer and watermark
 HEADER_APP_NAME = os.getenv('HEADER_APP_NAME', '1983 Law')  # Used in header/navbar
+SITE_SETTINGS_CHECK_SECONDS = 30  # Max seconds before other processes pick up a SiteSettings edit
+
+# Public page cache (anonymous visitors; see public_pages.cache)
+PUBLIC_PAGE_CACHE_SECONDS = int(os.getenv('PUBLIC_PAGE_CACHE_SECONDS', '600'))
+PUBLIC_PAGE_CACHE_CHECK_SECONDS = 30  # Max seconds before other processes pick up a CMS edit
+
+# Static pre-rendered public pages (manage.py prerender_public_pages; see public_pages.prerender)
+PRERENDER_PUBLIC_PAGES = os.getenv('PRERENDER_PUBLIC_PAGES', '0') == '1'  # Serve them and re-render on CMS saves
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+PRERENDER_HOST = os.getenv('PRERENDER_HOST', '')  # Public host for canonical links/sitemap; '' = the Site domain
 
 # CKEditor Configuration
 # =============================================================================
@@ -5,7 +5,9 @@ from .models import (
     Defendant, IncidentNarrative, RightsViolated, Witness,
     Evidence, Damages, PriorComplaints, ReliefSought,
     PromoCode, PromoCodeUsage, PayoutRequest, AIPrompt,
-    VideoEvidence, VideoCapture, VideoSpeaker, WizardSession,
+    VideoEvidence, VideoCapture, VideoSpeaker, WizardSession, WizardStep,
+    BackgroundJob, AIResponseCacheEntry, AIResponseCacheStats, JurisdictionRecord,
+    AICallLog,
 )
 
 
@@ -22,8 +24,9 @@ class DocumentAdmin(admin.ModelAdmin):
         'ai_generations_used', 'amount_paid', 'created_at'
     ]
     list_filter = ['payment_status', 'created_at']
+    list_select_related = ['user']
     search_fields = ['title', 'user__email']
-    readonly_fields = ['stripe_payment_id', 'paid_at', 'finalized_at', 'ai_cost_used']
+    readonly_fields = ['stripe_payment_id', 'paid_at', 'finalized_at', 'ai_cost_used', 'sections_done', 'sections_total']
     inlines = [DocumentSectionInline]
 
     fieldsets = (
@@ -40,6 +43,9 @@ class DocumentAdmin(admin.ModelAdmin):
         ('AI Usage', {
             'fields': ('ai_generations_used', 'ai_cost_used')
         }),
+        ('Progress', {
+            'fields': ('sections_done', 'sections_total')
+        }),
     )
 
     def get_completion_percentage(self, obj):
@@ -53,20 +59,24 @@ class DocumentSectionAdmin(admin.ModelAdmin):
     list_filter = ['section_type', 'status']
 
 
+class WizardStepInline(admin.TabularInline):
+    model = WizardStep
+    extra = 0
+    fields = ['step_number', 'incident_date', 'incident_time', 'city', 'state', 'data', 'updated_at']
+    readonly_fields = ['updated_at']
+
+
 @admin.register(WizardSession)
 class WizardSessionAdmin(admin.ModelAdmin):
     list_display = ['document', 'status', 'current_step', 'analysis_status', 'updated_at']
     list_filter = ['status', 'analysis_status']
     search_fields = ['document__title', 'document__user__email', 'slug']
-    readonly_fields = ['slug', 'created_at', 'updated_at']
+    readonly_fields = ['slug', 'revision', 'created_at', 'updated_at']
+    inlines = [WizardStepInline]
 
     fieldsets = (
         ('Session', {
-            'fields': ('document', 'slug', 'status', 'current_step', 'analysis_status')
-        }),
-        ('Interview Data (JSON)', {
-            'fields': ('interview_data',),
-            'description': 'Raw step data saved by the user. court_district_confirmed lives in step_1.'
+            'fields': ('document', 'slug', 'status', 'current_step', 'revision', 'analysis_status')
         }),
         ('AI Data', {
             'fields': ('raw_story', 'ai_extracted', 'ai_analysis'),
@@ -237,12 +247,18 @@ class AIPromptAdmin(admin.ModelAdmin):
         }),
         ('Prompt Template', {
             'fields': ('user_prompt_template', 'available_variables'),
-            'description': 'The main prompt. Use {variable_name} for placeholders. Example: {city}, {state}, {story_text}'
+            'description': 'The main prompt. Use {variable_name} for placeholders. Example: {city}, {state}, {story_text}. '
+                           'Every placeholder must be listed in available variables; use {{ and }} for literal braces.'
         }),
         ('AI Settings', {
             'fields': ('model_name', 'temperature', 'max_tokens'),
             'description': 'Temperature: 0.0 = consistent, 1.0 = creative. max_tokens limits response length.'
         }),
+        ('Input Budget & Model Routing', {
+            'fields': ('max_input_tokens', 'small_model_name', 'small_model_max_input_tokens'),
+            'description': 'Long stories, transcripts and documents are trimmed to the input budget before sending. '
+                           'Requests at or under the small-model limit go to the small model instead.'
+        }),
         ('Status', {
             'fields': ('is_active', 'version'),
             'description': 'Disable to fall back to hardcoded prompt. Increment version when making major changes.'
@@ -350,3 +366,164 @@ class VideoSpeakerAdmin(admin.ModelAdmin):
     list_display = ['label', 'video_evidence', 'defendant', 'is_plaintiff']
     list_filter = ['is_plaintiff']
     search_fields = ['label', 'video_evidence__video_title', 'defendant__name']
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['job_type', 'reference', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at']
+    list_filter = ['job_type', 'status']
+    search_fields = ['reference', 'last_error']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'locked_by', 'locked_until']
+    actions = ['requeue_jobs']
+
+    fieldsets = (
+        (None, {
+            'fields': ('job_type', 'reference', 'status', 'payload')
+        }),
+        ('Attempts', {
+            'fields': ('attempts', 'max_attempts', 'run_after', 'last_error')
+        }),
+        ('Worker', {
+            'fields': ('locked_by', 'locked_until'),
+            'classes': ('collapse',)
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'started_at', 'finished_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    @admin.action(description='Re-queue selected jobs')
+    def requeue_jobs(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.exclude(status='running').update(
+            status='queued', attempts=0, run_after=timezone.now(), last_error=''
+        )
+        self.message_user(request, f"{updated} job(s) re-queued.")
+
+
+@admin.register(AIResponseCacheEntry)
+class AIResponseCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['prompt_type', 'prompt_version', 'model_name', 'hit_count', 'last_accessed_at', 'expires_at']
+    list_filter = ['prompt_type', 'model_name']
+    search_fields = ['cache_key', 'response_text']
+    readonly_fields = ['cache_key', 'created_at', 'last_accessed_at']
+    actions = ['expire_entries']
+
+    @admin.action(description='Expire selected entries')
+    def expire_entries(self, request, queryset):
+        deleted, _ = queryset.delete()
+        self.message_user(request, f"{deleted} cache entr{'y' if deleted == 1 else 'ies'} removed.")
+
+
+@admin.register(AIResponseCacheStats)
+class AIResponseCacheStatsAdmin(admin.ModelAdmin):
+    list_display = ['prompt_type', 'hits', 'misses', 'get_hit_rate', 'updated_at']
+    readonly_fields = ['prompt_type', 'hits', 'misses', 'updated_at']
+
+    def get_hit_rate(self, obj):
+        return f"{obj.hit_rate}%"
+    get_hit_rate.short_description = 'Hit Rate'
+
+
+@admin.register(AICallLog)
+class AICallLogAdmin(admin.ModelAdmin):
+    list_display = [
+        'created_at', 'prompt_type', 'model_name', 'api', 'prompt_tokens',
+        'completion_tokens', 'latency_ms', 'cache_hit', 'cost', 'success'
+    ]
+    list_filter = ['prompt_type', 'model_name', 'api', 'cache_hit', 'success']
+    search_fields = ['document__slug', 'error']
+    raw_id_fields = ['document']
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(JurisdictionRecord)
+class JurisdictionRecordAdmin(admin.ModelAdmin):
+    list_display = [
+        'city', 'state', 'primary_agency', 'county_name', 'has_local_police',
+        'source', 'is_verified', 'hit_count', 'refreshed_at'
+    ]
+    list_filter = ['state', 'is_verified', 'source', 'has_local_police']
+    search_fields = ['city', 'city_key', 'primary_agency', 'county_name']
+    readonly_fields = [
+        'city_key', 'hit_count', 'verified_by', 'verified_at', 'pending_result', 'created_at', 'updated_at'
+    ]
+    actions = ['mark_verified', 'queue_refresh', 'apply_pending', 'discard_pending']
+
+    fieldsets = (
+        (None, {
+            'fields': ('city', 'city_key', 'state', 'county_name', 'location_type')
+        }),
+        ('Law Enforcement', {
+            'fields': ('has_local_police', 'primary_agency', 'agencies', 'agency_addresses', 'verification_warning')
+        }),
+        ('Source & Verification', {
+            'fields': ('source', 'is_verified', 'verified_by', 'verified_at', 'refreshed_at', 'hit_count')
+        }),
+        ('Pending Refresh', {
+            'fields': ('pending_result',),
+            'description': 'Fresh web-search data for a verified record. Apply it (the record becomes unverified) or discard it.',
+            'classes': ('collapse',)
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    def save_model(self, request, obj, form, change):
+        from django.utils import timezone
+        from .services.jurisdiction_service import normalize_city, normalize_state
+        obj.city_key = normalize_city(obj.city)
+        obj.state = normalize_state(obj.state) or obj.state.upper()
+        if change and form.changed_data:
+            # Staff edits are corrections - treat them as manual, verified data
+            obj.source = 'manual'
+            obj.refreshed_at = timezone.now()
+            if 'is_verified' not in form.changed_data or obj.is_verified:
+                obj.is_verified = True
+                obj.verified_by = request.user
+                obj.verified_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
+    @admin.action(description='Mark selected records as verified')
+    def mark_verified(self, request, queryset):
+        from django.utils import timezone
+        now = timezone.now()
+        updated = queryset.update(is_verified=True, verified_by=request.user, verified_at=now, refreshed_at=now)
+        self.message_user(request, f"{updated} record(s) marked verified.")
+
+    @admin.action(description='Queue refresh from web search')
+    def queue_refresh(self, request, queryset):
+        from .services.job_queue import JobQueue
+        count = 0
+        for record in queryset:
+            JobQueue.enqueue(
+                'refresh_jurisdiction',
+                {'record_id': record.id, 'force': True},
+                reference=f'jurisdiction:{record.id}',
+            )
+            count += 1
+        self.message_user(request, f"{count} refresh job(s) queued (verified records get a pending result to review).")
+
+    @admin.action(description='Apply pending refresh (unverifies the record)')
+    def apply_pending(self, request, queryset):
+        from .services.jurisdiction_service import JurisdictionService
+        count = 0
+        for record in queryset.filter(pending_result__isnull=False):
+            record.is_verified = False
+            JurisdictionService.save_agencies(record.city, record.state, record.pending_result, record=record)
+            count += 1
+        self.message_user(request, f"{count} pending refresh(es) applied.")
+
+    @admin.action(description='Discard pending refresh')
+    def discard_pending(self, request, queryset):
+        updated = queryset.filter(pending_result__isnull=False).update(pending_result=None)
+        self.message_user(request, f"{updated} pending refresh(es) discarded.")
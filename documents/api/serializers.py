@@ -161,7 +161,7 @@ class WizardSessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = WizardSession
         fields = [
-            'slug', 'status', 'current_step', 'progress_percent',
+            'slug', 'status', 'revision', 'current_step', 'progress_percent',
             'raw_story', 'ai_extracted', 'interview_data',
             'use_case_law', 'ai_analysis', 'analysis_status',
             'steps', 'created_at', 'updated_at',
@@ -171,8 +171,9 @@ class WizardSessionSerializer(serializers.ModelSerializer):
     def get_steps(self, obj):
         """Return step metadata with completion status."""
         steps = []
+        interview = obj.interview_data
         for i in range(1, WizardSession.TOTAL_STEPS + 1):
-            step_data = obj.get_step_data(i)
+            step_data = interview.get(f'step_{i}', {})
             steps.append({
                 'number': i,
                 **STEP_META[i],
@@ -1,4 +1,3 @@
-import threading
 import logging
 
 from django.shortcuts import get_object_or_404
@@ -12,6 +11,8 @@ from documents.models import (
     IncidentOverview, IncidentNarrative, Defendant, Witness, Evidence,
     RightsViolated, Damages, ReliefSought,
 )
+from documents.services.event_bus import publish as publish_event
+from documents.services.job_queue import JobQueue
 from .serializers import (
     WizardStartSerializer, WizardSessionSerializer,
     STEP_SERIALIZERS, STEP_META,
@@ -110,24 +111,23 @@ def wizard_start(request, document_slug):
         session.raw_story = story
         session.status = 'in_progress'
         session.current_step = 1
-        session.interview_data = {}
         session.ai_extracted = {}
         session.ai_analysis = {}
         session.analysis_status = 'pending'
         session.analysis_error = ''
         session.save()
+        session.clear_steps()
 
     # Also save story to the document
     document.story_text = story
     document.save(update_fields=['story_text'])
 
-    # Kick off AI extraction in background thread
-    thread = threading.Thread(
-        target=_extract_story_background,
-        args=(session.id, story),
-        daemon=True
+    # Queue AI extraction (picked up by run_workers)
+    JobQueue.enqueue(
+        'extract_wizard_story',
+        {'session_id': session.id, 'story_text': story},
+        reference=f'wizard_session:{session.id}',
     )
-    thread.start()
 
     return Response({
         'session_slug': session.slug,
@@ -141,7 +141,7 @@ def wizard_start(request, document_slug):
 def wizard_status(request, session_slug):
     """Poll for AI extraction status and get full wizard state."""
     session = get_object_or_404(
-        WizardSession,
+        WizardSession.objects.prefetch_related('steps'),
         slug=session_slug,
         document__user=request.user
     )
@@ -163,23 +163,36 @@ def wizard_status(request, session_slug):
 def wizard_get(request, session_slug):
     """Get the full current wizard state."""
     session = get_object_or_404(
-        WizardSession,
+        WizardSession.objects.prefetch_related('steps'),
         slug=session_slug,
         document__user=request.user
     )
     return Response(WizardSessionSerializer(session).data)
 
 
-@api_view(['PUT'])
+@api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def wizard_save_step(request, session_slug, step_number):
-    """Save user-confirmed data for a specific wizard step."""
+    """
+    Save user-confirmed data for a specific wizard step.
+
+    PUT replaces the whole step. PATCH merges only the keys that changed:
+
+        PATCH {"revision": 12, "changes": {"was_arrested": true}}
+
+    The session revision must match (409 with the current revision and step
+    data otherwise); keys whose value is already stored are dropped, and a
+    patch with nothing left to write doesn't touch the database.
+    """
     if step_number < 1 or step_number > WizardSession.TOTAL_STEPS:
         return Response(
             {'error': f'Step must be between 1 and {WizardSession.TOTAL_STEPS}'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    if request.method == 'PATCH':
+        return _patch_step(request, session_slug, step_number)
+
     session = get_object_or_404(
         WizardSession,
         slug=session_slug,
@@ -193,43 +206,101 @@ def wizard_save_step(request, session_slug, step_number):
 
     # Save step data
     session.set_step_data(step_number, serializer.validated_data)
+    _sync_step_side_effects(session, step_number, serializer.validated_data)
+
+    return Response({
+        'step': step_number,
+        'saved': True,
+        'revision': session.revision,
+        'current_step': session.current_step,
+        'progress_percent': session.progress_percent,
+        'next_step': min(step_number + 1, WizardSession.TOTAL_STEPS + 1),
+    })
 
+
+def _patch_step(request, session_slug, step_number):
+    """Delta save for wizard_save_step (PATCH)."""
+    from documents.models import WizardStep
+
+    changes = request.data.get('changes')
+    revision = request.data.get('revision')
+    if not isinstance(changes, dict) or (revision is not None and not isinstance(revision, int)):
+        return Response(
+            {'error': 'Expected {"revision": <int>, "changes": {...}}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Only this step's data is loaded, not the whole interview / AI payloads
+    session = get_object_or_404(
+        WizardSession.objects.defer('ai_extracted', 'ai_analysis', 'raw_story'),
+        slug=session_slug,
+        document__user=request.user
+    )
+    stored = session.get_step_data(step_number)
+
+    def conflict(current_revision, step_data):
+        return Response({
+            'error': 'This step was saved from somewhere else. Reload to continue.',
+            'revision': current_revision,
+            'step_data': step_data or {},
+        }, status=status.HTTP_409_CONFLICT)
+
+    if revision is not None and revision != session.revision:
+        return conflict(session.revision, stored)
+
+    serializer = STEP_SERIALIZERS[step_number](data=changes, partial=True)
+    serializer.is_valid(raise_exception=True)
+    encoded = WizardSession.encode_step_data(serializer.validated_data)
+    delta = {key: value for key, value in encoded.items() if stored.get(key, object()) != value}
+
+    if delta:
+        if session.patch_step_data(step_number, delta, expected_revision=revision) is None:
+            # Lost a race with another save since the session was loaded
+            session.refresh_from_db(fields=['revision'])
+            return conflict(session.revision, session.get_step_data(step_number))
+        _sync_step_side_effects(session, step_number, {
+            key: serializer.validated_data[key] for key in delta
+        })
+
+    return Response({
+        'step': step_number,
+        'saved': True,
+        'changed': sorted(delta),
+        'revision': session.revision,
+        'current_step': session.current_step,
+        'progress_percent': session.progress_percent,
+        'next_step': min(step_number + 1, WizardSession.TOTAL_STEPS + 1),
+    })
+
+
+def _sync_step_side_effects(session, step_number, data):
+    """Write step fields that live outside interview_data (only the keys present in data)."""
     # If step 1, immediately write court fields to IncidentOverview (creating it if needed)
     # so the DB value stays in sync without waiting for wizard_complete.
     if step_number == 1:
-        data = serializer.validated_data
         try:
-            _ensure_sections_exist(session.document)
-            section = session.document.sections.get(section_type='incident_overview')
-            overview, _ = IncidentOverview.objects.get_or_create(section=section)
-            update_fields = []
+            update = {}
             if 'court_district_confirmed' in data:
-                overview.court_district_confirmed = bool(data['court_district_confirmed'])
-                update_fields.append('court_district_confirmed')
+                update['court_district_confirmed'] = bool(data['court_district_confirmed'])
             if 'use_manual_court' in data:
-                overview.use_manual_court = bool(data['use_manual_court'])
-                update_fields.append('use_manual_court')
+                update['use_manual_court'] = bool(data['use_manual_court'])
             if 'federal_district_court' in data:
-                overview.federal_district_court = data['federal_district_court'] or ''
-                update_fields.append('federal_district_court')
-            if update_fields:
-                overview.save(update_fields=update_fields)
+                update['federal_district_court'] = data['federal_district_court'] or ''
+            if update:
+                _ensure_sections_exist(session.document)
+                section = session.document.sections.get(section_type='incident_overview')
+                overview, _ = IncidentOverview.objects.get_or_create(section=section)
+                for field, value in update.items():
+                    setattr(overview, field, value)
+                overview.save(update_fields=list(update))
         except Exception:
             logger.exception(f"Error syncing step 1 court fields to IncidentOverview for session {session.slug}")
 
     # If step 7, capture the case law preference
-    if step_number == 7:
-        session.use_case_law = serializer.validated_data.get('use_case_law', True)
+    if step_number == 7 and 'use_case_law' in data:
+        session.use_case_law = data['use_case_law']
         session.save(update_fields=['use_case_law'])
 
-    return Response({
-        'step': step_number,
-        'saved': True,
-        'current_step': session.current_step,
-        'progress_percent': session.progress_percent,
-        'next_step': min(step_number + 1, WizardSession.TOTAL_STEPS + 1),
-    })
-
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -253,13 +324,12 @@ def wizard_analyze(request, session_slug):
     session.analysis_status = 'processing'
     session.save(update_fields=['status', 'analysis_status'])
 
-    # Run analysis in background
-    thread = threading.Thread(
-        target=_analyze_case_background,
-        args=(session.id,),
-        daemon=True
+    # Queue analysis (picked up by run_workers)
+    JobQueue.enqueue(
+        'analyze_wizard_case',
+        {'session_id': session.id},
+        reference=f'wizard_session:{session.id}',
     )
-    thread.start()
 
     return Response({
         'status': 'processing',
@@ -348,7 +418,7 @@ def wizard_complete(request, session_slug):
         # Still update safe non-duplicating fields (e.g. court_district_confirmed)
         # in case user re-confirmed after initial completion.
         try:
-            step_1 = session.interview_data.get('step_1', {})
+            step_1 = session.get_step_data(1)
             if 'court_district_confirmed' in step_1:
                 section = session.document.sections.get(section_type='incident_overview')
                 overview = IncidentOverview.objects.filter(section=section).first()
@@ -428,253 +498,268 @@ def _convert_to_24h(time_str):
 
 
 def _extract_story_background(session_id, story_text):
-    """Background thread: parse story with AI and populate ai_extracted."""
-    try:
-        from documents.services.openai_service import OpenAIService
-
-        session = WizardSession.objects.get(id=session_id)
-        document = session.document
-
-        # Use existing OpenAI parse_story service
-        ai_service = OpenAIService()
-        result = ai_service.parse_story(story_text)
-
-        if not result or not result.get('success'):
-            session.ai_extracted = {'error': result.get('error', 'AI parsing failed') if result else 'No response from AI'}
-            session.save(update_fields=['ai_extracted'])
-            return
-
-        # parse_story returns {'success': True, 'sections': {...}}
-        # The actual data (incident_overview, defendants, etc.) is inside 'sections'
-        sections = result.get('sections', {})
-
-        # Map AI extraction to wizard step structure
-        ai_steps = {}
-
-        # Step 1: When & Where
-        overview = sections.get('incident_overview', {})
-        if overview:
-            # Convert AI time format (e.g., "2:00 PM") to HTML time input format ("14:00")
-            raw_time = overview.get('incident_time', '') or ''
-            incident_time = _convert_to_24h(raw_time)
-
-            ai_steps['step_1'] = {
-                'incident_date': overview.get('incident_date', '') or '',
-                'incident_time': incident_time,
-                'incident_location': overview.get('incident_location', '') or '',
-                'address': overview.get('address', '') or '',
-                'city': overview.get('city', '') or '',
-                'state': overview.get('state', '') or '',
-                'location_type': overview.get('location_type', '') or '',
-                'location_type_other': overview.get('location_type_other', '') or '',
-                'was_recording': overview.get('was_recording'),
-                'recording_device': overview.get('recording_device', '') or '',
-            }
+    """Job handler: parse story with AI and populate ai_extracted."""
+    from documents.services.openai_service import OpenAIService
 
-        # Step 2: Who — field names now match wizard directly
-        # (prompt returns title_rank, agency_name, defendant_type)
-        defendants = sections.get('defendants', [])
-        witnesses = sections.get('witnesses', [])
-        if defendants or witnesses:
-            # Normalize defendant fields (handle old prompt format gracefully)
-            normalized_defendants = []
-            for d in defendants:
-                normalized_defendants.append({
-                    'name': d.get('name', '') or '',
-                    'badge_number': d.get('badge_number', '') or '',
-                    'title_rank': d.get('title_rank', '') or d.get('title', '') or '',
-                    'agency_name': d.get('agency_name', '') or d.get('agency', '') or '',
-                    'defendant_type': d.get('defendant_type', 'individual') or 'individual',
-                    'description': d.get('description', '') or '',
-                    'agency_inferred': d.get('agency_inferred', False),
-                })
-
-            # Normalize witness fields
-            normalized_witnesses = []
-            for w in witnesses:
-                normalized_witnesses.append({
-                    'name': w.get('name', '') or '',
-                    'description': w.get('description', '') or '',
-                    'what_they_saw': w.get('what_they_saw', '') or '',
-                    'was_recording': w.get('was_recording'),
-                    'recording_device': w.get('recording_device', '') or '',
-                })
-
-            ai_steps['step_2'] = {
-                'defendants': normalized_defendants,
-                'witnesses': normalized_witnesses,
-            }
+    session = WizardSession.objects.get(id=session_id)
+    document = session.document
 
-        # Step 3: What happened
-        narrative = sections.get('incident_narrative', {})
-        if narrative:
-            ai_steps['step_3'] = {
-                'summary': narrative.get('summary', '') or '',
-                'detailed_narrative': narrative.get('detailed_narrative', '') or '',
-                'what_were_you_doing': narrative.get('what_were_you_doing', '') or '',
-                'initial_contact': narrative.get('initial_contact', '') or '',
-                'what_was_said': narrative.get('what_was_said', '') or '',
-                'physical_actions': narrative.get('physical_actions', '') or '',
-                'how_it_ended': narrative.get('how_it_ended', '') or '',
-            }
+    # Use existing OpenAI parse_story service
+    ai_service = OpenAIService()
+    result = ai_service.parse_story(story_text)
 
-        # Step 4: Why (from rights_violated)
-        rights = sections.get('rights_violated', {})
-        violations = rights.get('suggested_violations', [])
-        if violations:
-            # Map AI violation suggestions to our plain-language keys
-            selections = []
-            for v in violations:
-                right = v.get('right', '').lower()
-                # Check multiple keywords per category for better matching
-                if 'search' in right and 'warrant' not in right:
-                    selections.append('searched_without_warrant')
-                if 'unreasonable search' in right or 'illegal search' in right or 'warrantless search' in right:
-                    selections.append('searched_without_warrant')
-                if 'arrest' in right or 'detention' in right or 'detain' in right:
-                    selections.append('arrested_no_cause')
-                if 'force' in right or 'brutal' in right or 'assault' in right or 'taser' in right or 'pepper spray' in right:
-                    selections.append('excessive_force')
-                if 'seizure' in right or 'property' in right or 'confiscat' in right:
-                    selections.append('unlawful_seizure')
-                if 'speech' in right or 'recording' in right or 'film' in right or 'press' in right:
-                    selections.append('punished_for_speech')
-                if 'recording' in right or 'film' in right or 'photograph' in right:
-                    selections.append('punished_for_recording')
-                if 'assembl' in right or 'protest' in right or 'gather' in right:
-                    selections.append('punished_for_assembly')
-                if 'racial' in right or 'race' in right or 'profil' in right:
-                    selections.append('racial_discrimination')
-                if 'gender' in right or 'sex' in right:
-                    selections.append('gender_discrimination')
-                if 'due process' in right:
-                    selections.append('denied_due_process')
-                if 'self-incrimination' in right or 'miranda' in right or 'fifth' in right or 'forced statement' in right:
-                    selections.append('forced_statements')
-                if 'medical' in right or 'deliberate indifference' in right:
-                    selections.append('denied_medical_care')
-                if 'retaliat' in right:
-                    selections.append('retaliation')
-            ai_steps['step_4'] = {
-                'selections': list(set(selections)),
-                'ai_violations': violations,  # Keep the full AI output for reference
-            }
+    if not result or not result.get('success'):
+        session.ai_extracted = {'error': result.get('error', 'AI parsing failed') if result else 'No response from AI'}
+        session.save(update_fields=['ai_extracted'])
+        publish_event(document.user_id, 'wizard_extraction', session=session.slug, status='failed')
+        return
+
+    # parse_story returns {'success': True, 'sections': {...}}
+    # The actual data (incident_overview, defendants, etc.) is inside 'sections'
+    sections = result.get('sections', {})
+
+    # Map AI extraction to wizard step structure
+    ai_steps = {}
+
+    # Step 1: When & Where
+    overview = sections.get('incident_overview', {})
+    if overview:
+        # Convert AI time format (e.g., "2:00 PM") to HTML time input format ("14:00")
+        raw_time = overview.get('incident_time', '') or ''
+        incident_time = _convert_to_24h(raw_time)
+
+        ai_steps['step_1'] = {
+            'incident_date': overview.get('incident_date', '') or '',
+            'incident_time': incident_time,
+            'incident_location': overview.get('incident_location', '') or '',
+            'address': overview.get('address', '') or '',
+            'city': overview.get('city', '') or '',
+            'state': overview.get('state', '') or '',
+            'location_type': overview.get('location_type', '') or '',
+            'location_type_other': overview.get('location_type_other', '') or '',
+            'was_recording': overview.get('was_recording'),
+            'recording_device': overview.get('recording_device', '') or '',
+        }
 
-        # Step 5: Impact
-        damages = sections.get('damages', {})
-        if damages:
-            ai_steps['step_5'] = {
-                'physical_injuries': damages.get('physical_injuries', '') or '',
-                'medical_treatment': damages.get('medical_treatment', '') or '',
-                'emotional_distress': damages.get('emotional_distress', '') or '',
-                'financial_losses': damages.get('financial_losses', '') or '',
-                'lost_wages': damages.get('lost_wages', '') or '',
-                'ongoing_effects': damages.get('ongoing_effects', '') or damages.get('other_damages', '') or '',
-            }
+    # Step 2: Who — field names now match wizard directly
+    # (prompt returns title_rank, agency_name, defendant_type)
+    defendants = sections.get('defendants', [])
+    witnesses = sections.get('witnesses', [])
+    if defendants or witnesses:
+        # Normalize defendant fields (handle old prompt format gracefully)
+        normalized_defendants = []
+        for d in defendants:
+            normalized_defendants.append({
+                'name': d.get('name', '') or '',
+                'badge_number': d.get('badge_number', '') or '',
+                'title_rank': d.get('title_rank', '') or d.get('title', '') or '',
+                'agency_name': d.get('agency_name', '') or d.get('agency', '') or '',
+                'defendant_type': d.get('defendant_type', 'individual') or 'individual',
+                'description': d.get('description', '') or '',
+                'agency_inferred': d.get('agency_inferred', False),
+            })
+
+        # Normalize witness fields
+        normalized_witnesses = []
+        for w in witnesses:
+            normalized_witnesses.append({
+                'name': w.get('name', '') or '',
+                'description': w.get('description', '') or '',
+                'what_they_saw': w.get('what_they_saw', '') or '',
+                'was_recording': w.get('was_recording'),
+                'recording_device': w.get('recording_device', '') or '',
+            })
+
+        ai_steps['step_2'] = {
+            'defendants': normalized_defendants,
+            'witnesses': normalized_witnesses,
+        }
 
-        # Step 6: Evidence
-        evidence = sections.get('evidence', [])
-        if evidence:
-            ai_steps['step_6'] = {
-                'items': evidence,
-                'evidence_types': list(set(
-                    e.get('evidence_type', '') or e.get('type', '')
-                    for e in evidence
-                    if e.get('evidence_type') or e.get('type')
-                )),
-            }
+    # Step 3: What happened
+    narrative = sections.get('incident_narrative', {})
+    if narrative:
+        ai_steps['step_3'] = {
+            'summary': narrative.get('summary', '') or '',
+            'detailed_narrative': narrative.get('detailed_narrative', '') or '',
+            'what_were_you_doing': narrative.get('what_were_you_doing', '') or '',
+            'initial_contact': narrative.get('initial_contact', '') or '',
+            'what_was_said': narrative.get('what_was_said', '') or '',
+            'physical_actions': narrative.get('physical_actions', '') or '',
+            'how_it_ended': narrative.get('how_it_ended', '') or '',
+        }
 
-        session.ai_extracted = ai_steps
-        session.save(update_fields=['ai_extracted'])
+    # Step 4: Why (from rights_violated)
+    rights = sections.get('rights_violated', {})
+    violations = rights.get('suggested_violations', [])
+    if violations:
+        # Map AI violation suggestions to our plain-language keys
+        selections = []
+        for v in violations:
+            right = v.get('right', '').lower()
+            # Check multiple keywords per category for better matching
+            if 'search' in right and 'warrant' not in right:
+                selections.append('searched_without_warrant')
+            if 'unreasonable search' in right or 'illegal search' in right or 'warrantless search' in right:
+                selections.append('searched_without_warrant')
+            if 'arrest' in right or 'detention' in right or 'detain' in right:
+                selections.append('arrested_no_cause')
+            if 'force' in right or 'brutal' in right or 'assault' in right or 'taser' in right or 'pepper spray' in right:
+                selections.append('excessive_force')
+            if 'seizure' in right or 'property' in right or 'confiscat' in right:
+                selections.append('unlawful_seizure')
+            if 'speech' in right or 'recording' in right or 'film' in right or 'press' in right:
+                selections.append('punished_for_speech')
+            if 'recording' in right or 'film' in right or 'photograph' in right:
+                selections.append('punished_for_recording')
+            if 'assembl' in right or 'protest' in right or 'gather' in right:
+                selections.append('punished_for_assembly')
+            if 'racial' in right or 'race' in right or 'profil' in right:
+                selections.append('racial_discrimination')
+            if 'gender' in right or 'sex' in right:
+                selections.append('gender_discrimination')
+            if 'due process' in right:
+                selections.append('denied_due_process')
+            if 'self-incrimination' in right or 'miranda' in right or 'fifth' in right or 'forced statement' in right:
+                selections.append('forced_statements')
+            if 'medical' in right or 'deliberate indifference' in right:
+                selections.append('denied_medical_care')
+            if 'retaliat' in right:
+                selections.append('retaliation')
+        ai_steps['step_4'] = {
+            'selections': list(set(selections)),
+            'ai_violations': violations,  # Keep the full AI output for reference
+        }
 
-        # Record AI usage
-        document.record_ai_usage()
+    # Step 5: Impact
+    damages = sections.get('damages', {})
+    if damages:
+        ai_steps['step_5'] = {
+            'physical_injuries': damages.get('physical_injuries', '') or '',
+            'medical_treatment': damages.get('medical_treatment', '') or '',
+            'emotional_distress': damages.get('emotional_distress', '') or '',
+            'financial_losses': damages.get('financial_losses', '') or '',
+            'lost_wages': damages.get('lost_wages', '') or '',
+            'ongoing_effects': damages.get('ongoing_effects', '') or damages.get('other_damages', '') or '',
+        }
 
-    except Exception as e:
-        logger.exception(f"Error extracting story for wizard session {session_id}")
-        try:
-            session = WizardSession.objects.get(id=session_id)
-            session.ai_extracted = {'error': str(e)}
-            session.save(update_fields=['ai_extracted'])
-        except Exception:
-            pass
+    # Step 6: Evidence
+    evidence = sections.get('evidence', [])
+    if evidence:
+        ai_steps['step_6'] = {
+            'items': evidence,
+            'evidence_types': list(set(
+                e.get('evidence_type', '') or e.get('type', '')
+                for e in evidence
+                if e.get('evidence_type') or e.get('type')
+            )),
+        }
+
+    session.ai_extracted = ai_steps
+    session.save(update_fields=['ai_extracted'])
+
+    # Record AI usage
+    document.record_ai_usage()
+
+    publish_event(document.user_id, 'wizard_extraction', session=session.slug, status='completed')
+
+
+def _extract_story_failed(session_id, error, **kwargs):
+    """Job failure hook: record the extraction error once all attempts are exhausted."""
+    WizardSession.objects.filter(id=session_id).update(ai_extracted={'error': error})
+    _publish_session_event(session_id, 'wizard_extraction', 'failed')
 
 
 def _analyze_case_background(session_id):
-    """Background thread: run final case analysis with AI."""
-    try:
-        from documents.services.openai_service import OpenAIService
-
-        session = WizardSession.objects.get(id=session_id)
-        document = session.document
-        ai_service = OpenAIService()
-
-        # Collect all interview data into a single narrative
-        interview = session.interview_data
-        case_summary = _build_case_summary(interview, session.raw_story)
-
-        # Fetch the wizard analysis prompt from the database
-        from documents.models import AIPrompt
-        prompt = AIPrompt.objects.filter(
-            prompt_type='wizard_analyze_case',
-            is_active=True,
-        ).first()
-
-        if not prompt:
-            raise ValueError(
-                "AI prompt 'wizard_analyze_case' not found or inactive. "
-                "Run 'python manage.py seed_ai_prompts' to populate prompts."
-            )
-
-        system_message = prompt.system_message
-
-        # Conditionally add case law instructions if user opted in
-        use_case_law = session.use_case_law
-        if use_case_law:
-            system_message += (
-                "\n2. 'case_law': An array of relevant cases. For each:\n"
-                "   - 'case_name': Full case citation (e.g., 'Graham v. Connor, 490 U.S. 386 (1989)')\n"
-                "   - 'relevance': One sentence on why this case applies\n"
-                "   - 'key_holding': The key legal principle from this case\n"
-                "   Only include well-established, widely-cited Section 1983 cases. "
-                "   Do NOT fabricate citations.\n"
-            )
-
-        response = ai_service.client.chat.completions.create(
-            model=prompt.model_name,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": case_summary},
-            ],
-            response_format={"type": "json_object"},
-            temperature=prompt.temperature,
-            max_tokens=prompt.max_tokens,
+    """Job handler: run final case analysis with AI."""
+    from documents.services.openai_service import OpenAIService
+    from documents.services.token_budget import get_input_budget, select_model
+
+    session = WizardSession.objects.get(id=session_id)
+    document = session.document
+    ai_service = OpenAIService()
+
+    # Collect all interview data into a single narrative
+    interview = session.interview_data
+    case_summary = _build_case_summary(
+        interview, session.raw_story, token_budget=get_input_budget('wizard_analyze_case')
+    )
+
+    # Fetch the wizard analysis prompt (raises if missing or inactive)
+    prompt = ai_service._get_prompt('wizard_analyze_case')
+
+    system_message = prompt['system_message']
+
+    # Conditionally add case law instructions if user opted in
+    use_case_law = session.use_case_law
+    if use_case_law:
+        system_message += (
+            "\n2. 'case_law': An array of relevant cases. For each:\n"
+            "   - 'case_name': Full case citation (e.g., 'Graham v. Connor, 490 U.S. 386 (1989)')\n"
+            "   - 'relevance': One sentence on why this case applies\n"
+            "   - 'key_holding': The key legal principle from this case\n"
+            "   Only include well-established, widely-cited Section 1983 cases. "
+            "   Do NOT fabricate citations.\n"
         )
 
-        import json
-        analysis = json.loads(response.choices[0].message.content)
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": case_summary},
+    ]
+    response = ai_service.client.chat.completions.create(
+        prompt_type=prompt['prompt_type'],
+        model=select_model(prompt['prompt_type'], prompt['model_name'], messages),
+        messages=messages,
+        response_format={"type": "json_object"},
+        temperature=prompt['temperature'],
+        max_tokens=prompt['max_tokens'],
+    )
 
-        session.ai_analysis = analysis
-        session.analysis_status = 'completed'
-        session.status = 'analyzed'
-        session.save(update_fields=['ai_analysis', 'analysis_status', 'status'])
+    import json
+    analysis = json.loads(response.choices[0].message.content)
 
-        # Record AI usage
-        document.record_ai_usage()
+    session.ai_analysis = analysis
+    session.analysis_status = 'completed'
+    session.status = 'analyzed'
+    session.save(update_fields=['ai_analysis', 'analysis_status', 'status'])
+
+    # Record AI usage
+    document.record_ai_usage()
+
+    publish_event(document.user_id, 'wizard_analysis', session=session.slug, status='completed')
+
+
+def _analyze_case_failed(session_id, error, **kwargs):
+    """Job failure hook: mark the analysis failed once all attempts are exhausted."""
+    WizardSession.objects.filter(id=session_id).update(
+        analysis_status='failed',
+        analysis_error=error,
+    )
+    _publish_session_event(session_id, 'wizard_analysis', 'failed')
 
-    except Exception as e:
-        logger.exception(f"Error analyzing case for wizard session {session_id}")
-        try:
-            session = WizardSession.objects.get(id=session_id)
-            session.analysis_status = 'failed'
-            session.analysis_error = str(e)
-            session.save(update_fields=['analysis_status', 'analysis_error'])
-        except Exception:
-            pass
 
+def _publish_session_event(session_id, event_type, event_status):
+    """Push a wizard job event to the session owner's job event stream."""
+    sessions = WizardSession.objects.filter(id=session_id).values_list('document__user_id', 'slug')
+    for user_id, slug in sessions:
+        publish_event(user_id, event_type, session=slug, status=event_status)
+
+
+def _build_case_summary(interview_data, raw_story, token_budget=None):
+    """
+    Build a comprehensive case summary from interview data for AI analysis.
+
+    With token_budget, the free-text parts (original story and narrative) are
+    trimmed so the whole summary fits it.
+    """
+    step_3 = interview_data.get('step_3', {})
+    narrative = step_3.get('detailed_narrative') or step_3.get('summary') or ''
+    if token_budget:
+        from documents.services.token_budget import estimate_tokens, fit_texts
+        structured = _build_case_summary({**interview_data, 'step_3': {}}, '')
+        raw_story, narrative = fit_texts(
+            [raw_story or '', narrative], token_budget - estimate_tokens(structured)
+        )
 
-def _build_case_summary(interview_data, raw_story):
-    """Build a comprehensive case summary from interview data for AI analysis."""
     parts = []
 
     parts.append(f"ORIGINAL STORY:\n{raw_story}\n")
@@ -703,13 +788,10 @@ def _build_case_summary(interview_data, raw_story):
                 parts.append(f"  - {name} ({agency})" if agency else f"  - {name}")
             parts.append("")
 
-    step_3 = interview_data.get('step_3', {})
     if step_3:
         parts.append("NARRATIVE:")
-        if step_3.get('detailed_narrative'):
-            parts.append(f"  {step_3['detailed_narrative']}")
-        elif step_3.get('summary'):
-            parts.append(f"  {step_3['summary']}")
+        if narrative:
+            parts.append(f"  {narrative}")
         parts.append("")
 
     step_4 = interview_data.get('step_4', {})
@@ -747,26 +829,55 @@ def _build_case_summary(interview_data, raw_story):
 
 
 def _apply_wizard_to_document(session, document, errors):
-    """Apply all wizard interview data to the real document models."""
+    """
+    Apply all wizard interview data to the real document models.
+
+    Each step assigns its values in memory (a bad value only records an error
+    for that step). All writes then happen in one transaction - bulk creates
+    and updates for child rows, and only the fields that actually changed - so
+    re-applying the same answers takes a handful of queries and never
+    duplicates defendants, witnesses or evidence.
+    """
+    from django.db import transaction
+    from documents.services.model_sync import assign_fields, sync_child_rows
+
     interview = session.interview_data
+    analysis = session.ai_analysis
 
-    # Ensure all sections exist
+    # Ensure all sections exist, then load them with their data in one pass
     _ensure_sections_exist(document)
+    sections = {
+        section.section_type: section
+        for section in document.sections.select_related(
+            'incident_overview', 'incident_narrative', 'rights_violated', 'damages', 'relief_sought',
+        ).prefetch_related('defendants', 'witnesses', 'evidence_items')
+    }
+
+    def section_data(section_type, model, related_name):
+        section = sections[section_type]
+        try:
+            return getattr(section, related_name)
+        except model.DoesNotExist:
+            return model(section=section)
+
+    pending_saves = []   # (instance, changed fields)
+    child_syncs = []     # (model, existing rows, desired rows, key fields)
+    section_status = {}  # section_type -> new status
 
     # Step 1: When & Where → IncidentOverview
     step_1 = interview.get('step_1', {})
     if step_1:
         try:
-            section = document.sections.get(section_type='incident_overview')
-            overview, _ = IncidentOverview.objects.get_or_create(section=section)
+            overview = section_data('incident_overview', IncidentOverview, 'incident_overview')
+            values = {}
 
             if step_1.get('incident_date'):
                 try:
                     from datetime import date
                     if isinstance(step_1['incident_date'], str):
-                        overview.incident_date = date.fromisoformat(step_1['incident_date'])
+                        values['incident_date'] = date.fromisoformat(step_1['incident_date'])
                     else:
-                        overview.incident_date = step_1['incident_date']
+                        values['incident_date'] = step_1['incident_date']
                 except (ValueError, TypeError):
                     pass
 
@@ -774,26 +885,25 @@ def _apply_wizard_to_document(session, document, errors):
                 try:
                     from datetime import time
                     if isinstance(step_1['incident_time'], str):
-                        overview.incident_time = time.fromisoformat(step_1['incident_time'])
+                        values['incident_time'] = time.fromisoformat(step_1['incident_time'])
                     else:
-                        overview.incident_time = step_1['incident_time']
+                        values['incident_time'] = step_1['incident_time']
                 except (ValueError, TypeError):
                     pass
 
             for field in ['incident_location', 'city', 'state', 'location_type']:
                 if step_1.get(field):
-                    setattr(overview, field, step_1[field])
+                    values[field] = step_1[field]
 
             if 'federal_district_court' in step_1:
-                overview.federal_district_court = step_1['federal_district_court'] or ''
+                values['federal_district_court'] = step_1['federal_district_court'] or ''
             if 'use_manual_court' in step_1:
-                overview.use_manual_court = bool(step_1['use_manual_court'])
+                values['use_manual_court'] = bool(step_1['use_manual_court'])
             if 'court_district_confirmed' in step_1:
-                overview.court_district_confirmed = bool(step_1['court_district_confirmed'])
+                values['court_district_confirmed'] = bool(step_1['court_district_confirmed'])
 
-            overview.save()
-            section.status = 'completed'
-            section.save(update_fields=['status'])
+            pending_saves.append((overview, assign_fields(overview, values)))
+            section_status['incident_overview'] = 'completed'
         except Exception as e:
             errors.append(f'incident_overview: {str(e)}')
 
@@ -802,41 +912,45 @@ def _apply_wizard_to_document(session, document, errors):
     if step_2:
         # Defendants
         try:
-            section = document.sections.get(section_type='defendants')
-            for d_data in step_2.get('defendants', []):
-                if d_data.get('name'):
-                    Defendant.objects.create(
-                        section=section,
-                        name=d_data.get('name', ''),
-                        badge_number=d_data.get('badge_number', ''),
-                        title_rank=d_data.get('title_rank', ''),
-                        agency_name=d_data.get('agency_name', d_data.get('agency', '')),
-                        description=d_data.get('description', ''),
-                        defendant_type=d_data.get('defendant_type', 'individual'),
-                        agency_inferred=d_data.get('agency_inferred', False),
-                    )
-            if section.defendants.exists():
-                section.status = 'completed'
-                section.save(update_fields=['status'])
+            section = sections['defendants']
+            desired = [
+                {
+                    'section': section,
+                    'name': d_data.get('name', ''),
+                    'badge_number': d_data.get('badge_number', ''),
+                    'title_rank': d_data.get('title_rank', ''),
+                    'agency_name': d_data.get('agency_name', d_data.get('agency', '')),
+                    'description': d_data.get('description', ''),
+                    'defendant_type': d_data.get('defendant_type', 'individual'),
+                    'agency_inferred': d_data.get('agency_inferred', False),
+                }
+                for d_data in step_2.get('defendants', []) if d_data.get('name')
+            ]
+            existing = section.defendants.all()
+            child_syncs.append((Defendant, existing, desired, ('name', 'defendant_type')))
+            if desired or existing:
+                section_status['defendants'] = 'completed'
         except Exception as e:
             errors.append(f'defendants: {str(e)}')
 
         # Witnesses
         try:
-            section = document.sections.get(section_type='witnesses')
-            for w_data in step_2.get('witnesses', []):
-                if w_data.get('name'):
-                    Witness.objects.create(
-                        section=section,
-                        name=w_data.get('name', ''),
-                        relationship=w_data.get('relationship', ''),
-                        what_they_witnessed=w_data.get('what_they_witnessed',
-                                                        w_data.get('what_they_saw', '')),
-                        contact_info=w_data.get('contact_info', ''),
-                    )
-            if section.witnesses.exists():
-                section.status = 'completed'
-                section.save(update_fields=['status'])
+            section = sections['witnesses']
+            desired = [
+                {
+                    'section': section,
+                    'name': w_data.get('name', ''),
+                    'relationship': w_data.get('relationship', ''),
+                    'what_they_witnessed': w_data.get('what_they_witnessed',
+                                                      w_data.get('what_they_saw', '')),
+                    'contact_info': w_data.get('contact_info', ''),
+                }
+                for w_data in step_2.get('witnesses', []) if w_data.get('name')
+            ]
+            existing = section.witnesses.all()
+            child_syncs.append((Witness, existing, desired, ('name',)))
+            if desired or existing:
+                section_status['witnesses'] = 'completed'
         except Exception as e:
             errors.append(f'witnesses: {str(e)}')
 
@@ -844,18 +958,18 @@ def _apply_wizard_to_document(session, document, errors):
     step_3 = interview.get('step_3', {})
     if step_3:
         try:
-            section = document.sections.get(section_type='incident_narrative')
-            narrative, _ = IncidentNarrative.objects.get_or_create(section=section)
-            for field in ['summary', 'detailed_narrative', 'what_were_you_doing',
-                          'initial_contact', 'what_was_said', 'physical_actions', 'how_it_ended']:
-                if step_3.get(field):
-                    setattr(narrative, field, step_3[field])
-            narrative.save()
+            narrative = section_data('incident_narrative', IncidentNarrative, 'incident_narrative')
+            values = {
+                field: step_3[field]
+                for field in ['summary', 'detailed_narrative', 'what_were_you_doing',
+                              'initial_contact', 'what_was_said', 'physical_actions', 'how_it_ended']
+                if step_3.get(field)
+            }
+            pending_saves.append((narrative, assign_fields(narrative, values)))
             if narrative.detailed_narrative and len(narrative.detailed_narrative) >= 50:
-                section.status = 'completed'
+                section_status['incident_narrative'] = 'completed'
             else:
-                section.status = 'in_progress'
-            section.save(update_fields=['status'])
+                section_status['incident_narrative'] = 'in_progress'
         except Exception as e:
             errors.append(f'incident_narrative: {str(e)}')
 
@@ -863,24 +977,22 @@ def _apply_wizard_to_document(session, document, errors):
     step_4 = interview.get('step_4', {})
     if step_4:
         try:
-            section = document.sections.get(section_type='rights_violated')
-            rights, _ = RightsViolated.objects.get_or_create(section=section)
+            rights = section_data('rights_violated', RightsViolated, 'rights_violated')
+            values = {}
             selections = step_4.get('selections', [])
             additional = step_4.get('additional_text', '')
 
             for selection in selections:
                 mapping = VIOLATION_MAP.get(selection)
                 if mapping:
-                    amendment_field = f"{mapping['amendment']}_amendment"
-                    setattr(rights, amendment_field, True)
+                    values[f"{mapping['amendment']}_amendment"] = True
                     if mapping.get('sub'):
-                        setattr(rights, mapping['sub'], True)
+                        values[mapping['sub']] = True
 
             if additional:
-                rights.other_rights = additional
+                values['other_rights'] = additional
 
             # Also apply INCLUDED AI analysis violations
-            analysis = session.ai_analysis
             ai_violations = analysis.get('violations', [])
             # Collect details per amendment from included violations
             amendment_details = {}
@@ -903,12 +1015,12 @@ def _apply_wizard_to_document(session, document, errors):
                     amendment_key = 'fourteenth'
 
                 if amendment_key:
-                    setattr(rights, f'{amendment_key}_amendment', True)
+                    values[f'{amendment_key}_amendment'] = True
 
                     # Try to set specific sub-violation fields
                     sub_field = _map_ai_violation_to_field(amendment_key, violation_type)
                     if sub_field and hasattr(rights, sub_field):
-                        setattr(rights, sub_field, True)
+                        values[sub_field] = True
 
                     # Collect descriptions for amendment details
                     if description:
@@ -919,24 +1031,22 @@ def _apply_wizard_to_document(session, document, errors):
                             f"{label}: {description}" if label else description
                         )
 
-            # Write collected details to amendment detail fields
+            # Append collected details to amendment detail fields (skipping lines
+            # already there, so re-applying doesn't repeat them)
             for amendment_key, details in amendment_details.items():
                 details_field = f'{amendment_key}_amendment_details'
                 if hasattr(rights, details_field):
                     existing = getattr(rights, details_field) or ''
-                    new_details = '\n'.join(details)
-                    if existing:
-                        setattr(rights, details_field, f"{existing}\n{new_details}")
-                    else:
-                        setattr(rights, details_field, new_details)
+                    new_details = [line for line in details if line not in existing.splitlines()]
+                    if new_details:
+                        values[details_field] = '\n'.join(filter(None, [existing] + new_details))
 
-            rights.save()
+            pending_saves.append((rights, assign_fields(rights, values)))
             if any(getattr(rights, f'{a}_amendment', False)
                    for a in ['first', 'fourth', 'fifth', 'fourteenth']):
-                section.status = 'completed'
+                section_status['rights_violated'] = 'completed'
             else:
-                section.status = 'in_progress'
-            section.save(update_fields=['status'])
+                section_status['rights_violated'] = 'in_progress'
         except Exception as e:
             errors.append(f'rights_violated: {str(e)}')
 
@@ -944,27 +1054,25 @@ def _apply_wizard_to_document(session, document, errors):
     step_5 = interview.get('step_5', {})
     if step_5:
         try:
-            section = document.sections.get(section_type='damages')
-            damages, _ = Damages.objects.get_or_create(section=section)
-
+            damages = section_data('damages', Damages, 'damages')
+            values = {}
             if step_5.get('physical_injuries'):
-                damages.physical_injury = True
-                damages.physical_injury_description = step_5['physical_injuries']
+                values['physical_injury'] = True
+                values['physical_injury_description'] = step_5['physical_injuries']
             if step_5.get('medical_treatment'):
-                damages.medical_treatment = True
-                damages.medical_treatment_description = step_5['medical_treatment']
+                values['medical_treatment'] = True
+                values['medical_treatment_description'] = step_5['medical_treatment']
             if step_5.get('emotional_distress'):
-                damages.emotional_distress = True
-                damages.emotional_distress_description = step_5['emotional_distress']
+                values['emotional_distress'] = True
+                values['emotional_distress_description'] = step_5['emotional_distress']
             if step_5.get('financial_losses'):
-                damages.property_damage = True
-                damages.property_damage_description = step_5['financial_losses']
+                values['property_damage'] = True
+                values['property_damage_description'] = step_5['financial_losses']
             if step_5.get('ongoing_effects'):
-                damages.other_damages = step_5['ongoing_effects']
+                values['other_damages'] = step_5['ongoing_effects']
 
-            damages.save()
-            section.status = 'completed'
-            section.save(update_fields=['status'])
+            pending_saves.append((damages, assign_fields(damages, values)))
+            section_status['damages'] = 'completed'
         except Exception as e:
             errors.append(f'damages: {str(e)}')
 
@@ -972,56 +1080,81 @@ def _apply_wizard_to_document(session, document, errors):
     step_6 = interview.get('step_6', {})
     if step_6:
         try:
-            section = document.sections.get(section_type='evidence')
-            for e_data in step_6.get('items', []):
-                if e_data.get('title') or e_data.get('description'):
-                    Evidence.objects.create(
-                        section=section,
-                        evidence_type=e_data.get('evidence_type', 'other'),
-                        title=e_data.get('title', ''),
-                        description=e_data.get('description', ''),
-                        is_in_possession=e_data.get('is_in_possession', True),
-                    )
-            if section.evidence_items.exists():
-                section.status = 'completed'
-                section.save(update_fields=['status'])
+            section = sections['evidence']
+            desired = [
+                {
+                    'section': section,
+                    'evidence_type': e_data.get('evidence_type', 'other'),
+                    'title': e_data.get('title', ''),
+                    'description': e_data.get('description', ''),
+                    'is_in_possession': e_data.get('is_in_possession', True),
+                }
+                for e_data in step_6.get('items', []) if e_data.get('title') or e_data.get('description')
+            ]
+            existing = section.evidence_items.all()
+            child_syncs.append((Evidence, existing, desired, ('evidence_type', 'title')))
+            if desired or existing:
+                section_status['evidence'] = 'completed'
         except Exception as e:
             errors.append(f'evidence: {str(e)}')
 
     # Apply relief recommendations from AI analysis
-    analysis = session.ai_analysis
     if analysis.get('relief_recommendations'):
         try:
-            section = document.sections.get(section_type='relief_sought')
-            relief, _ = ReliefSought.objects.get_or_create(section=section)
+            relief = section_data('relief_sought', ReliefSought, 'relief_sought')
+            values = {}
             for rec in analysis['relief_recommendations']:
                 relief_type = rec.get('type', '')
                 recommended = rec.get('recommended', False)
                 if relief_type and recommended:
                     if hasattr(relief, relief_type):
-                        setattr(relief, relief_type, True)
+                        values[relief_type] = True
                     if relief_type == 'jury_trial':
-                        relief.jury_trial_demanded = True
-            relief.attorney_fees = True  # Always recommend
-            relief.save()
-            section.status = 'completed'
-            section.save(update_fields=['status'])
+                        values['jury_trial_demanded'] = True
+            values['attorney_fees'] = True  # Always recommend
+            pending_saves.append((relief, assign_fields(relief, values)))
+            section_status['relief_sought'] = 'completed'
         except Exception as e:
             errors.append(f'relief_sought: {str(e)}')
 
-    # Invalidate any cached complaint
-    document.invalidate_generated_complaint()
+    with transaction.atomic():
+        for instance, changed in pending_saves:
+            if instance.pk is None:
+                instance.save()
+            elif changed:
+                instance.save(update_fields=changed)
+
+        for model, existing, desired, key_fields in child_syncs:
+            sync_child_rows(model, existing, desired, key_fields)
+
+        changed_sections = []
+        for section_type, new_status in section_status.items():
+            section = sections[section_type]
+            if section.status != new_status:
+                section.status = new_status
+                changed_sections.append(section)
+        if changed_sections:
+            DocumentSection.objects.bulk_update(changed_sections, ['status'])
+            document.refresh_section_counts()
+
+        # Invalidate any cached complaint
+        document.invalidate_generated_complaint()
 
 
 def _ensure_sections_exist(document):
-    """Make sure all document sections exist."""
+    """Make sure all document sections exist (a single query when they already do)."""
     from documents.views import SECTION_CONFIG
-    for section_type, config in SECTION_CONFIG.items():
-        DocumentSection.objects.get_or_create(
+    existing = set(document.sections.values_list('section_type', flat=True))
+    missing = [
+        DocumentSection(
             document=document,
             section_type=section_type,
-            defaults={
-                'order': config.get('order', 0),
-                'status': 'not_started',
-            }
+            order=config.get('order', 0),
+            status='not_started',
         )
+        for section_type, config in SECTION_CONFIG.items()
+        if section_type not in existing
+    ]
+    if missing:
+        DocumentSection.objects.bulk_create(missing, ignore_conflicts=True)
+        document.refresh_section_counts()
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class DocumentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documents'
+
+    def ready(self):
+        from django.core import checks
+        from .checks import check_court_district_index
+        checks.register(check_court_district_index)
+
+        # Build the court district index once per process instead of on first lookup
+        from .services.court_data.district_index import get_district_index
+        get_district_index()
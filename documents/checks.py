@@ -0,0 +1,18 @@
+"""
+System checks for the documents app.
+"""
+from django.core.checks import Warning
+
+
+def check_court_district_index(app_configs, **kwargs):
+    """Warn about cities listed in several districts with no PREFERRED_DISTRICTS entry."""
+    from .services.court_data.district_index import get_district_index
+
+    return [
+        Warning(
+            f"'{city}' ({state}) is listed in several federal districts: {', '.join(districts)}.",
+            hint=f"Add '{city}' to PREFERRED_DISTRICTS in the {state} court lookup class.",
+            id='documents.W001',
+        )
+        for state, city, districts in get_district_index().ambiguities
+    ]
@@ -0,0 +1,109 @@
+"""
+Management command to re-resolve the federal district court for incidents
+whose lookup is missing or low confidence (e.g. after fixing a state's court
+table or adding county/ZIP data).
+
+Usage:
+    python manage.py backfill_court_districts
+    python manage.py backfill_court_districts --dry-run
+    python manage.py backfill_court_districts --no-gpt --chunk-size 200
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from documents.models import IncidentOverview, PlaintiffInfo
+from documents.services.court_lookup_service import CourtLookupService, location_zip_code
+
+# Generic "Federal District Court (XX)" results from a failed fallback - never worth saving
+FAILED_METHODS = ('fallback_failed', 'error')
+
+
+class Command(BaseCommand):
+    help = 'Re-resolve federal district courts for incidents with low or missing lookup confidence'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Incidents resolved and saved per batch (default: 500)'
+        )
+        parser.add_argument(
+            '--no-gpt', action='store_true',
+            help='Only use the offline court data; leave unresolved incidents unchanged'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Show what would change without saving'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        dry_run = options['dry_run']
+
+        queryset = (
+            IncidentOverview.objects
+            .filter(Q(district_lookup_confidence='') | Q(district_lookup_confidence='low'))
+            .filter(use_manual_court=False, court_district_confirmed=False)
+            .exclude(city='')
+            .exclude(state='')
+            .only('id', 'city', 'state', 'incident_location', 'federal_district_court', 'district_lookup_confidence')
+            .annotate(document_id=F('section__document_id'))
+            .order_by('id')
+        )
+
+        total = queryset.count()
+        self.stdout.write(f'{total} incident(s) to re-resolve')
+
+        updated = 0
+        last_id = 0
+        while True:
+            # Keyset pagination - rows drop out of the filter as they are updated
+            chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            # Plaintiff addresses, for incidents whose address has no ZIP
+            plaintiffs = {
+                row['section__document_id']: row
+                for row in PlaintiffInfo.objects.filter(
+                    section__document_id__in=[obj.document_id for obj in chunk]
+                ).values('section__document_id', 'city', 'state', 'zip_code')
+            }
+            locations = {
+                obj.id: (obj.city, obj.state, None, location_zip_code(
+                    obj.incident_location, obj.city, obj.state, plaintiffs.get(obj.document_id)
+                ))
+                for obj in chunk
+            }
+            results = CourtLookupService.lookup_many(
+                set(locations.values()), use_gpt_fallback=not options['no_gpt']
+            )
+
+            changed = []
+            for obj in chunk:
+                result = results.get(locations[obj.id])
+                if not result or not result.get('court_name') or result.get('method') in FAILED_METHODS:
+                    continue
+                confidence = result.get('confidence', 'medium')
+                if (obj.federal_district_court == result['court_name']
+                        and obj.district_lookup_confidence == confidence):
+                    continue
+
+                if dry_run:
+                    self.stdout.write(
+                        f'  #{obj.id} {obj.city}, {obj.state}: '
+                        f'"{obj.federal_district_court or "-"}" -> "{result["court_name"]}" ({confidence})'
+                    )
+                obj.federal_district_court = result['court_name']
+                obj.district_lookup_confidence = confidence
+                changed.append(obj)
+
+            if changed and not dry_run:
+                IncidentOverview.objects.bulk_update(
+                    changed, ['federal_district_court', 'district_lookup_confidence'], batch_size=chunk_size
+                )
+            updated += len(changed)
+            self.stdout.write(f'  processed through #{last_id}: {len(changed)} updated')
+
+        verb = 'Would update' if dry_run else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {updated} of {total} incident(s)'))
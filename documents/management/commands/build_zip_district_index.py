@@ -0,0 +1,91 @@
+"""
+Management command to compile the ZIP -> federal district index used by
+CourtLookupService.
+
+Input is a ZIP-to-county CSV such as the HUD USPS ZIP crosswalk, with at least
+zip, state and county columns. An optional ratio column (e.g. res_ratio) lets a
+ZIP that spans several counties be assigned to the district holding most of its
+addresses.
+
+Usage:
+    python manage.py build_zip_district_index zip_county.csv
+    python manage.py build_zip_district_index zip_county.csv --ratio-column res_ratio
+"""
+import csv
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documents.services.court_data.district_index import get_district_index
+from documents.services.court_data.offline_dataset import (
+    ZIP_DATA_PATH, get_offline_dataset, normalize_zip, write_zip_dataset,
+)
+from documents.services.court_lookup_service import CourtLookupService
+
+
+class Command(BaseCommand):
+    help = 'Build the ZIP code to federal district index from a ZIP-to-county CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help='ZIP-to-county CSV file')
+        parser.add_argument('--zip-column', default='zip', help='ZIP code column (default: zip)')
+        parser.add_argument('--state-column', default='state', help='State code column (default: state)')
+        parser.add_argument('--county-column', default='county', help='County name column (default: county)')
+        parser.add_argument(
+            '--ratio-column', default='',
+            help='Optional share-of-addresses column used to pick a district for split ZIPs'
+        )
+        parser.add_argument('--output', default=ZIP_DATA_PATH, help='Output file path')
+
+    def handle(self, *args, **options):
+        index = get_district_index()
+        dataset = get_offline_dataset()
+
+        # zip -> {(state, district): weight}
+        weights = defaultdict(lambda: defaultdict(float))
+        unmatched = set()
+
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    zip_int = normalize_zip(row.get(options['zip_column']))
+                    state = (row.get(options['state_column']) or '').strip().upper()
+                    county = (row.get(options['county_column']) or '').strip()
+                    if zip_int is None or state not in CourtLookupService.STATE_LOOKUPS:
+                        continue
+
+                    if state in index.single_district:
+                        district_key = next(d for s, d in index.district_names if s == state)
+                    else:
+                        district_key = dataset.lookup_county(state, county)
+                    if not district_key:
+                        unmatched.add((state, county))
+                        continue
+
+                    try:
+                        weight = float(row.get(options['ratio_column']) or 1) if options['ratio_column'] else 1.0
+                    except ValueError:
+                        weight = 1.0
+                    weights[zip_int][(state, district_key)] += weight
+        except OSError as e:
+            raise CommandError(f'Could not read {options["csv_path"]}: {e}')
+
+        entries = {}
+        for zip_int, districts in weights.items():
+            (state, district_key), _ = max(districts.items(), key=lambda item: item[1])
+            entries[zip_int] = (state, district_key, len(districts) > 1)
+
+        if not entries:
+            raise CommandError('No ZIP codes could be mapped to a district')
+
+        write_zip_dataset(entries, options['output'])
+
+        ambiguous = sum(1 for _, _, is_ambiguous in entries.values() if is_ambiguous)
+        for state, county in sorted(unmatched)[:20]:
+            self.stdout.write(self.style.WARNING(f'Unknown county: {county}, {state}'))
+        if len(unmatched) > 20:
+            self.stdout.write(self.style.WARNING(f'...and {len(unmatched) - 20} more unknown counties'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(entries)} ZIP codes ({ambiguous} spanning several districts) to {options["output"]}'
+        ))
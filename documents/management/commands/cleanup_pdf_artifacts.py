@@ -0,0 +1,75 @@
+"""
+Management command to delete stored PDF artifacts that are no longer needed:
+artifacts older than the retention period, and artifacts no document points
+to any more (deleted documents, or superseded by a newer render).
+
+Run it daily from cron or the platform scheduler.
+
+Usage:
+    python manage.py cleanup_pdf_artifacts
+    python manage.py cleanup_pdf_artifacts --days 7
+    python manage.py cleanup_pdf_artifacts --dry-run
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from documents.models import Document
+from documents.services.artifact_store import get_artifact_store
+
+# Unreferenced artifacts younger than this are left alone - a render may still be saving its key
+ORPHAN_GRACE = timedelta(hours=1)
+
+
+class Command(BaseCommand):
+    help = 'Delete stored PDF artifacts past retention or no longer referenced by a document'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f'Retention in days (default: PDF_ARTIFACT_RETENTION_DAYS, '
+                 f'{getattr(settings, "PDF_ARTIFACT_RETENTION_DAYS", 30)})'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Show what would be deleted without deleting'
+        )
+
+    def handle(self, *args, **options):
+        store = get_artifact_store()
+        dry_run = options['dry_run']
+        days = options['days'] if options['days'] is not None else getattr(settings, 'PDF_ARTIFACT_RETENTION_DAYS', 30)
+
+        now = timezone.now()
+        expires_before = now - timedelta(days=days)
+        orphaned_before = now - ORPHAN_GRACE
+
+        referenced = set(
+            Document.objects.exclude(pdf_file_path='').values_list('pdf_file_path', flat=True)
+        )
+
+        expired_keys = []
+        deleted = 0
+        for key, modified_at in store.list():
+            if modified_at < expires_before:
+                reason = 'expired'
+                if key in referenced:
+                    expired_keys.append(key)
+            elif key not in referenced and modified_at < orphaned_before:
+                reason = 'unreferenced'
+            else:
+                continue
+
+            self.stdout.write(f'  {key} ({reason})')
+            if not dry_run:
+                store.delete(key)
+            deleted += 1
+
+        # Expired artifacts are re-rendered on the next download
+        if expired_keys and not dry_run:
+            Document.objects.filter(pdf_file_path__in=expired_keys).update(pdf_file_path='')
+
+        verb = 'Would delete' if dry_run else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {deleted} PDF artifact(s)'))
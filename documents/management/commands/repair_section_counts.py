@@ -0,0 +1,70 @@
+"""
+Management command to verify Document.sections_done / sections_total against
+the sections table and fix any documents whose counters have drifted (e.g.
+after a raw SQL fix or a bulk section write that skipped the refresh).
+
+Usage:
+    python manage.py repair_section_counts
+    python manage.py repair_section_counts --dry-run
+    python manage.py repair_section_counts --chunk-size 2000
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from documents.models import Document, DocumentSection
+
+
+class Command(BaseCommand):
+    help = 'Verify and repair the denormalized section progress counters on documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Documents checked and saved per batch (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drifted documents without saving'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        dry_run = options['dry_run']
+
+        queryset = (
+            Document.objects
+            .annotate(
+                actual_total=Count('sections'),
+                actual_done=Count('sections', filter=Q(sections__status__in=DocumentSection.DONE_STATUSES)),
+            )
+            .only('id', 'slug', 'sections_done', 'sections_total')
+            .order_by('id')
+        )
+
+        checked = repaired = 0
+        last_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            checked += len(chunk)
+
+            drifted = []
+            for doc in chunk:
+                if (doc.sections_done, doc.sections_total) == (doc.actual_done, doc.actual_total):
+                    continue
+                self.stdout.write(
+                    f'  {doc.slug}: {doc.sections_done}/{doc.sections_total} '
+                    f'-> {doc.actual_done}/{doc.actual_total}'
+                )
+                doc.sections_done = doc.actual_done
+                doc.sections_total = doc.actual_total
+                drifted.append(doc)
+
+            if drifted and not dry_run:
+                Document.objects.bulk_update(drifted, ['sections_done', 'sections_total'])
+            repaired += len(drifted)
+
+        verb = 'Would repair' if dry_run else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {repaired} of {checked} document(s)'))
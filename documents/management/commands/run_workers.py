@@ -0,0 +1,99 @@
+"""
+Management command to process background jobs (story parsing, PDF generation,
+wizard AI extraction and analysis) outside of the web workers.
+
+Usage:
+    python manage.py run_workers
+    python manage.py run_workers --concurrency 4
+    python manage.py run_workers --once   # drain the queue and exit
+"""
+import signal
+import socket
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from documents.services.job_queue import JobQueue
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers for AI and PDF processing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.JOB_QUEUE_CONCURRENCY,
+            help='Number of worker threads (default: JOB_QUEUE_CONCURRENCY setting)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.JOB_QUEUE_POLL_INTERVAL,
+            help='Seconds to sleep when the queue is empty'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Process all runnable jobs and exit instead of polling forever'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        once = options['once']
+
+        self.stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        recovered = JobQueue.recover_stuck_jobs()
+        if recovered:
+            self.stdout.write(self.style.WARNING(f'Recovered {recovered} stuck job(s)'))
+
+        self.stdout.write(f'Starting {concurrency} worker thread(s)...')
+
+        host = f'{socket.gethostname()}:{os.getpid()}'
+        threads = []
+        for i in range(concurrency):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(f'{host}:{i}', poll_interval, once),
+                name=f'job-worker-{i}',
+            )
+            thread.start()
+            threads.append(thread)
+
+        last_sweep = time.monotonic()
+        while any(t.is_alive() for t in threads):
+            if time.monotonic() - last_sweep >= settings.JOB_QUEUE_RECOVERY_INTERVAL:
+                close_old_connections()
+                recovered = JobQueue.recover_stuck_jobs()
+                if recovered:
+                    self.stdout.write(self.style.WARNING(f'Recovered {recovered} stuck job(s)'))
+                last_sweep = time.monotonic()
+            time.sleep(1)
+
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write('Shutdown requested, finishing current jobs...')
+        self.stop_event.set()
+
+    def _worker_loop(self, worker_id, poll_interval, once):
+        """Claim and run jobs until stopped (or until the queue is empty with --once)."""
+        while not self.stop_event.is_set():
+            close_old_connections()
+            job = JobQueue.claim_next(worker_id)
+
+            if not job:
+                if once:
+                    break
+                self.stop_event.wait(poll_interval)
+                continue
+
+            self.stdout.write(f'[{worker_id}] Running {job}')
+            JobQueue.run(job)
+            job.refresh_from_db(fields=['status'])
+            self.stdout.write(f'[{worker_id}] Finished {job}')
+
+        close_old_connections()
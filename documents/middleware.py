@@ -0,0 +1,31 @@
+"""
+Request middleware for the documents app.
+"""
+from .services import ai_call_log
+
+
+class AICallContextMiddleware:
+    """
+    Attribute AI calls made while handling a request to the document in the URL
+    (document_slug, or the wizard session_slug), for AICallLog and ai_cost_used.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, '_ai_call_context_token', None)
+            if token is not None:
+                ai_call_log.reset_context(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        document_slug = view_kwargs.get('document_slug')
+        session_slug = view_kwargs.get('session_slug')
+        if document_slug or session_slug:
+            request._ai_call_context_token = ai_call_log.set_context(
+                document_slug=document_slug, session_slug=session_slug
+            )
+        return None
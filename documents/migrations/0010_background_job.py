@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:47
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0009_add_wizard_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(choices=[('process_story', 'Process Story'), ('generate_pdf', 'Generate PDF'), ('extract_wizard_story', 'Extract Wizard Story'), ('analyze_wizard_case', 'Analyze Wizard Case')], max_length=50)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Keyword arguments passed to the job handler')),
+                ('reference', models.CharField(blank=True, db_index=True, help_text='Object this job works on (e.g., "document:42") - used to avoid duplicate jobs', max_length=100)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Job is not picked up before this time (used for retry backoff)')),
+                ('locked_by', models.CharField(blank=True, help_text='Worker that claimed this job', max_length=100)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Visibility timeout - a running job past this time is considered stuck and re-queued', null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Background Job',
+                'verbose_name_plural': 'Background Jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='documents_b_status_e9a29c_idx')],
+            },
+        ),
+    ]
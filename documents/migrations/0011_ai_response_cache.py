@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0010_background_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIResponseCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(help_text='SHA-256 of the request parameters', max_length=64, unique=True)),
+                ('prompt_type', models.CharField(db_index=True, max_length=50)),
+                ('prompt_version', models.IntegerField(default=0)),
+                ('model_name', models.CharField(max_length=50)),
+                ('response_text', models.TextField(help_text='Raw response content returned by the API')),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='Used for LRU eviction')),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'AI Response Cache Entry',
+                'verbose_name_plural': 'AI Response Cache Entries',
+                'ordering': ['-last_accessed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AIResponseCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prompt_type', models.CharField(max_length=50, unique=True)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'AI Response Cache Stats',
+                'verbose_name_plural': 'AI Response Cache Stats',
+                'ordering': ['prompt_type'],
+            },
+        ),
+    ]
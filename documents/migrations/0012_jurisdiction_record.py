@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('documents', '0011_ai_response_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='job_type',
+            field=models.CharField(choices=[('process_story', 'Process Story'), ('generate_pdf', 'Generate PDF'), ('extract_wizard_story', 'Extract Wizard Story'), ('analyze_wizard_case', 'Analyze Wizard Case'), ('refresh_jurisdiction', 'Refresh Jurisdiction Record')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='JurisdictionRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city_key', models.CharField(help_text='Normalized city name (lowercase, no punctuation)', max_length=100)),
+                ('state', models.CharField(help_text='Two-letter state code', max_length=2)),
+                ('city', models.CharField(help_text='City name as displayed', max_length=100)),
+                ('county_name', models.CharField(blank=True, max_length=100)),
+                ('location_type', models.CharField(blank=True, help_text='e.g., city, town, village, unincorporated', max_length=50)),
+                ('has_local_police', models.BooleanField(blank=True, null=True)),
+                ('primary_agency', models.CharField(blank=True, max_length=255)),
+                ('agencies', models.JSONField(blank=True, default=list, help_text='List of agencies with jurisdiction: [{"name", "type", "address", "is_primary"}]')),
+                ('agency_addresses', models.JSONField(blank=True, default=dict, help_text='Agency headquarters addresses keyed by normalized agency name')),
+                ('verification_warning', models.TextField(blank=True)),
+                ('source', models.CharField(choices=[('gpt_web_search', 'GPT Web Search'), ('manual', 'Manual Entry')], default='gpt_web_search', max_length=20)),
+                ('is_verified', models.BooleanField(default=False, help_text='Checked by staff - takes precedence over refresh')),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When agency data was last fetched or edited')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('verified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='verified_jurisdictions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Jurisdiction Record',
+                'verbose_name_plural': 'Jurisdiction Records',
+                'ordering': ['state', 'city_key'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jurisdictionrecord',
+            constraint=models.UniqueConstraint(fields=('state', 'city_key'), name='unique_jurisdiction_city_state'),
+        ),
+    ]
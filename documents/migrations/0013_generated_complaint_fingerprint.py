@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0012_jurisdiction_record'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='generated_fingerprint',
+            field=models.CharField(blank=True, default='', help_text='Fingerprint of the document data the cached complaint was generated from', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='generated_html',
+            field=models.TextField(blank=True, default='', help_text='Cached rendered PDF HTML for the cached complaint'),
+        ),
+    ]
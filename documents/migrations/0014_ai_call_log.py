@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0013_generated_complaint_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICallLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('prompt_type', models.CharField(db_index=True, max_length=50)),
+                ('model_name', models.CharField(blank=True, max_length=50)),
+                ('api', models.CharField(choices=[('chat', 'Chat Completions'), ('responses', 'Responses'), ('cache', 'Response Cache')], max_length=20)),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('latency_ms', models.PositiveIntegerField(default=0)),
+                ('cache_hit', models.BooleanField(default=False)),
+                ('cost', models.DecimalField(decimal_places=6, default=0, help_text='USD, from AI_MODEL_PRICING', max_digits=10)),
+                ('success', models.BooleanField(default=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('document', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ai_calls', to='documents.document')),
+            ],
+            options={
+                'verbose_name': 'AI Call Log',
+                'verbose_name_plural': 'AI Call Logs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['prompt_type', 'created_at'], name='documents_a_prompt__d55075_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0014_ai_call_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiprompt',
+            name='max_input_tokens',
+            field=models.PositiveIntegerField(default=0, help_text='Token budget for case inputs (story, transcripts, document text) sent with this prompt. Larger inputs are trimmed to fit. 0 = AI_INPUT_TOKEN_BUDGET setting'),
+        ),
+        migrations.AddField(
+            model_name='aiprompt',
+            name='small_model_max_input_tokens',
+            field=models.PositiveIntegerField(default=0, help_text='Use the small model when the estimated prompt is at most this many tokens'),
+        ),
+        migrations.AddField(
+            model_name='aiprompt',
+            name='small_model_name',
+            field=models.CharField(blank=True, help_text='Cheaper/faster model for small requests (e.g., gpt-4.1-nano). Blank = always use the model above', max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0015_aiprompt_input_budget_routing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='parsed_story_text',
+            field=models.TextField(blank=True, help_text='Story text the current parsing_result was parsed from (baseline for incremental re-parses)'),
+        ),
+    ]
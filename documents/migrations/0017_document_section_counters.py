@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_section_counts(apps, schema_editor):
+    """Fill sections_done / sections_total for existing documents in one UPDATE."""
+    Document = apps.get_model('documents', 'Document')
+    DocumentSection = apps.get_model('documents', 'DocumentSection')
+
+    def section_count(**filters):
+        counts = (
+            DocumentSection.objects
+            .filter(document=OuterRef('pk'), **filters)
+            .order_by()
+            .values('document')
+            .annotate(n=Count('id'))
+            .values('n')
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    Document.objects.update(
+        sections_total=section_count(),
+        sections_done=section_count(status__in=['completed', 'not_applicable']),
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0016_document_parsed_story_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='sections_done',
+            field=models.PositiveIntegerField(default=0, help_text='Sections marked completed or not applicable'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='sections_total',
+            field=models.PositiveIntegerField(default=0, help_text='Number of sections'),
+        ),
+        migrations.RunPython(populate_section_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0017_document_section_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wizardsession',
+            name='revision',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped on every step save; clients send it back for optimistic concurrency'),
+        ),
+    ]
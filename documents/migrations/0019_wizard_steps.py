@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils.dateparse import parse_date, parse_time
+
+# GIN indexes for JSON containment queries (PostgreSQL only)
+GIN_INDEXES = [
+    ('wizard_step_data_gin', 'documents_wizardstep', 'data'),
+    ('wizard_session_extracted_gin', 'documents_wizardsession', 'ai_extracted'),
+    ('wizard_session_analysis_gin', 'documents_wizardsession', 'ai_analysis'),
+]
+
+
+def _parse(parser, value):
+    try:
+        return parser(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def split_interview_data(apps, schema_editor):
+    """Copy each session's interview_data steps into WizardStep rows."""
+    WizardSession = apps.get_model('documents', 'WizardSession')
+    WizardStep = apps.get_model('documents', 'WizardStep')
+
+    steps = []
+    for session_id, interview_data in WizardSession.objects.values_list('id', 'interview_data').iterator():
+        for key, data in (interview_data or {}).items():
+            if not key.startswith('step_') or not key[5:].isdigit() or not isinstance(data, dict):
+                continue
+            step = WizardStep(session_id=session_id, step_number=int(key[5:]), data=data)
+            if step.step_number == 1:
+                step.incident_date = _parse(parse_date, data.get('incident_date'))
+                step.incident_time = _parse(parse_time, data.get('incident_time'))
+                step.city = (data.get('city') or '')[:200]
+                step.state = (data.get('state') or '')[:2]
+            steps.append(step)
+    WizardStep.objects.bulk_create(steps, batch_size=500)
+
+
+def join_interview_data(apps, schema_editor):
+    """Reverse: rebuild interview_data from WizardStep rows."""
+    WizardSession = apps.get_model('documents', 'WizardSession')
+    WizardStep = apps.get_model('documents', 'WizardStep')
+
+    interview = {}
+    for session_id, step_number, data in WizardStep.objects.values_list('session_id', 'step_number', 'data'):
+        interview.setdefault(session_id, {})[f'step_{step_number}'] = data
+    for session_id, interview_data in interview.items():
+        WizardSession.objects.filter(pk=session_id).update(interview_data=interview_data)
+
+
+def add_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in GIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} jsonb_path_ops)'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in GIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0018_wizardsession_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WizardStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step_number', models.PositiveSmallIntegerField()),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('incident_date', models.DateField(blank=True, null=True)),
+                ('incident_time', models.TimeField(blank=True, null=True)),
+                ('city', models.CharField(blank=True, max_length=200)),
+                ('state', models.CharField(blank=True, max_length=2)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='documents.wizardsession')),
+            ],
+            options={
+                'verbose_name': 'Wizard Step',
+                'verbose_name_plural': 'Wizard Steps',
+                'ordering': ['step_number'],
+                'indexes': [models.Index(fields=['state', 'city'], name='wizard_step_place_idx'), models.Index(fields=['incident_date'], name='wizard_step_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='wizardstep',
+            constraint=models.UniqueConstraint(fields=('session', 'step_number'), name='unique_wizard_step'),
+        ),
+        migrations.RunPython(split_interview_data, join_interview_data),
+        migrations.RemoveField(
+            model_name='wizardsession',
+            name='interview_data',
+        ),
+        migrations.RunPython(add_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0019_wizard_steps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jurisdictionrecord',
+            name='pending_result',
+            field=models.JSONField(blank=True, help_text='Refreshed GPT data for a verified record, waiting for staff review', null=True),
+        ),
+    ]
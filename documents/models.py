@@ -50,6 +50,12 @@ class Document(models.Model):
         help_text='Paid tier: actual API cost in dollars'
     )
 
+    # Section progress counters (kept in sync by DocumentSection writes; see repair_section_counts)
+    sections_done = models.PositiveIntegerField(
+        default=0, help_text='Sections marked completed or not applicable'
+    )
+    sections_total = models.PositiveIntegerField(default=0, help_text='Number of sections')
+
     # Video suggestion tracking
     applied_video_suggestions = models.JSONField(default=list, blank=True, help_text='Log of applied video evidence suggestions')
 
@@ -72,6 +78,10 @@ class Document(models.Model):
         blank=True,
         help_text='Error message if parsing failed'
     )
+    parsed_story_text = models.TextField(
+        blank=True,
+        help_text='Story text the current parsing_result was parsed from (baseline for incremental re-parses)'
+    )
     parsing_started_at = models.DateTimeField(
         null=True, blank=True,
         help_text='When parsing started (to detect stale jobs)'
@@ -114,6 +124,14 @@ class Document(models.Model):
         null=True, blank=True,
         help_text='When the complaint was last generated'
     )
+    generated_fingerprint = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text='Fingerprint of the document data the cached complaint was generated from'
+    )
+    generated_html = models.TextField(
+        blank=True, default='',
+        help_text='Cached rendered PDF HTML for the cached complaint'
+    )
 
     # Final document text fields - editable by user in final review
     final_introduction = models.TextField(
@@ -158,20 +176,46 @@ class Document(models.Model):
         help_text='When final document text was last edited by user'
     )
 
+    # Kept current with F() updates from elsewhere (the AI call log flusher adds
+    # ai_cost_used, DocumentSection writes adjust the section counters). A full
+    # save() of an instance loaded earlier must not write its stale copies back.
+    ATOMIC_COUNTER_FIELDS = ('ai_cost_used', 'sections_done', 'sections_total')
+
     class Meta:
         ordering = ['-updated_at']
 
     def __str__(self):
         return f"{self.title} - {self.user.email}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.ATOMIC_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def get_completion_percentage(self):
-        """Calculate overall completion percentage based on sections."""
-        sections = self.sections.all()
-        if not sections:
+        """Overall completion percentage, from the denormalized section counters (no query)."""
+        if not self.sections_total:
             return 0
-        # Count both 'completed' and 'not_applicable' as done
-        done = sections.filter(status__in=['completed', 'not_applicable']).count()
-        return int((done / sections.count()) * 100)
+        return int((self.sections_done / self.sections_total) * 100)
+
+    def count_sections(self):
+        """(done, total) counted from the sections table - the source of truth for the counters."""
+        from django.db.models import Count, Q
+        counts = self.sections.aggregate(
+            total=Count('id'),
+            done=Count('id', filter=Q(status__in=DocumentSection.DONE_STATUSES)),
+        )
+        return counts['done'], counts['total']
+
+    def refresh_section_counts(self):
+        """Recount sections_done / sections_total and save them (after bulk section writes)."""
+        self.sections_done, self.sections_total = self.count_sections()
+        Document.objects.filter(pk=self.pk).update(
+            sections_done=self.sections_done, sections_total=self.sections_total
+        )
 
     def has_sections_needing_work(self):
         """Check if any sections need work."""
@@ -183,10 +227,12 @@ class Document(models.Model):
 
     def invalidate_generated_complaint(self):
         """Clear cached complaint when document data changes."""
-        if self.generated_complaint or self.generated_at:
+        if self.generated_complaint or self.generated_at or self.generated_html:
             self.generated_complaint = ''
             self.generated_at = None
-            self.save(update_fields=['generated_complaint', 'generated_at'])
+            self.generated_fingerprint = ''
+            self.generated_html = ''
+            self.save(update_fields=['generated_complaint', 'generated_at', 'generated_fingerprint', 'generated_html'])
 
     def has_final_document(self):
         """Check if final document text has been generated."""
@@ -331,6 +377,7 @@ class Document(models.Model):
         if self.payment_status in ('draft', 'paid'):
             self.ai_generations_used += 1
             self.save(update_fields=['ai_generations_used'])
+            self.user.entitlements.invalidate()
 
     def can_use_video_analysis(self):
         """
@@ -401,6 +448,9 @@ class DocumentSection(models.Model):
     notes = models.TextField(blank=True, help_text='Internal notes about what needs work')
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Statuses counted as done for Document.sections_done
+    DONE_STATUSES = ('completed', 'not_applicable')
+
     class Meta:
         ordering = ['order']
         unique_together = ['document', 'section_type']
@@ -408,6 +458,57 @@ class DocumentSection(models.Model):
     def __str__(self):
         return f"{self.get_section_type_display()} - {self.get_status_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can adjust the document's counters
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save, then adjust the parent Document's sections_done / sections_total
+        by the change (one UPDATE, only when the section is new or its status
+        changed). Bulk writes bypass this - call Document.refresh_section_counts().
+        """
+        from django.db.models import F
+        from django.db.models.functions import Greatest
+
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        status_written = update_fields is None or 'status' in update_fields
+        previous = getattr(self, '_saved_status', None)
+
+        super().save(*args, **kwargs)
+
+        if not status_written:
+            return
+        is_done = self.status in self.DONE_STATUSES
+        if adding:
+            Document.objects.filter(pk=self.document_id).update(
+                sections_total=F('sections_total') + 1,
+                sections_done=F('sections_done') + int(is_done),
+            )
+        elif previous is not None and previous != self.status:
+            was_done = previous in self.DONE_STATUSES
+            if is_done != was_done:
+                Document.objects.filter(pk=self.document_id).update(
+                    sections_done=F('sections_done') + 1 if is_done else Greatest(F('sections_done') - 1, 0)
+                )
+        self._saved_status = self.status
+
+    def delete(self, *args, **kwargs):
+        from django.db.models import F
+        from django.db.models.functions import Greatest
+
+        document_id, was_done = self.document_id, self.status in self.DONE_STATUSES
+        result = super().delete(*args, **kwargs)
+        Document.objects.filter(pk=document_id).update(
+            sections_total=Greatest(F('sections_total') - 1, 0),
+            sections_done=Greatest(F('sections_done') - int(was_done), 0),
+        )
+        return result
+
 
 # Section-specific data models
 
@@ -967,6 +1068,20 @@ class AIPrompt(models.Model):
         default=2000,
         help_text='Maximum tokens in the response'
     )
+    max_input_tokens = models.PositiveIntegerField(
+        default=0,
+        help_text='Token budget for case inputs (story, transcripts, document text) sent with this prompt. '
+                  'Larger inputs are trimmed to fit. 0 = AI_INPUT_TOKEN_BUDGET setting'
+    )
+    small_model_name = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text='Cheaper/faster model for small requests (e.g., gpt-4.1-nano). Blank = always use the model above'
+    )
+    small_model_max_input_tokens = models.PositiveIntegerField(
+        default=0,
+        help_text='Use the small model when the estimated prompt is at most this many tokens'
+    )
     is_active = models.BooleanField(
         default=True,
         help_text='If disabled, this prompt will not be used'
@@ -1013,6 +1128,64 @@ class AIPrompt(models.Model):
             # If a variable is missing, return template as-is
             return self.user_prompt_template
 
+    def get_available_variables(self) -> set:
+        """Variable names declared in available_variables."""
+        return {name.strip() for name in self.available_variables.split(',') if name.strip()}
+
+    def get_template_placeholders(self) -> set:
+        """
+        Placeholder names used in user_prompt_template (str.format syntax).
+
+        Raises:
+            ValueError: If the template has unbalanced braces
+        """
+        placeholders = set()
+        for _, field_name, _, _ in string.Formatter().parse(self.user_prompt_template):
+            if field_name is not None:
+                # {name.attr} / {name[0]} still need `name`
+                placeholders.add(field_name.split('.')[0].split('[')[0])
+        return placeholders
+
+    def clean(self):
+        """Reject templates that would fail when formatted at request time."""
+        from django.core.exceptions import ValidationError
+        try:
+            placeholders = self.get_template_placeholders()
+        except ValueError as e:
+            raise ValidationError({
+                'user_prompt_template': f'Invalid placeholder syntax: {e}. Use {{{{ and }}}} for literal braces.'
+            })
+
+        if '' in placeholders:
+            raise ValidationError({
+                'user_prompt_template': 'Empty placeholder {} - name every placeholder, e.g. {story_text}.'
+            })
+
+        undeclared = placeholders - self.get_available_variables()
+        if undeclared:
+            raise ValidationError({
+                'user_prompt_template': (
+                    f'Placeholders not listed in available variables: {", ".join(sorted(undeclared))}. '
+                    f'Add them to available variables or use {{{{ and }}}} for literal braces.'
+                )
+            })
+
+        if self.small_model_name and not self.small_model_max_input_tokens:
+            raise ValidationError({
+                'small_model_max_input_tokens': 'Set the size limit for requests routed to the small model.'
+            })
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .services.prompt_registry import PromptRegistry
+        PromptRegistry.invalidate()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .services.prompt_registry import PromptRegistry
+        PromptRegistry.invalidate()
+        return result
+
 
 # =============================================================================
 # Video Evidence Models (YouTube transcript extraction for subscribers)
@@ -1308,8 +1481,10 @@ class WizardSession(models.Model):
     # AI extraction from the raw story (pre-fill data for steps)
     ai_extracted = models.JSONField(default=dict, blank=True)
 
-    # User-confirmed data from each wizard step
-    interview_data = models.JSONField(default=dict, blank=True)
+    # User-confirmed data from each wizard step lives in WizardStep rows (see interview_data)
+    revision = models.PositiveIntegerField(
+        default=0, help_text='Bumped on every step save; clients send it back for optimistic concurrency'
+    )
 
     # User preference: include case law in analysis
     use_case_law = models.BooleanField(default=True)
@@ -1349,21 +1524,417 @@ class WizardSession(models.Model):
     def is_complete(self):
         return self.status == 'completed'
 
+    @property
+    def interview_data(self):
+        """All user-confirmed step data as {'step_1': {...}, ...} (one query unless steps are prefetched)."""
+        return {f'step_{step.step_number}': step.data for step in self.steps.all()}
+
     def get_step_data(self, step_number):
         """Get user-confirmed data for a specific step."""
-        return self.interview_data.get(f'step_{step_number}', {})
+        if 'steps' in getattr(self, '_prefetched_objects_cache', {}):
+            return self.interview_data.get(f'step_{step_number}', {})
+        return self.steps.filter(step_number=step_number).values_list('data', flat=True).first() or {}
+
+    @staticmethod
+    def encode_step_data(data):
+        """Round-trip step data through DjangoJSONEncoder (date/time objects become strings)."""
+        import json
+        from django.core.serializers.json import DjangoJSONEncoder
+        return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+    def _progress_updates(self, step_number):
+        """Session fields bumped by every step save, as UPDATE expressions."""
+        from django.db.models import Case, F, Value, When
+        from django.db.models.functions import Greatest
+
+        return {
+            'current_step': Greatest(F('current_step'), Value(min(step_number + 1, self.TOTAL_STEPS + 1))),
+            'status': Case(When(status='not_started', then=Value('in_progress')), default=F('status')),
+            'revision': F('revision') + 1,
+            'updated_at': timezone.now(),
+        }
 
     def set_step_data(self, step_number, data):
         """Save user-confirmed data for a specific step."""
+        from django.db import transaction
+
+        data = self.encode_step_data(data)
+        with transaction.atomic():
+            WizardSession.objects.filter(pk=self.pk).update(**self._progress_updates(step_number))
+            WizardStep.objects.update_or_create(
+                session=self, step_number=step_number,
+                defaults={'data': data, **WizardStep.typed_values(step_number, data)},
+            )
+        self.refresh_from_db(fields=['revision', 'current_step', 'status'])
+
+    def patch_step_data(self, step_number, changes, expected_revision=None):
+        """
+        Merge changed keys into one step's data without rewriting the rest of
+        it. On PostgreSQL the merge is done in place (data || changes) in a
+        single UPDATE; other databases read, merge and save the step row.
+
+        Args:
+            step_number: Wizard step (1 to TOTAL_STEPS)
+            changes: Encoded values (see encode_step_data) for the keys that changed
+            expected_revision: Revision the client last saw; None skips the check
+
+        Returns:
+            The new revision, or None if expected_revision is stale (nothing written)
+        """
         import json
-        from django.core.serializers.json import DjangoJSONEncoder
-        # Reassign (not mutate) so Django's JSONField detects the change
-        interview_data = dict(self.interview_data)
-        # Round-trip through DjangoJSONEncoder to convert date/time objects to strings
-        interview_data[f'step_{step_number}'] = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
-        self.interview_data = interview_data
-        if step_number >= self.current_step:
-            self.current_step = min(step_number + 1, self.TOTAL_STEPS + 1)
-        if self.status == 'not_started':
-            self.status = 'in_progress'
-        self.save(update_fields=['interview_data', 'current_step', 'status'])
+        from django.db import connection, transaction
+        from django.db.models.expressions import RawSQL
+
+        rows = WizardSession.objects.filter(pk=self.pk)
+        if expected_revision is not None:
+            rows = rows.filter(revision=expected_revision)
+
+        with transaction.atomic():
+            # The session row update also serializes concurrent saves of this session
+            if not rows.update(**self._progress_updates(step_number)):
+                return None
+            typed = WizardStep.typed_values(step_number, changes)
+            step_rows = WizardStep.objects.filter(session=self, step_number=step_number)
+            if connection.vendor == 'postgresql':
+                merged = RawSQL('data || %s::jsonb', (json.dumps(changes),), output_field=models.JSONField())
+                updated = step_rows.update(data=merged, updated_at=timezone.now(), **typed)
+            else:
+                step = step_rows.first()
+                if step is not None:
+                    step.data = {**step.data, **changes}
+                    for field, value in typed.items():
+                        setattr(step, field, value)
+                    step.save()
+                updated = step is not None
+            if not updated:
+                WizardStep.objects.create(session=self, step_number=step_number, data=changes, **typed)
+
+        self.refresh_from_db(fields=['revision', 'current_step', 'status'])
+        return self.revision
+
+    def clear_steps(self):
+        """Drop all step data (story resubmitted)."""
+        self.steps.all().delete()
+
+
+class WizardStep(models.Model):
+    """
+    User-confirmed data for one wizard step.
+
+    The step's answers are kept as JSON (shape defined by the step serializers
+    in documents/api/serializers.py). Step 1's date, time and place are also
+    stored in typed columns so sessions can be filtered and sorted on them:
+
+        WizardSession.objects.filter(current_step=2, steps__step_number=1, steps__state='TX')
+
+    On PostgreSQL, migration 0019 adds GIN indexes on data (and on the
+    session's AI JSON) for containment queries.
+    """
+
+    # JSON key -> typed column, per step
+    TYPED_FIELDS = {
+        1: {'incident_date': 'incident_date', 'incident_time': 'incident_time', 'city': 'city', 'state': 'state'},
+    }
+
+    session = models.ForeignKey(WizardSession, on_delete=models.CASCADE, related_name='steps')
+    step_number = models.PositiveSmallIntegerField()
+    data = models.JSONField(default=dict, blank=True)
+
+    # Step 1 (When & Where)
+    incident_date = models.DateField(null=True, blank=True)
+    incident_time = models.TimeField(null=True, blank=True)
+    city = models.CharField(max_length=200, blank=True)
+    state = models.CharField(max_length=2, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['step_number']
+        verbose_name = 'Wizard Step'
+        verbose_name_plural = 'Wizard Steps'
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'step_number'], name='unique_wizard_step'),
+        ]
+        indexes = [
+            models.Index(fields=['state', 'city'], name='wizard_step_place_idx'),
+            models.Index(fields=['incident_date'], name='wizard_step_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Step {self.step_number} of {self.session.slug}"
+
+    @classmethod
+    def typed_values(cls, step_number, data):
+        """Typed column values for the keys present in (encoded) step data."""
+        from django.utils.dateparse import parse_date, parse_time
+
+        parsers = {'incident_date': parse_date, 'incident_time': parse_time}
+        values = {}
+        for key, field in cls.TYPED_FIELDS.get(step_number, {}).items():
+            if key not in data:
+                continue
+            value = data[key]
+            if field in parsers:
+                try:
+                    value = parsers[field](value) if value else None
+                except ValueError:
+                    value = None
+            else:
+                value = (value or '')[:cls._meta.get_field(field).max_length]
+            values[field] = value
+        return values
+
+
+# =============================================================================
+# Background Job Queue (durable replacement for in-process threads)
+# =============================================================================
+
+class BackgroundJob(models.Model):
+    """
+    A unit of background work (story parsing, PDF generation, wizard AI calls).
+    Stored in the database so work survives gunicorn worker restarts.
+    Processed by `python manage.py run_workers`.
+    """
+
+    JOB_TYPES = [
+        ('process_story', 'Process Story'),
+        ('generate_pdf', 'Generate PDF'),
+        ('extract_wizard_story', 'Extract Wizard Story'),
+        ('analyze_wizard_case', 'Analyze Wizard Case'),
+        ('refresh_jurisdiction', 'Refresh Jurisdiction Record'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    job_type = models.CharField(max_length=50, choices=JOB_TYPES)
+    payload = models.JSONField(default=dict, blank=True, help_text='Keyword arguments passed to the job handler')
+    reference = models.CharField(
+        max_length=100, blank=True, db_index=True,
+        help_text='Object this job works on (e.g., "document:42") - used to avoid duplicate jobs'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text='Job is not picked up before this time (used for retry backoff)')
+    locked_by = models.CharField(max_length=100, blank=True, help_text='Worker that claimed this job')
+    locked_until = models.DateTimeField(
+        null=True, blank=True,
+        help_text='Visibility timeout - a running job past this time is considered stuck and re-queued'
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Background Job'
+        verbose_name_plural = 'Background Jobs'
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_job_type_display()} #{self.pk} ({self.status})"
+
+    @property
+    def can_retry(self):
+        return self.attempts < self.max_attempts
+
+
+# =============================================================================
+# AI Response Cache (content-addressed cache of OpenAI completions)
+# =============================================================================
+
+class AIResponseCacheEntry(models.Model):
+    """
+    Cached OpenAI response keyed by prompt type/version, model, temperature and
+    a hash of the rendered messages. Shared across users, so repeated lookups
+    (same city/state, retried wizard) don't call the API again.
+    """
+
+    cache_key = models.CharField(max_length=64, unique=True, help_text='SHA-256 of the request parameters')
+    prompt_type = models.CharField(max_length=50, db_index=True)
+    prompt_version = models.IntegerField(default=0)
+    model_name = models.CharField(max_length=50)
+    response_text = models.TextField(help_text='Raw response content returned by the API')
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(default=timezone.now, db_index=True, help_text='Used for LRU eviction')
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-last_accessed_at']
+        verbose_name = 'AI Response Cache Entry'
+        verbose_name_plural = 'AI Response Cache Entries'
+
+    def __str__(self):
+        return f"{self.prompt_type} v{self.prompt_version} ({self.cache_key[:12]})"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class AIResponseCacheStats(models.Model):
+    """Hit/miss counters for the AI response cache, one row per prompt type."""
+
+    prompt_type = models.CharField(max_length=50, unique=True)
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['prompt_type']
+        verbose_name = 'AI Response Cache Stats'
+        verbose_name_plural = 'AI Response Cache Stats'
+
+    def __str__(self):
+        return f"{self.prompt_type}: {self.hits} hits / {self.misses} misses"
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return round(self.hits / total * 100, 1) if total else 0
+
+
+# =============================================================================
+# AI Call Log (token and cost accounting for every OpenAI call)
+# =============================================================================
+
+class AICallLog(models.Model):
+    """
+    One OpenAI call (or AI response cache hit), written in batches by
+    services.ai_call_log. Feeds the AI usage dashboard and Document.ai_cost_used.
+    """
+
+    API_CHOICES = [
+        ('chat', 'Chat Completions'),
+        ('responses', 'Responses'),
+        ('cache', 'Response Cache'),
+    ]
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    prompt_type = models.CharField(max_length=50, db_index=True)
+    model_name = models.CharField(max_length=50, blank=True)
+    api = models.CharField(max_length=20, choices=API_CHOICES)
+    document = models.ForeignKey(
+        'Document',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ai_calls'
+    )
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    latency_ms = models.PositiveIntegerField(default=0)
+    cache_hit = models.BooleanField(default=False)
+    cost = models.DecimalField(max_digits=10, decimal_places=6, default=0, help_text='USD, from AI_MODEL_PRICING')
+    success = models.BooleanField(default=True)
+    error = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'AI Call Log'
+        verbose_name_plural = 'AI Call Logs'
+        indexes = [
+            models.Index(fields=['prompt_type', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.prompt_type} ({self.model_name}) {self.created_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+
+# =============================================================================
+# Jurisdiction Records (persistent store for agency/address web-search lookups)
+# =============================================================================
+
+class JurisdictionRecord(models.Model):
+    """
+    Law enforcement jurisdiction info for a city, shared across all users.
+    Filled from GPT web-search lookups on a miss and refreshed when stale.
+    Admins can verify or correct entries - verified entries are preferred
+    and refreshed far less often.
+    """
+
+    SOURCE_CHOICES = [
+        ('gpt_web_search', 'GPT Web Search'),
+        ('manual', 'Manual Entry'),
+    ]
+
+    city_key = models.CharField(max_length=100, help_text='Normalized city name (lowercase, no punctuation)')
+    state = models.CharField(max_length=2, help_text='Two-letter state code')
+    city = models.CharField(max_length=100, help_text='City name as displayed')
+    county_name = models.CharField(max_length=100, blank=True)
+    location_type = models.CharField(max_length=50, blank=True, help_text='e.g., city, town, village, unincorporated')
+    has_local_police = models.BooleanField(null=True, blank=True)
+    primary_agency = models.CharField(max_length=255, blank=True)
+    agencies = models.JSONField(
+        default=list, blank=True,
+        help_text='List of agencies with jurisdiction: [{"name", "type", "address", "is_primary"}]'
+    )
+    agency_addresses = models.JSONField(
+        default=dict, blank=True,
+        help_text='Agency headquarters addresses keyed by normalized agency name'
+    )
+    verification_warning = models.TextField(blank=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='gpt_web_search')
+    is_verified = models.BooleanField(default=False, help_text='Checked by staff - takes precedence over refresh')
+    verified_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='verified_jurisdictions'
+    )
+    verified_at = models.DateTimeField(null=True, blank=True)
+    pending_result = models.JSONField(
+        null=True, blank=True,
+        help_text='Refreshed GPT data for a verified record, waiting for staff review'
+    )
+    hit_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now, help_text='When agency data was last fetched or edited')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['state', 'city_key']
+        verbose_name = 'Jurisdiction Record'
+        verbose_name_plural = 'Jurisdiction Records'
+        constraints = [
+            models.UniqueConstraint(fields=['state', 'city_key'], name='unique_jurisdiction_city_state'),
+        ]
+
+    def __str__(self):
+        return f"{self.city}, {self.state}"
+
+    @property
+    def is_stale(self):
+        """Whether this record is past its refresh window (JURISDICTION_REFRESH_DAYS)."""
+        days = (
+            settings.JURISDICTION_VERIFIED_REFRESH_DAYS if self.is_verified
+            else settings.JURISDICTION_REFRESH_DAYS
+        )
+        return self.refreshed_at < timezone.now() - timedelta(days=days)
+
+    def as_agency_result(self):
+        """Return this record in the same shape as OpenAIService.find_law_enforcement_agency."""
+        return {
+            'success': True,
+            'has_local_police': self.has_local_police if self.has_local_police is not None else False,
+            'county_name': self.county_name,
+            'location_type': self.location_type or 'unknown',
+            'agencies': self.agencies,
+            'verification_warning': self.verification_warning,
+            'verified': self.is_verified,
+            'cached': True,
+        }
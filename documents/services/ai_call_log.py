@@ -0,0 +1,357 @@
+"""
+Token and cost accounting for OpenAI calls.
+
+Every client the services build is wrapped with instrument(), which times each
+chat.completions.create / responses.create call, reads the token usage off the
+response and queues an AICallLog row. AIResponseCache hits are logged too (no
+tokens, no cost) so hit rates show up per prompt type next to spend.
+
+Rows are written in batches by a background flusher (AI_CALL_LOG_BATCH_SIZE /
+AI_CALL_LOG_FLUSH_SECONDS), which also adds each call's cost to the owning
+Document.ai_cost_used.
+
+    client = instrument(OpenAI(api_key=...))
+    client.chat.completions.create(prompt_type='parse_story', model=..., messages=...)
+
+Calls are attributed to a document through ai_call_context(), which the
+AICallContextMiddleware sets from the URL and JobQueue.run sets from the job
+payload:
+
+    with ai_call_context(document_id=document.id):
+        service.parse_story(story_text)
+"""
+import atexit
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_context = contextvars.ContextVar('ai_call_context', default=None)
+
+MAX_ERROR_LENGTH = 255
+
+
+def set_context(document_id=None, document_slug=None, session_id=None, session_slug=None):
+    """Attribute subsequent AI calls to a document (resolved at flush time). Returns a reset token."""
+    return _context.set({
+        'document_id': document_id,
+        'document_slug': document_slug,
+        'session_id': session_id,
+        'session_slug': session_slug,
+    })
+
+
+def reset_context(token):
+    _context.reset(token)
+
+
+@contextmanager
+def ai_call_context(**kwargs):
+    """Attribute AI calls made inside the block to a document; takes the set_context() arguments."""
+    token = set_context(**kwargs)
+    try:
+        yield
+    finally:
+        reset_context(token)
+
+
+def current_context():
+    return _context.get()
+
+
+# =============================================================================
+# Cost
+# =============================================================================
+
+def get_model_pricing(model):
+    """
+    (input, output) USD per 1M tokens for a model, matched on the longest
+    AI_MODEL_PRICING prefix so dated snapshots ('gpt-4o-mini-2024-07-18') price
+    like their base model. Unknown models price at zero.
+    """
+    pricing = getattr(settings, 'AI_MODEL_PRICING', {})
+    matches = [name for name in pricing if model and model.startswith(name)]
+    if not matches:
+        return 0, 0
+    return pricing[max(matches, key=len)]
+
+
+def compute_cost(model, prompt_tokens, completion_tokens, web_search=False):
+    """USD cost of one call, as a Decimal rounded to the AICallLog.cost precision."""
+    input_price, output_price = get_model_pricing(model)
+    cost = (
+        Decimal(str(input_price)) * prompt_tokens
+        + Decimal(str(output_price)) * completion_tokens
+    ) / Decimal(1_000_000)
+    if web_search:
+        cost += Decimal(str(getattr(settings, 'AI_WEB_SEARCH_CALL_COST', 0)))
+    return cost.quantize(Decimal('0.000001'))
+
+
+# =============================================================================
+# Buffered writer
+# =============================================================================
+
+class AICallLogWriter:
+    """Buffers AICallLog rows in memory and writes them in batches from a daemon thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, row):
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= getattr(settings, 'AI_CALL_LOG_BATCH_SIZE', 50)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ai-call-log', daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        interval = getattr(settings, 'AI_CALL_LOG_FLUSH_SECONDS', 10)
+        while True:
+            self._wake.wait(timeout=interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows and roll their cost up into Document.ai_cost_used."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+
+        from django.db import close_old_connections, connection
+
+        try:
+            self._write(rows)
+        except Exception:
+            logger.exception(f"Failed to write {len(rows)} AI call log row(s)")
+        finally:
+            # The flusher thread owns its own connection; don't leave it open between batches
+            if threading.current_thread() is self._thread:
+                connection.close()
+            else:
+                close_old_connections()
+        return len(rows)
+
+    @staticmethod
+    def _write(rows):
+        from collections import defaultdict
+        from django.db import transaction
+        from django.db.models import F
+        from documents.models import AICallLog, Document, WizardSession
+
+        # Resolve slugs/session ids to document ids in one query each
+        slugs = {r['context'].get('document_slug') for r in rows if r['context']} - {None}
+        session_ids = {r['context'].get('session_id') for r in rows if r['context']} - {None}
+        session_slugs = {r['context'].get('session_slug') for r in rows if r['context']} - {None}
+        by_slug = dict(Document.objects.filter(slug__in=slugs).values_list('slug', 'id')) if slugs else {}
+        by_session_id = dict(
+            WizardSession.objects.filter(id__in=session_ids).values_list('id', 'document_id')
+        ) if session_ids else {}
+        by_session_slug = dict(
+            WizardSession.objects.filter(slug__in=session_slugs).values_list('slug', 'document_id')
+        ) if session_slugs else {}
+
+        logs = []
+        cost_by_document = defaultdict(Decimal)
+        for row in rows:
+            context = row.pop('context') or {}
+            document_id = (
+                context.get('document_id')
+                or by_slug.get(context.get('document_slug'))
+                or by_session_id.get(context.get('session_id'))
+                or by_session_slug.get(context.get('session_slug'))
+            )
+            logs.append(AICallLog(document_id=document_id, **row))
+            if document_id and row['cost']:
+                cost_by_document[document_id] += row['cost']
+
+        with transaction.atomic():
+            AICallLog.objects.bulk_create(logs)
+            for document_id, cost in cost_by_document.items():
+                Document.objects.filter(id=document_id).update(ai_cost_used=F('ai_cost_used') + cost)
+
+
+_writer = AICallLogWriter()
+atexit.register(_writer.flush)
+
+
+def get_writer():
+    return _writer
+
+
+def record_call(prompt_type, model, api, prompt_tokens=0, completion_tokens=0, latency_ms=0,
+                cache_hit=False, success=True, error='', context=None, web_search=False):
+    """
+    Queue one AICallLog row. Never raises - accounting must not fail the call it measures.
+
+    Args:
+        prompt_type: AIPrompt.prompt_type (or a fixed name for hardcoded prompts)
+        model: OpenAI model name
+        api: 'chat', 'responses' or 'cache'
+        context: Attribution dict (defaults to the current ai_call_context)
+    """
+    from django.utils import timezone
+
+    try:
+        if not getattr(settings, 'AI_CALL_LOG_ENABLED', True):
+            return
+        billed = success and not cache_hit
+        _writer.add({
+            'created_at': timezone.now(),
+            'prompt_type': (prompt_type or 'unspecified')[:50],
+            'model_name': (model or '')[:50],
+            'api': api,
+            'prompt_tokens': prompt_tokens or 0,
+            'completion_tokens': completion_tokens or 0,
+            'latency_ms': max(int(latency_ms), 0),
+            'cache_hit': cache_hit,
+            'cost': compute_cost(model, prompt_tokens or 0, completion_tokens or 0,
+                                 web_search=web_search and billed) if billed else Decimal('0'),
+            'success': success,
+            'error': (error or '')[:MAX_ERROR_LENGTH],
+            'context': context if context is not None else current_context(),
+        })
+    except Exception:
+        logger.exception(f"Failed to record AI call for {prompt_type}")
+
+
+# =============================================================================
+# Client wrapper
+# =============================================================================
+
+def _usage_tokens(usage):
+    """(prompt, completion) tokens from a Chat Completions or Responses usage object."""
+    if usage is None:
+        return 0, 0
+    prompt = getattr(usage, 'prompt_tokens', None)
+    if prompt is None:
+        prompt = getattr(usage, 'input_tokens', 0)
+    completion = getattr(usage, 'completion_tokens', None)
+    if completion is None:
+        completion = getattr(usage, 'output_tokens', 0)
+    return prompt or 0, completion or 0
+
+
+def _uses_web_search(kwargs):
+    return any('web_search' in str(tool.get('type', '')) for tool in kwargs.get('tools') or [])
+
+
+class InstrumentedClient:
+    """
+    Stand-in for an OpenAI client that logs chat.completions.create and
+    responses.create. Both accept an extra prompt_type= keyword; everything
+    else is passed through to the wrapped client unchanged.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        # Calls may run on executor threads that don't inherit the context
+        self._context = current_context()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat_create))
+        self.responses = SimpleNamespace(create=self._responses_create)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def _record(self, prompt_type, kwargs, api, started, usage=None, error=None):
+        prompt_tokens, completion_tokens = _usage_tokens(usage)
+        record_call(
+            prompt_type, kwargs.get('model'), api,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=(time.monotonic() - started) * 1000,
+            success=error is None,
+            error=str(error) if error is not None else '',
+            context=current_context() or self._context,
+            web_search=_uses_web_search(kwargs),
+        )
+
+    def _chat_create(self, prompt_type=None, **kwargs):
+        if kwargs.get('stream'):
+            kwargs.setdefault('stream_options', {'include_usage': True})
+        started = time.monotonic()
+        try:
+            response = self._client.chat.completions.create(**kwargs)
+        except Exception as e:
+            self._record(prompt_type, kwargs, 'chat', started, error=e)
+            raise
+        if kwargs.get('stream'):
+            return self._stream(response, prompt_type, kwargs, started)
+        self._record(prompt_type, kwargs, 'chat', started, usage=response.usage)
+        return response
+
+    def _stream(self, stream, prompt_type, kwargs, started):
+        # With include_usage the last chunk has no choices and carries the usage
+        usage = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    usage = chunk.usage
+                yield chunk
+        except GeneratorExit:
+            # Caller stopped reading: drop the connection and log the partial call
+            getattr(stream, 'close', lambda: None)()
+            self._record(prompt_type, kwargs, 'chat', started, usage=usage,
+                         error='Stream closed before completion')
+            raise
+        except Exception as e:
+            self._record(prompt_type, kwargs, 'chat', started, usage=usage, error=e)
+            raise
+        self._record(prompt_type, kwargs, 'chat', started, usage=usage)
+
+    def _responses_create(self, prompt_type=None, **kwargs):
+        started = time.monotonic()
+        try:
+            response = self._client.responses.create(**kwargs)
+        except Exception as e:
+            self._record(prompt_type, kwargs, 'responses', started, error=e)
+            raise
+        self._record(prompt_type, kwargs, 'responses', started, usage=response.usage)
+        return response
+
+
+class AsyncInstrumentedClient(InstrumentedClient):
+    """InstrumentedClient for AsyncOpenAI (non-streaming calls)."""
+
+    async def _chat_create(self, prompt_type=None, **kwargs):
+        started = time.monotonic()
+        try:
+            response = await self._client.chat.completions.create(**kwargs)
+        except Exception as e:
+            self._record(prompt_type, kwargs, 'chat', started, error=e)
+            raise
+        self._record(prompt_type, kwargs, 'chat', started, usage=getattr(response, 'usage', None))
+        return response
+
+    async def _responses_create(self, prompt_type=None, **kwargs):
+        started = time.monotonic()
+        try:
+            response = await self._client.responses.create(**kwargs)
+        except Exception as e:
+            self._record(prompt_type, kwargs, 'responses', started, error=e)
+            raise
+        self._record(prompt_type, kwargs, 'responses', started, usage=getattr(response, 'usage', None))
+        return response
+
+
+def instrument(client):
+    """Wrap an OpenAI or AsyncOpenAI client so every call is logged."""
+    from openai import AsyncOpenAI
+
+    if isinstance(client, AsyncOpenAI):
+        return AsyncInstrumentedClient(client)
+    return InstrumentedClient(client)
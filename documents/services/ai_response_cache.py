@@ -0,0 +1,160 @@
+"""
+Content-addressed cache for OpenAI responses.
+
+Keys combine the prompt type, prompt version, model, temperature and a hash of
+the rendered messages, so a prompt edit or model change never serves a stale
+answer. Entries expire after a per-prompt-type TTL (AI_CACHE_TTL setting) and
+the least recently used entries are evicted once AI_CACHE_MAX_ENTRIES is hit.
+"""
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class AIResponseCache:
+    """Get/set cached OpenAI response text and track hit/miss counters."""
+
+    @staticmethod
+    def make_key(prompt_type, prompt_version, model_name, temperature, messages, **extra):
+        """
+        Build the cache key for a request.
+
+        Args:
+            prompt_type: AIPrompt.prompt_type (or a fixed name for hardcoded prompts)
+            prompt_version: AIPrompt.version (0 for hardcoded prompts)
+            model_name: OpenAI model name
+            temperature: Sampling temperature
+            messages: Rendered messages (list of dicts) or input string
+            **extra: Any other request parameters that change the response (tools, max_tokens)
+
+        Returns:
+            64-character hex SHA-256 digest
+        """
+        payload = json.dumps({
+            'prompt_type': prompt_type,
+            'prompt_version': prompt_version,
+            'model': model_name,
+            'temperature': temperature,
+            'messages': messages,
+            'extra': extra,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_ttl(prompt_type):
+        """TTL in seconds for a prompt type. 0 disables caching for that type."""
+        ttls = getattr(settings, 'AI_CACHE_TTL', {})
+        return ttls.get(prompt_type, ttls.get('default', 0))
+
+    @classmethod
+    def is_enabled(cls, prompt_type):
+        return getattr(settings, 'AI_CACHE_ENABLED', True) and cls.get_ttl(prompt_type) > 0
+
+    @classmethod
+    def get(cls, cache_key, prompt_type):
+        """Return cached response text, or None on a miss. Records the hit/miss."""
+        from documents.models import AIResponseCacheEntry
+        from .ai_call_log import record_call
+
+        started = time.monotonic()
+        try:
+            entry = AIResponseCacheEntry.objects.filter(
+                cache_key=cache_key,
+                expires_at__gt=timezone.now(),
+            ).only('id', 'response_text', 'model_name').first()
+
+            if entry is None:
+                cls._record(prompt_type, hit=False)
+                return None
+
+            AIResponseCacheEntry.objects.filter(id=entry.id).update(
+                hit_count=F('hit_count') + 1,
+                last_accessed_at=timezone.now(),
+            )
+            cls._record(prompt_type, hit=True)
+            record_call(
+                prompt_type, entry.model_name, 'cache',
+                latency_ms=(time.monotonic() - started) * 1000,
+                cache_hit=True,
+            )
+            return entry.response_text
+        except Exception:
+            # Cache problems must never break the AI call itself
+            logger.exception("AI response cache lookup failed")
+            return None
+
+    @classmethod
+    def set(cls, cache_key, prompt_type, prompt_version, model_name, response_text):
+        """Store a response and evict old entries if the cache is over capacity."""
+        from documents.models import AIResponseCacheEntry
+
+        if not response_text:
+            return
+
+        now = timezone.now()
+        try:
+            AIResponseCacheEntry.objects.update_or_create(
+                cache_key=cache_key,
+                defaults={
+                    'prompt_type': prompt_type,
+                    'prompt_version': prompt_version or 0,
+                    'model_name': model_name,
+                    'response_text': response_text,
+                    'last_accessed_at': now,
+                    'expires_at': now + timedelta(seconds=cls.get_ttl(prompt_type)),
+                },
+            )
+            cls.evict()
+        except Exception:
+            logger.exception("AI response cache write failed")
+
+    @classmethod
+    def evict(cls):
+        """
+        Delete expired entries, then the least recently used entries beyond
+        AI_CACHE_MAX_ENTRIES. Returns the number of entries deleted.
+        """
+        from documents.models import AIResponseCacheEntry
+
+        deleted, _ = AIResponseCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()
+
+        max_entries = getattr(settings, 'AI_CACHE_MAX_ENTRIES', 5000)
+        overflow = AIResponseCacheEntry.objects.count() - max_entries
+        if overflow > 0:
+            stale_ids = list(
+                AIResponseCacheEntry.objects
+                .order_by('last_accessed_at')
+                .values_list('id', flat=True)[:overflow]
+            )
+            lru_deleted, _ = AIResponseCacheEntry.objects.filter(id__in=stale_ids).delete()
+            deleted += lru_deleted
+
+        return deleted
+
+    @classmethod
+    def clear(cls, prompt_type=None):
+        """Delete all entries, or only those for one prompt type."""
+        from documents.models import AIResponseCacheEntry
+
+        qs = AIResponseCacheEntry.objects.all()
+        if prompt_type:
+            qs = qs.filter(prompt_type=prompt_type)
+        deleted, _ = qs.delete()
+        return deleted
+
+    @staticmethod
+    def _record(prompt_type, hit):
+        from documents.models import AIResponseCacheStats
+
+        field = 'hits' if hit else 'misses'
+        updated = AIResponseCacheStats.objects.filter(prompt_type=prompt_type).update(**{field: F(field) + 1})
+        if not updated:
+            AIResponseCacheStats.objects.get_or_create(prompt_type=prompt_type, defaults={field: 1})
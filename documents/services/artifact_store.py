@@ -0,0 +1,214 @@
+"""
+Persistent storage for generated PDF artifacts.
+
+Artifacts are keyed by document and content hash:
+
+    documents/<document id>/<sha256 of the rendered HTML>.pdf
+
+so an unchanged document maps to the same key and is never rendered twice.
+The backend is chosen by the PDF_ARTIFACT_STORE setting:
+
+- FileSystemArtifactStore (default): files under PDF_ARTIFACT_STORE['OPTIONS']['root'].
+  Every web and worker instance must share that directory.
+- S3ArtifactStore: any S3-compatible service (AWS S3, or MinIO/LocalStack
+  locally via endpoint_url). Requires boto3.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+KEY_RE = re.compile(r'^documents/(\d+)/([0-9a-f]{64})\.pdf$')
+CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(content):
+    """SHA-256 hex digest of a str or bytes."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class BaseArtifactStore:
+    """Interface for PDF artifact backends. Keys are always validated with parse_key."""
+
+    @staticmethod
+    def make_key(document_id, digest):
+        return f'documents/{document_id}/{digest}.pdf'
+
+    @staticmethod
+    def parse_key(key):
+        """Return (document_id, digest) for a valid key, or None (e.g. legacy temp file paths)."""
+        match = KEY_RE.match(key or '')
+        return (int(match.group(1)), match.group(2)) if match else None
+
+    def save(self, key, data):
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def size(self, key):
+        raise NotImplementedError
+
+    def open(self, key, start=0, end=None):
+        """Yield the bytes of an artifact from start to end (inclusive) in chunks."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def list(self):
+        """Yield (key, modified_at) for every artifact."""
+        raise NotImplementedError
+
+
+class FileSystemArtifactStore(BaseArtifactStore):
+    """Artifacts stored as files under a root directory."""
+
+    def __init__(self, root):
+        self.root = str(root)
+
+    def _path(self, key):
+        if not self.parse_key(key):
+            raise ValueError(f'Invalid artifact key: {key!r}')
+        return os.path.join(self.root, *key.split('/'))
+
+    def save(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def exists(self, key):
+        return bool(self.parse_key(key)) and os.path.exists(self._path(key))
+
+    def size(self, key):
+        return os.path.getsize(self._path(key))
+
+    def open(self, key, start=0, end=None):
+        with open(self._path(key), 'rb') as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self):
+        base = os.path.join(self.root, 'documents')
+        if not os.path.isdir(base):
+            return
+        for document_dir in os.listdir(base):
+            dir_path = os.path.join(base, document_dir)
+            if not os.path.isdir(dir_path):
+                continue
+            for name in os.listdir(dir_path):
+                key = f'documents/{document_dir}/{name}'
+                if self.parse_key(key):
+                    mtime = os.path.getmtime(os.path.join(dir_path, name))
+                    yield key, datetime.fromtimestamp(mtime, tz=dt_timezone.utc)
+
+
+class S3ArtifactStore(BaseArtifactStore):
+    """Artifacts stored in an S3-compatible bucket."""
+
+    def __init__(self, bucket, prefix='pdf-artifacts/', endpoint_url=None, region_name=None,
+                 access_key_id=None, secret_access_key=None):
+        try:
+            import boto3
+        except ImportError:
+            raise ImproperlyConfigured('S3ArtifactStore requires boto3 (pip install boto3)')
+
+        if not bucket:
+            raise ImproperlyConfigured('S3ArtifactStore requires a bucket name')
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url or None,
+            region_name=region_name or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _object_key(self, key):
+        if not self.parse_key(key):
+            raise ValueError(f'Invalid artifact key: {key!r}')
+        return f'{self.prefix}{key}'
+
+    def save(self, key, data):
+        self.client.put_object(
+            Bucket=self.bucket, Key=self._object_key(key), Body=data, ContentType='application/pdf'
+        )
+
+    def exists(self, key):
+        if not self.parse_key(key):
+            return False
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def size(self, key):
+        return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))['ContentLength']
+
+    def open(self, key, start=0, end=None):
+        byte_range = f'bytes={start}-{"" if end is None else end}'
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key), Range=byte_range)
+        yield from response['Body'].iter_chunks(CHUNK_SIZE)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def list(self):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f'{self.prefix}documents/'):
+            for obj in page.get('Contents', []):
+                key = obj['Key'][len(self.prefix):]
+                if self.parse_key(key):
+                    yield key, obj['LastModified']
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """Return the configured artifact store (PDF_ARTIFACT_STORE setting)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = getattr(settings, 'PDF_ARTIFACT_STORE', {})
+                backend = import_string(config.get(
+                    'BACKEND', 'documents.services.artifact_store.FileSystemArtifactStore'
+                ))
+                options = config.get('OPTIONS') or {'root': os.path.join(settings.BASE_DIR, 'pdf_artifacts')}
+                _store = backend(**options)
+    return _store
@@ -0,0 +1,284 @@
+"""
+asyncio variant of OpenAIService for flows that make several independent AI calls.
+
+Calls go through AsyncOpenAI so they can run concurrently in one thread. A
+per-process semaphore (OPENAI_MAX_CONCURRENCY) caps the number of requests in
+flight across every event loop in the process, so a burst of worker jobs
+can't exceed the account's rate limits.
+
+Sync code (job handlers, views) enters through run_async():
+
+    service = AsyncOpenAIService()
+    result = run_async(service.process_story(story_text))
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from openai import AsyncOpenAI
+
+from .openai_service import OpenAIService
+from .story_diff import ALWAYS_REPARSED, PARSE_SECTIONS, RELIEF_INPUTS, affected_sections
+from .token_budget import select_model
+
+logger = logging.getLogger(__name__)
+
+_semaphore = None
+_semaphore_lock = threading.Lock()
+
+
+def _get_semaphore():
+    """Process-wide semaphore. A threading semaphore, since each caller runs its own event loop."""
+    global _semaphore
+    if _semaphore is None:
+        with _semaphore_lock:
+            if _semaphore is None:
+                _semaphore = threading.BoundedSemaphore(getattr(settings, 'OPENAI_MAX_CONCURRENCY', 8))
+    return _semaphore
+
+
+def run_async(coroutine):
+    """Run a coroutine to completion from sync code (job handlers, management commands)."""
+    return asyncio.run(coroutine)
+
+
+def run_sync(func, *args, **kwargs):
+    """
+    Await a sync function (ORM access, sync service calls) in a worker thread.
+    The thread's DB connections are closed afterwards so none are leaked.
+    """
+    def call():
+        from django.db import connections
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    return sync_to_async(call, thread_sensitive=False)()
+
+
+async def gather_limited(*coroutines, return_exceptions=True):
+    """
+    Run independent coroutines concurrently.
+
+    Returns results in argument order. With return_exceptions=True (default),
+    a failed call yields its exception instead of cancelling the others.
+    """
+    return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+
+
+class AsyncOpenAIService(OpenAIService):
+    """OpenAIService with async versions of the multi-call flows."""
+
+    def __init__(self):
+        from .ai_call_log import instrument
+        super().__init__()
+        self.async_client = instrument(AsyncOpenAI(api_key=settings.OPENAI_API_KEY, timeout=45.0))
+
+    async def _request_slot(self):
+        """
+        Wait for a request permit without tying up a thread. Polls the process-wide
+        semaphore, so a cancelled wait (timeout, asyncio.run teardown) never
+        leaves a permit acquired with no one to release it.
+        """
+        semaphore = _get_semaphore()
+        delay = 0.01
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    def _release_slot(self):
+        _get_semaphore().release()
+
+    async def _acached_json_completion(self, prompt_type: str, prompt_version: int, model: str,
+                                       messages: list, temperature: float, max_tokens: int) -> str:
+        """Async version of _cached_json_completion (same cache keys and rules)."""
+        from .ai_response_cache import AIResponseCache
+
+        model = await run_sync(select_model, prompt_type, model, messages)
+        use_cache = AIResponseCache.is_enabled(prompt_type)
+        if use_cache:
+            cache_key = AIResponseCache.make_key(
+                prompt_type, prompt_version, model, temperature, messages, max_tokens=max_tokens
+            )
+            cached = await run_sync(AIResponseCache.get, cache_key, prompt_type)
+            if cached is not None:
+                return cached
+
+        await self._request_slot()
+        try:
+            response = await self.async_client.chat.completions.create(
+                prompt_type=prompt_type,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
+        finally:
+            self._release_slot()
+        content = response.choices[0].message.content
+
+        if use_cache:
+            try:
+                json.loads(content)
+            except (TypeError, ValueError):
+                return content  # Don't cache truncated/invalid JSON
+            await run_sync(AIResponseCache.set, cache_key, prompt_type, prompt_version, model, content)
+
+        return content
+
+    async def aparse_story(self, story_text: str, verify_agencies: bool = True, sections=None) -> dict:
+        """
+        Async version of parse_story.
+
+        Args:
+            story_text: Raw text from user describing their incident
+            verify_agencies: Run _verify_inferred_agencies on the result. process_story
+                passes False and runs it alongside the other follow-up calls instead.
+            sections: Optional subset of sections to extract (see story_diff)
+        """
+        if not story_text or not story_text.strip():
+            return {
+                'success': False,
+                'error': 'No story text provided',
+            }
+
+        prompt, messages = await run_sync(self._parse_story_messages, story_text, sections)
+
+        try:
+            content = await self._acached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
+                messages=messages,
+                temperature=prompt['temperature'],
+                max_tokens=prompt['max_tokens'],
+            )
+            result = json.loads(content)
+
+            if verify_agencies:
+                result = await run_sync(self._verify_inferred_agencies, result)
+
+            return {
+                'success': True,
+                'sections': result,
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+            }
+
+    async def asuggest_relief(self, extracted_data: dict) -> dict:
+        """Async version of suggest_relief."""
+        if not extracted_data:
+            return {
+                'success': False,
+                'error': 'No extracted data provided',
+            }
+
+        prompt, messages = await run_sync(self._suggest_relief_messages, extracted_data)
+
+        try:
+            content = await self._acached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
+                messages=messages,
+                temperature=prompt['temperature'],
+                max_tokens=prompt['max_tokens'],
+            )
+            return {
+                'success': True,
+                'relief': json.loads(content),
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+            }
+
+    async def process_story(self, story_text: str, court_lookup=None,
+                            previous_text: str = '', previous_result: dict = None) -> dict:
+        """
+        Parse a story, then run the follow-up calls that only depend on the
+        parse result concurrently: relief suggestions, agency verification
+        and (optionally) the court lookup.
+
+        With the previously parsed story and its result, only the sections the
+        edit affects are re-extracted (see story_diff); the rest of the result,
+        and any follow-up call whose inputs didn't change, is reused.
+
+        Args:
+            story_text: Raw text from user describing their incident
+            court_lookup: Optional sync callable taking the extracted incident_overview
+                dict and returning a court result dict (or None). Runs in a worker thread.
+            previous_text: Story text the previous result was parsed from
+            previous_result: Previous process_story result (Document.parsing_result)
+
+        Returns:
+            parse_story result, plus 'relief_suggestions' and 'court_result' when available
+            and 'reparsed_sections' listing the sections extracted by this call
+        """
+        previous_sections = (previous_result or {}).get('sections')
+        sections = affected_sections(previous_text, story_text) if previous_sections else None
+
+        if sections is not None and not sections:
+            # Only whitespace/formatting changed - reuse the previous result
+            result = {'success': True, 'sections': previous_sections, 'reparsed_sections': []}
+            if previous_result.get('relief_suggestions'):
+                result['relief_suggestions'] = previous_result['relief_suggestions']
+            return result
+
+        result = await self.aparse_story(story_text, verify_agencies=False, sections=sections)
+        if not result.get('success'):
+            return result
+
+        if sections is None:
+            result['reparsed_sections'] = list(PARSE_SECTIONS)
+        else:
+            reparsed = {
+                key: value for key, value in result['sections'].items()
+                if key in sections or key in ALWAYS_REPARSED
+            }
+            result['sections'] = {**previous_sections, **reparsed}
+            result['reparsed_sections'] = sorted(sections)
+
+        def changed(*keys):
+            return sections is None or bool(sections & set(keys))
+
+        extracted = result['sections']
+        incident_data = extracted.get('incident_overview', {}) or {}
+
+        tasks = {}
+        if changed(*RELIEF_INPUTS):
+            tasks['relief'] = self.asuggest_relief(extracted)
+        if changed('defendants'):
+            # Works on a copy - it mutates defendants, which suggest_relief doesn't read
+            tasks['verified'] = run_sync(self._verify_inferred_agencies, json.loads(json.dumps(extracted)))
+        if court_lookup and changed('incident_overview'):
+            tasks['court'] = run_sync(court_lookup, incident_data)
+
+        outcomes = dict(zip(tasks, await gather_limited(*tasks.values())))
+
+        verified = outcomes.get('verified')
+        if isinstance(verified, dict):
+            result['sections'] = verified
+        elif isinstance(verified, Exception):
+            logger.warning(f"Agency verification failed: {verified}")
+
+        relief_result = outcomes.get('relief')
+        if isinstance(relief_result, dict) and relief_result.get('success'):
+            result['relief_suggestions'] = relief_result.get('relief', {})
+        elif 'relief' not in tasks and previous_result.get('relief_suggestions'):
+            result['relief_suggestions'] = previous_result['relief_suggestions']
+
+        court_result = outcomes.get('court')
+        if isinstance(court_result, Exception):
+            logger.warning(f"Court lookup failed during story processing: {court_result}")
+        elif court_result:
+            result['court_result'] = court_result
+
+        return result
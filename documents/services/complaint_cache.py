@@ -0,0 +1,119 @@
+"""
+Cache for the AI-generated complaint and its rendered PDF HTML.
+
+Entries are stored on the Document (generated_complaint, generated_html) and
+keyed by a fingerprint of the _collect_document_data snapshot plus the active
+generation prompt version. Any edit that changes what the generator sees
+changes the fingerprint, so a stale complaint is never served even if an
+invalidate_generated_complaint() call is missed; edits that don't change the
+snapshot keep the cached copy.
+"""
+import hashlib
+import json
+import logging
+
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Bump when DocumentGenerator output or the PDF template changes in a way old cache entries shouldn't survive
+CACHE_VERSION = 2
+
+PDF_TEMPLATE = 'documents/document_pdf.html'
+
+
+class ComplaintCache:
+    """Fingerprint-keyed cache for generated complaint sections and rendered HTML."""
+
+    @staticmethod
+    def fingerprint(document_data):
+        """
+        Stable fingerprint of a document data snapshot.
+
+        Args:
+            document_data: dict from _collect_document_data
+
+        Returns:
+            64-character hex SHA-256 digest
+        """
+        from .prompt_registry import PromptRegistry
+
+        prompt = PromptRegistry.get('generate_facts')
+        prompt_version = prompt['version'] if prompt else None
+        payload = json.dumps({
+            'version': CACHE_VERSION,
+            'prompt_version': prompt_version,
+            'data': document_data,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get_or_generate(cls, document, document_data, fingerprint=None):
+        """
+        Return the generated complaint for a document, generating it only on a cache miss.
+
+        Returns:
+            dict like DocumentGenerator.generate_complaint, plus 'cached' and 'fingerprint'
+        """
+        if fingerprint is None:
+            fingerprint = cls.fingerprint(document_data)
+
+        if document.generated_fingerprint == fingerprint and document.generated_complaint:
+            try:
+                sections = json.loads(document.generated_complaint)
+                return {'success': True, 'document': sections, 'cached': True, 'fingerprint': fingerprint}
+            except ValueError:
+                logger.warning(f"Discarding unreadable cached complaint for document {document.id}")
+
+        from .document_generator import DocumentGenerator
+
+        result = DocumentGenerator().generate_complaint(document_data)
+        result['cached'] = False
+        result['fingerprint'] = fingerprint
+
+        # Partial results (failed or timed-out sections) are used once but never cached
+        if result.get('success') and not result.get('failed_sections'):
+            cls._store(document, fingerprint, complaint=json.dumps(result['document']))
+
+        return result
+
+    @classmethod
+    def get_or_render_html(cls, document, document_data, generated_document, fingerprint):
+        """Return the rendered PDF HTML, rendering it only if the cached copy doesn't match."""
+        from django.template.loader import render_to_string
+
+        html_key = cls._html_key(document, fingerprint)
+        if document.generated_fingerprint == fingerprint and document.generated_html.startswith(html_key):
+            return document.generated_html[len(html_key):]
+
+        html_string = render_to_string(PDF_TEMPLATE, {
+            'document': document,
+            'generated_document': generated_document,
+            'document_data': document_data,
+        })
+
+        # Only cache HTML for a complaint that is itself cached under this fingerprint
+        if document.generated_fingerprint == fingerprint:
+            cls._store(document, fingerprint, html=html_key + html_string)
+
+        return html_string
+
+    @staticmethod
+    def _html_key(document, fingerprint):
+        """Marker prefixed to the cached HTML; the template also shows the document title."""
+        title_hash = hashlib.sha256((document.title or '').encode('utf-8')).hexdigest()[:16]
+        return f'<!-- complaint-cache {fingerprint[:16]} {title_hash} -->\n'
+
+    @staticmethod
+    def _store(document, fingerprint, complaint=None, html=None):
+        from documents.models import Document
+
+        fields = {'generated_fingerprint': fingerprint}
+        if complaint is not None:
+            fields.update(generated_complaint=complaint, generated_at=timezone.now(), generated_html='')
+        if html is not None:
+            fields['generated_html'] = html
+
+        Document.objects.filter(id=document.id).update(**fields)
+        for name, value in fields.items():
+            setattr(document, name, value)
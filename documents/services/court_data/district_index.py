@@ -0,0 +1,188 @@
+"""
+Precompiled (state, city) -> federal district index.
+
+Built once from every state lookup class registered in
+CourtLookupService.STATE_LOOKUPS, so a court lookup is a single dict access
+instead of a module import plus a linear scan of each district's city list.
+"""
+import importlib
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Abbreviations expanded word-by-word during normalization ("st. louis" -> "saint louis")
+CITY_ABBREVIATIONS = {
+    'st': 'saint',
+    'ste': 'sainte',
+    'mt': 'mount',
+    'mtn': 'mountain',
+    'ft': 'fort',
+    'pt': 'point',
+    'hts': 'heights',
+    'spgs': 'springs',
+    'twp': 'township',
+    'n': 'north',
+    's': 'south',
+    'e': 'east',
+    'w': 'west',
+}
+
+
+def normalize_city_name(city):
+    """
+    Normalize a city name for index keys.
+    Lowercases, drops punctuation, treats hyphens as spaces and expands abbreviations:
+    'St. Louis' -> 'saint louis', 'Winston-Salem' -> 'winston salem', 'Mt Vernon' -> 'mount vernon'.
+    """
+    city = (city or '').lower().replace('-', ' ')
+    city = re.sub(r"[^\w\s]", '', city)
+    words = [CITY_ABBREVIATIONS.get(word, word) for word in city.split()]
+    return ' '.join(words)
+
+
+class DistrictIndex:
+    """In-memory (state code, normalized city) -> court result index."""
+
+    def __init__(self):
+        self.entries = {}           # (state, city) -> result dict
+        self.single_district = {}   # state -> result dict for single-district states
+        self.district_names = {}    # (state, district key) -> court name
+        self.ambiguities = []       # (state, city, [district keys]) with no PREFERRED_DISTRICTS entry
+
+    @classmethod
+    def build(cls, state_lookups=None):
+        """Build the index from the state lookup classes."""
+        if state_lookups is None:
+            from ..court_lookup_service import CourtLookupService
+            state_lookups = CourtLookupService.STATE_LOOKUPS
+
+        index = cls()
+        for state_code, (module_name, class_name) in state_lookups.items():
+            try:
+                module = importlib.import_module(f'.states.{module_name}', package='documents.services.court_data')
+                lookup_class = getattr(module, class_name)
+            except (ImportError, AttributeError):
+                logger.warning(f"Court lookup class {module_name}.{class_name} for {state_code} could not be loaded")
+                continue
+            index._add_state(state_code, lookup_class)
+
+        return index
+
+    def _add_state(self, state_code, lookup_class):
+        districts = lookup_class.DISTRICTS or {}
+        for district_key, district_info in districts.items():
+            self.district_names[(state_code, district_key)] = district_info['name']
+
+        # city -> district keys, in DISTRICTS order
+        city_districts = {}
+        for district_key, district_info in districts.items():
+            for city in district_info.get('cities', []):
+                keys = city_districts.setdefault(normalize_city_name(city), [])
+                if district_key not in keys:
+                    keys.append(district_key)
+
+        preferred = {normalize_city_name(c): d for c, d in lookup_class.PREFERRED_DISTRICTS.items()}
+
+        for city, keys in city_districts.items():
+            confidence = 'high'
+            note = ''
+            if len(keys) > 1:
+                if preferred.get(city) in keys:
+                    district_key = preferred[city]
+                else:
+                    district_key = keys[0]
+                    confidence = 'medium'
+                    note = f'{city.title()} is listed in more than one district. Please verify.'
+                    self.ambiguities.append((state_code, city, keys))
+                    logger.warning(
+                        f"Ambiguous court district for '{city}', {state_code}: {keys} "
+                        f"(add it to {lookup_class.__name__}.PREFERRED_DISTRICTS)"
+                    )
+            else:
+                district_key = keys[0]
+
+            result = {
+                'court_name': districts[district_key]['name'],
+                'confidence': confidence,
+                'method': 'city_match',
+                'district': district_key,
+                'state': state_code,
+            }
+            if note:
+                result['note'] = note
+            self.entries[(state_code, city)] = result
+
+        for alias, district_key in lookup_class.CITY_ALIASES.items():
+            alias_key = (state_code, normalize_city_name(alias))
+            if alias_key in self.entries or district_key not in districts:
+                continue
+            self.entries[alias_key] = {
+                'court_name': districts[district_key]['name'],
+                'confidence': 'high',
+                'method': 'city_variation',
+                'district': district_key,
+                'state': state_code,
+            }
+
+        # Any state with one district is single-district, whether or not the class sets the flag
+        if len(districts) == 1:
+            district_info = list(districts.values())[0]
+            self.single_district[state_code] = {
+                'court_name': district_info['name'],
+                'confidence': 'medium',
+                'method': 'single_district_state',
+                'state': state_code,
+                'note': f'{lookup_class.STATE_NAME} has only one federal district court for the entire state.'
+            }
+
+    def lookup(self, state, city):
+        """
+        Look up the district court for a city.
+
+        Returns:
+            A copy of the result dict (court_name, confidence, method, district, state)
+            or None if the city isn't known and the state has several districts.
+        """
+        if not city or not state:
+            return None
+
+        state = state.strip().upper()
+        result = self.entries.get((state, normalize_city_name(city)))
+        if result is None:
+            result = self.single_district.get(state)
+        return dict(result) if result else None
+
+    def court_result(self, state, district_key, confidence, method, note=''):
+        """Build a result dict for a known district (used by the county/ZIP dataset)."""
+        court_name = self.district_names.get((state, district_key))
+        if not court_name:
+            return None
+        result = {
+            'court_name': court_name,
+            'confidence': confidence,
+            'method': method,
+            'district': district_key,
+            'state': state,
+        }
+        if note:
+            result['note'] = note
+        return result
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_district_index():
+    """Return the process-wide DistrictIndex, building it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DistrictIndex.build()
+    return _index
@@ -0,0 +1,192 @@
+"""
+Offline county and ZIP -> federal district resolution.
+
+Two bundled datasets in court_data/data/:
+
+- county_districts.tsv: every county in every multi-district state, from
+  28 U.S.C. §§ 81-131. Small, so it is parsed into a dict once.
+- zip_districts.bin: optional compiled ZIP index, built with
+  `python manage.py build_zip_district_index`. It is memory-mapped and binary
+  searched in place, so loading it costs nothing and it is shared between
+  processes through the page cache. It is NOT shipped in the repo (the source
+  crosswalk is licensed separately): until it is built, lookup_zip() returns
+  None and districts resolve from the county and city tables only.
+
+zip_districts.bin layout (little-endian):
+    header   : b'ZIPD', version (uint16), label count (uint16), entry count (uint32)
+    labels   : label count x 16 bytes - state code (2 bytes) + district key (14 bytes, NUL padded)
+    zips     : entry count x uint32, sorted ascending
+    label ids: entry count x uint16 - index into labels; high bit set if the ZIP spans districts
+"""
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from bisect import bisect_left
+
+from .district_index import normalize_city_name
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+COUNTY_DATA_PATH = os.path.join(DATA_DIR, 'county_districts.tsv')
+ZIP_DATA_PATH = os.path.join(DATA_DIR, 'zip_districts.bin')
+
+ZIP_MAGIC = b'ZIPD'
+ZIP_VERSION = 1
+ZIP_HEADER = struct.Struct('<4sHHI')
+ZIP_LABEL_SIZE = 16
+ZIP_AMBIGUOUS_FLAG = 0x8000
+
+
+def normalize_county_name(county):
+    """
+    Normalize a county name: 'St. Louis County' -> 'saint louis',
+    'City of Norfolk' -> 'norfolk city', 'Orleans Parish' -> 'orleans'.
+    """
+    county = (county or '').strip().lower()
+    is_city = bool(re.match(r'^city of\s+', county)) or county.endswith(' city')
+    county = re.sub(r'^city of\s+', '', county)
+    county = re.sub(r'\s+(county|parish|borough|city)$', '', county)
+    county = normalize_city_name(county)
+    return f'{county} city' if is_city and county else county
+
+
+def normalize_zip(zip_code):
+    """Return the 5-digit ZIP as an int, or None ('33602-1234' -> 33602)."""
+    match = re.match(r'^\s*(\d{5})(?:-\d{4})?\s*$', str(zip_code or ''))
+    return int(match.group(1)) if match else None
+
+
+class OfflineDistrictDataset:
+    """County and ZIP lookups against the bundled datasets."""
+
+    def __init__(self, county_path=COUNTY_DATA_PATH, zip_path=ZIP_DATA_PATH):
+        self.counties = {}      # (state, normalized county) -> district key
+        self._compact = {}      # same, with spaces removed ('de kalb' / 'dekalb')
+        self._load_counties(county_path)
+
+        self._zip_mmap = None
+        self._zip_labels = []
+        self._zips = None
+        self._zip_label_ids = None
+        self._load_zips(zip_path)
+
+    def _load_counties(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    if not line or line.startswith('#'):
+                        continue
+                    state, district_key, counties = line.split('\t')
+                    for county in counties.split('|'):
+                        key = normalize_county_name(county)
+                        self.counties[(state, key)] = district_key
+                        self._compact[(state, key.replace(' ', ''))] = district_key
+        except OSError:
+            logger.warning(f"County district dataset not found at {path}")
+
+    def _load_zips(self, path):
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, label_count, entry_count = ZIP_HEADER.unpack_from(data, 0)
+            if magic != ZIP_MAGIC or version != ZIP_VERSION:
+                logger.warning(f"Unsupported ZIP district dataset format in {path}")
+                data.close()
+                return
+
+            offset = ZIP_HEADER.size
+            for i in range(label_count):
+                raw = data[offset:offset + ZIP_LABEL_SIZE]
+                self._zip_labels.append((raw[:2].decode('ascii'), raw[2:].rstrip(b'\0').decode('ascii')))
+                offset += ZIP_LABEL_SIZE
+
+            view = memoryview(data)
+            self._zips = view[offset:offset + entry_count * 4].cast('I')
+            offset += entry_count * 4
+            self._zip_label_ids = view[offset:offset + entry_count * 2].cast('H')
+            self._zip_mmap = data
+        except (OSError, ValueError, struct.error):
+            logger.exception(f"Could not load ZIP district dataset from {path}")
+
+    @property
+    def has_zip_data(self):
+        return self._zips is not None
+
+    def lookup_county(self, state, county):
+        """Return the district key for a county, or None."""
+        if not state or not county:
+            return None
+        state = state.strip().upper()
+        key = normalize_county_name(county)
+        district_key = self.counties.get((state, key)) or self._compact.get((state, key.replace(' ', '')))
+        if district_key is None and not key.endswith(' city'):
+            # "Richmond" typed for the independent city of Richmond, VA
+            district_key = self.counties.get((state, f'{key} city'))
+        return district_key
+
+    def lookup_zip(self, zip_code):
+        """
+        Return (state, district_key, ambiguous) for a ZIP, or None.
+        ambiguous is True when the ZIP spans more than one district.
+        """
+        zip_int = normalize_zip(zip_code)
+        if zip_int is None or self._zips is None:
+            return None
+
+        i = bisect_left(self._zips, zip_int)
+        if i >= len(self._zips) or self._zips[i] != zip_int:
+            return None
+
+        label_id = self._zip_label_ids[i]
+        state, district_key = self._zip_labels[label_id & ~ZIP_AMBIGUOUS_FLAG]
+        return state, district_key, bool(label_id & ZIP_AMBIGUOUS_FLAG)
+
+
+def write_zip_dataset(entries, path=ZIP_DATA_PATH):
+    """
+    Write a ZIP dataset file.
+
+    Args:
+        entries: dict of zip (int) -> (state, district_key, ambiguous)
+        path: Output file path
+    """
+    from array import array
+
+    labels = sorted({(state, district) for state, district, _ in entries.values()})
+    label_ids = {label: i for i, label in enumerate(labels)}
+
+    zips = array('I')
+    ids = array('H')
+    for zip_int in sorted(entries):
+        state, district, ambiguous = entries[zip_int]
+        zips.append(zip_int)
+        ids.append(label_ids[(state, district)] | (ZIP_AMBIGUOUS_FLAG if ambiguous else 0))
+
+    with open(path, 'wb') as f:
+        f.write(ZIP_HEADER.pack(ZIP_MAGIC, ZIP_VERSION, len(labels), len(zips)))
+        for state, district in labels:
+            f.write(state.encode('ascii')[:2].ljust(2, b'\0'))
+            f.write(district.encode('ascii')[:ZIP_LABEL_SIZE - 2].ljust(ZIP_LABEL_SIZE - 2, b'\0'))
+        f.write(zips.tobytes())
+        f.write(ids.tobytes())
+
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+def get_offline_dataset():
+    """Return the process-wide OfflineDistrictDataset, loading it on first use."""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = OfflineDistrictDataset()
+    return _dataset
@@ -5,10 +5,18 @@ class BaseStateLookup:
     STATE_NAME = None
     DISTRICTS = {}
     IS_SINGLE_DISTRICT = False  # Override to True for single-district states
+    CITY_ALIASES = {}           # Nicknames/abbreviations -> district key (e.g., 'nyc': 'southern')
+    PREFERRED_DISTRICTS = {}    # City listed in several districts -> the district that actually has it
 
     @classmethod
     def lookup_court_by_city(cls, city):
-        """Look up federal district court by city name."""
+        """Look up federal district court by city name (uses the precompiled district index)."""
+        from ..district_index import get_district_index
+        return get_district_index().lookup(cls.STATE_CODE, city)
+
+    @classmethod
+    def _scan_court_by_city(cls, city):
+        """Linear scan of DISTRICTS - kept as the reference behaviour for the index."""
         if not city or not cls.DISTRICTS:
             return None
 
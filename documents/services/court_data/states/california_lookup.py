@@ -6,6 +6,9 @@ class CaliforniaLookup(BaseStateLookup):
     STATE_CODE = 'CA'
     STATE_NAME = 'California'
     
+    # Oceanside is in San Diego County (Southern District)
+    PREFERRED_DISTRICTS = {'oceanside': 'southern'}
+
     DISTRICTS = {
         'northern': {
             'name': 'United States District Court for the Northern District of California',
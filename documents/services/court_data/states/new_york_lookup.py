@@ -56,20 +56,30 @@ class NewYorkLookup(BaseStateLookup):
         }
     }
     
+    CITY_ALIASES = {
+        'nyc': 'southern',
+        'new york city': 'southern',
+        'manhattan': 'southern',
+        'the bronx': 'southern',
+        'long island': 'eastern',
+        'li': 'eastern'
+    }
+
+    # Brooklyn, Queens and Staten Island are in the Eastern District;
+    # Geneva and Canandaigua (Ontario County) are in the Western District
+    PREFERRED_DISTRICTS = {
+        'brooklyn': 'eastern',
+        'queens': 'eastern',
+        'staten island': 'eastern',
+        'geneva': 'western',
+        'canandaigua': 'western',
+    }
+
     @classmethod
     def _check_city_variations(cls, city):
         """Check for New York specific city name variations."""
-        city_variations = {
-            'nyc': 'southern',
-            'new york city': 'southern', 
-            'manhattan': 'southern',
-            'the bronx': 'southern',
-            'long island': 'eastern',
-            'li': 'eastern'
-        }
-        
-        if city in city_variations:
-            district_key = city_variations[city]
+        if city in cls.CITY_ALIASES:
+            district_key = cls.CITY_ALIASES[city]
             return {
                 'court_name': cls.DISTRICTS[district_key]['name'],
                 'confidence': 'high',
@@ -56,17 +56,17 @@ class PennsylvaniaLookup(BaseStateLookup):
         }
     }
     
+    CITY_ALIASES = {
+        'philly': 'eastern',
+        'pgh': 'western',
+        'steel city': 'western'
+    }
+
     @classmethod
     def _check_city_variations(cls, city):
         """Check for Pennsylvania specific city name variations."""
-        city_variations = {
-            'philly': 'eastern',
-            'pgh': 'western',
-            'steel city': 'western'
-        }
-        
-        if city in city_variations:
-            district_key = city_variations[city]
+        if city in cls.CITY_ALIASES:
+            district_key = cls.CITY_ALIASES[city]
             return {
                 'court_name': cls.DISTRICTS[district_key]['name'],
                 'confidence': 'high',
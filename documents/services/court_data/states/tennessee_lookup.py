@@ -4,6 +4,9 @@ class TennesseeLookup(BaseStateLookup):
     STATE_CODE = 'TN'
     STATE_NAME = 'Tennessee'
     
+    # Cookeville (Putnam County) is in the Middle District
+    PREFERRED_DISTRICTS = {'cookeville': 'middle'}
+
     DISTRICTS = {
         'eastern': {
             'name': 'United States District Court for the Eastern District of Tennessee',
@@ -4,6 +4,9 @@ class WashingtonLookup(BaseStateLookup):
     STATE_CODE = 'WA'
     STATE_NAME = 'Washington'
     
+    # Spokane is in the Eastern District
+    PREFERRED_DISTRICTS = {'spokane': 'eastern'}
+
     DISTRICTS = {
         'eastern': {
             'name': 'United States District Court for the Eastern District of Washington',
@@ -1,3 +1,80 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# A ZIP right after the state: "Houston, TX 77002"
+STATE_ZIP_RE = re.compile(r'\b[A-Z]{2}\.?,?\s+(\d{5})(?:-\d{4})?\b')
+# Any other 5-digit number not followed by a word - "10001 Elm Ave" is a street number
+ZIP_CODE_RE = re.compile(r'\b(\d{5})(?:-\d{4})?\b(?!\s+[A-Za-z])')
+
+
+def extract_zip_code(text):
+    """
+    Return the ZIP code in an address string, or None.
+
+    Prefers a ZIP following a state code, then the last standalone 5-digit
+    number, so house numbers like "10001 Elm Ave, Houston, TX 77002" are skipped.
+    """
+    text = text or ''
+    match = STATE_ZIP_RE.search(text)
+    if match:
+        return match.group(1)
+    matches = ZIP_CODE_RE.findall(text)
+    return matches[-1] if matches else None
+
+
+def location_zip_code(incident_location, city, state, plaintiff=None):
+    """
+    ZIP code to resolve an incident's district with.
+
+    The ZIP in the incident address wins. Otherwise the plaintiff's ZIP is used
+    when the plaintiff lives in the incident's city and state - a plaintiff's
+    ZIP elsewhere in the state could be in another district.
+
+    Args:
+        incident_location: Incident address text
+        city, state: Incident city and state
+        plaintiff: Optional object/dict with city, state and zip_code
+    """
+    zip_code = extract_zip_code(incident_location)
+    if zip_code or not plaintiff:
+        return zip_code
+
+    from .court_data.district_index import normalize_city_name
+    from .jurisdiction_service import normalize_state
+
+    def field(name):
+        return (plaintiff.get(name) if isinstance(plaintiff, dict) else getattr(plaintiff, name, '')) or ''
+
+    same_state = (normalize_state(field('state')) or field('state').strip().upper()) == \
+        (normalize_state(state) or (state or '').strip().upper())
+    same_city = normalize_city_name(field('city')) == normalize_city_name(city)
+    if same_state and same_city:
+        return extract_zip_code(field('zip_code'))
+    return None
+
+
+class _RateLimiter:
+    """Space calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait_for = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
 class CourtLookupService:
     """Main coordinator for federal district court lookups across all states."""
 
@@ -58,59 +135,176 @@ class CourtLookupService:
     }
 
     @classmethod
-    def lookup_court_by_location(cls, city, state, county=None, use_gpt_fallback=True):
+    def lookup_court_by_location(cls, city, state, county=None, zip_code=None, use_gpt_fallback=True):
         """
         Look up federal district court by location.
 
-        First tries static lookup (fast, free). If that fails and use_gpt_fallback=True,
-        falls back to GPT with web search (slower, costs money, but always works).
+        Resolution order, cheapest and most precise first:
+        1. ZIP code, if the optional compiled ZIP index is installed
+        2. County, from the bundled county -> district table
+        3. City, from the precompiled city index
+        4. GPT with web search (slower, costs money) if use_gpt_fallback=True
 
         Args:
-            city: City name
-            state: State code or name
-            county: Optional county name (not currently used)
-            use_gpt_fallback: If True, use GPT with web search when static lookup fails
+            city: City name (abbreviations like "St." and "Mt" are normalized)
+            state: State code or full state name
+            county: Optional county or parish name ("Kings County", "Orleans Parish")
+            zip_code: Optional 5-digit ZIP code
+            use_gpt_fallback: If True, use GPT with web search when the offline lookups fail
 
         Returns:
             dict with court_name, confidence, method, etc. or None if lookup fails
         """
-        if not city or not state:
+        if not state or not (city or county or zip_code):
             return None
 
-        state = state.strip().upper()
+        from .jurisdiction_service import normalize_state
+        state = normalize_state(state) or state.strip().upper()
 
-        # Try static lookup first
+        result = cls._offline_lookup(state, city, county, zip_code)
+        if result:
+            return result
+
+        # Try static city lookup next
         result = cls._static_lookup(city, state)
         if result:
             return result
 
-        # Static lookup failed, try GPT fallback if enabled
-        if use_gpt_fallback:
+        # Offline lookups failed, try GPT fallback if enabled
+        if use_gpt_fallback and city:
             return cls._gpt_fallback_lookup(city, state)
 
         # No fallback, return None
         return None
 
     @classmethod
-    def _static_lookup(cls, city, state):
+    def lookup_many(cls, locations, use_gpt_fallback=True, max_workers=None, rate_per_second=None):
         """
-        Try static lookup from the state-specific lookup classes.
-        Returns the result or None if city not found.
+        Resolve many locations at once.
+
+        Duplicate locations (after normalization) are looked up once. Everything
+        is resolved against the offline datasets first; the misses are then sent
+        to the GPT fallback as one concurrent, rate-limited batch.
+
+        Args:
+            locations: Iterable of (city, state) tuples, optionally
+                (city, state, county) or (city, state, county, zip_code)
+            use_gpt_fallback: If True, look up misses with GPT web search
+            max_workers: Concurrent fallback lookups (default: COURT_LOOKUP_BATCH_CONCURRENCY)
+            rate_per_second: Max fallback lookups started per second (default: COURT_LOOKUP_BATCH_RATE)
+
+        Returns:
+            dict mapping each input tuple to its result dict (or None)
         """
-        if state not in cls.STATE_LOOKUPS:
+        from django.conf import settings
+        from .court_data.district_index import normalize_city_name
+        from .court_data.offline_dataset import normalize_county_name, normalize_zip
+        from .jurisdiction_service import normalize_state
+
+        # normalized key -> (city, state, county, zip_code) to look up
+        unique = {}
+        keys_by_location = {}
+        for location in locations:
+            city, state, county, zip_code = (tuple(location) + (None, None))[:4]
+            state_code = normalize_state(state) or (state or '').strip().upper()
+            key = (
+                normalize_city_name(city), state_code,
+                normalize_county_name(county), normalize_zip(zip_code),
+            )
+            keys_by_location[location] = key
+            unique.setdefault(key, ((city or '').strip(), state_code, county, zip_code))
+
+        results = {}
+        misses = []
+        for key, (city, state, county, zip_code) in unique.items():
+            result = None
+            if state and (city or county or zip_code):
+                result = cls._offline_lookup(state, city, county, zip_code) or cls._static_lookup(city, state)
+            results[key] = result
+            if result is None and city and state:
+                misses.append(key)
+
+        if misses and use_gpt_fallback:
+            if max_workers is None:
+                max_workers = getattr(settings, 'COURT_LOOKUP_BATCH_CONCURRENCY', 4)
+            if rate_per_second is None:
+                rate_per_second = getattr(settings, 'COURT_LOOKUP_BATCH_RATE', 2.0)
+            limiter = _RateLimiter(rate_per_second)
+
+            def fallback(key):
+                from django.db import connections
+                city, state = unique[key][:2]
+                try:
+                    limiter.wait()
+                    return cls._gpt_fallback_lookup(city, state)
+                finally:
+                    # Each thread opens its own DB connection (AI response cache)
+                    connections.close_all()
+
+            logger.info(f"Court lookup batch: {len(unique)} unique locations, {len(misses)} sent to GPT fallback")
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for key, result in zip(misses, executor.map(fallback, misses)):
+                    results[key] = result
+
+        return {
+            location: dict(results[key]) if results[key] else None
+            for location, key in keys_by_location.items()
+        }
+
+    @classmethod
+    def _offline_lookup(cls, state, city=None, county=None, zip_code=None):
+        """
+        Resolve the district from the ZIP or county datasets.
+        Returns the result or None if neither is known.
+        """
+        if state not in cls.STATE_LOOKUPS or not (county or zip_code):
             return None
 
-        module_name, class_name = cls.STATE_LOOKUPS[state]
+        from .court_data.district_index import get_district_index
+        from .court_data.offline_dataset import get_offline_dataset
 
-        try:
-            # Dynamic import of state lookup module
-            import importlib
-            module = importlib.import_module(f'.court_data.states.{module_name}', package='documents.services')
-            lookup_class = getattr(module, class_name)
-            return lookup_class.lookup_court_by_city(city)
-        except (ImportError, AttributeError):
+        index = get_district_index()
+        dataset = get_offline_dataset()
+
+        if zip_code:
+            match = dataset.lookup_zip(zip_code)
+            # A ZIP from another state means a typo somewhere - don't trust it
+            if match and match[0] == state:
+                _, district_key, ambiguous = match
+                note = f'ZIP code {zip_code} spans more than one district. Please verify.' if ambiguous else ''
+                result = index.court_result(
+                    state, district_key, 'medium' if ambiguous else 'high', 'zip_match', note
+                )
+                if result:
+                    return result
+
+        if county:
+            district_key = dataset.lookup_county(state, county)
+            if district_key:
+                result = index.court_result(state, district_key, 'high', 'county_match')
+                if result:
+                    return result
+
+        if not city:
+            # Single-district states have no county table entries
+            result = index.single_district.get(state)
+            return dict(result) if result else None
+
+        return None
+
+    @classmethod
+    def _static_lookup(cls, city, state):
+        """
+        Try static lookup from the precompiled district index
+        (built once from the state-specific lookup classes).
+        Returns the result or None if city not found.
+        """
+        if not city or state not in cls.STATE_LOOKUPS:
             return None
 
+        from .court_data.district_index import get_district_index
+        return get_district_index().lookup(state, city)
+
     @classmethod
     def _gpt_fallback_lookup(cls, city, state):
         """
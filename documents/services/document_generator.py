@@ -3,9 +3,18 @@ Document generation service for creating court-ready Section 1983 complaints.
 Uses AI to write professional legal documents with case law properly integrated.
 """
 import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from django.conf import settings
 from openai import OpenAI
 
+from .token_budget import fit_texts, get_input_budget, select_model
+
+logger = logging.getLogger(__name__)
+
 
 class DocumentGenerator:
     """
@@ -13,15 +22,39 @@ class DocumentGenerator:
     with case law citations integrated into proper legal arguments.
     """
 
+    # Sections saved to the Document.final_* fields, in document order
+    FINAL_SECTIONS = [
+        'introduction', 'jurisdiction', 'parties', 'facts',
+        'causes_of_action', 'prayer', 'jury_demand', 'signature',
+    ]
+
+    # Sections built from templates without an AI call
+    TEMPLATE_SECTIONS = {
+        'introduction': '_generate_introduction',
+        'jurisdiction': '_generate_jurisdiction',
+        'parties': '_generate_parties',
+        'prayer': '_generate_prayer',
+        'jury_demand': '_generate_jury_demand',
+        'signature': '_generate_signature',
+    }
+
+    # Attempts per AI section call. The client's own retries are off: they
+    # would restart the request timeout and run past the complaint deadline
+    MAX_ATTEMPTS = 2
+
     def __init__(self):
         api_key = settings.OPENAI_API_KEY
         if not api_key:
             raise ValueError("OPENAI_API_KEY not configured in settings")
-        self.client = OpenAI(api_key=api_key)
+        from .ai_call_log import instrument
+        # Per-section timeout; generate_complaint also enforces an overall deadline
+        self.client = instrument(OpenAI(
+            api_key=api_key, timeout=getattr(settings, 'DOCUMENT_SECTION_TIMEOUT', 60), max_retries=0,
+        ))
 
     def _get_prompt(self, prompt_type: str) -> dict:
         """
-        Fetch a prompt from the database AIPrompt model.
+        Fetch an active AIPrompt config (served from memory by PromptRegistry).
 
         Args:
             prompt_type: The type of prompt (e.g., 'generate_facts')
@@ -29,22 +62,8 @@ class DocumentGenerator:
         Returns:
             dict with prompt config, or None if not found
         """
-        from documents.models import AIPrompt
-        prompt = AIPrompt.objects.filter(
-            prompt_type=prompt_type,
-            is_active=True
-        ).first()
-
-        if not prompt:
-            return None
-
-        return {
-            'system_message': prompt.system_message,
-            'user_prompt_template': prompt.user_prompt_template,
-            'model_name': prompt.model_name,
-            'temperature': prompt.temperature,
-            'max_tokens': prompt.max_tokens,
-        }
+        from .prompt_registry import PromptRegistry
+        return PromptRegistry.get(prompt_type)
 
     def generate_complaint(self, document_data: dict) -> dict:
         """
@@ -65,40 +84,261 @@ class DocumentGenerator:
         Returns:
             dict with 'success' and 'document' containing generated sections
         """
-        # Generate each section of the complaint
-        sections = {}
+        # Start the AI-written sections first: facts and one call per cause of action.
+        # Running calls stop at the deadline, or as soon as cancel is set.
+        deadline = time.monotonic() + getattr(settings, 'DOCUMENT_GENERATION_TIMEOUT', 100)
+        cancel = threading.Event()
+        cause_plans = self._plan_causes_of_action(document_data)
+        max_workers = max(1, getattr(settings, 'DOCUMENT_GENERATION_WORKERS', 4))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='complaint-section')
+        facts_future = executor.submit(
+            self._run_section, self._write_facts, document_data, deadline=deadline, cancel=cancel
+        )
+        cause_futures = [
+            executor.submit(self._run_section, self._write_cause, deadline=deadline, cancel=cancel, **plan)
+            for plan in cause_plans
+        ]
+
+        # Template sections render while the AI calls run
+        sections = {
+            'caption': self._generate_caption(document_data),
+            'introduction': self._generate_introduction(document_data),
+            'jurisdiction': self._generate_jurisdiction(document_data),
+            'parties': self._generate_parties(document_data),
+            'prayer': self._generate_prayer(document_data),
+            'jury_demand': self._generate_jury_demand(document_data),
+            'signature': self._generate_signature(document_data),
+        }
+
+        # Keep whatever finished in time; late or failed sections get placeholder text
+        wait([facts_future] + cause_futures, timeout=max(0, deadline - time.monotonic()))
+        cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        # 1. Caption
-        sections['caption'] = self._generate_caption(document_data)
+        failed_sections = []
 
-        # 2. Introduction
-        sections['introduction'] = self._generate_introduction(document_data)
+        facts, error = self._section_result(facts_future)
+        if error:
+            failed_sections.append('facts')
+            facts = self._facts_placeholder(document_data, error)
+        sections['facts'] = facts
+
+        causes = []
+        for plan, future in zip(cause_plans, cause_futures):
+            content, error = self._section_result(future)
+            if error:
+                failed_sections.append(f"cause_of_action_{plan['cause_num']}")
+                content = self._cause_placeholder(error=error, **plan)
+            causes.append(self._cause_dict(content, **plan))
+        sections['causes_of_action'] = causes
+
+        # Keep section order stable for templates that iterate over the dict
+        order = ['caption', 'introduction', 'jurisdiction', 'parties', 'facts',
+                 'causes_of_action', 'prayer', 'jury_demand', 'signature']
+        sections = {key: sections[key] for key in order}
+
+        if failed_sections:
+            logger.warning(f"Complaint generated with failed sections: {', '.join(failed_sections)}")
 
-        # 3. Jurisdiction and Venue
-        sections['jurisdiction'] = self._generate_jurisdiction(document_data)
+        return {
+            'success': True,
+            'document': sections,
+            'failed_sections': failed_sections,
+        }
 
-        # 4. Parties
-        sections['parties'] = self._generate_parties(document_data)
+    @staticmethod
+    def _run_section(func, *args, **kwargs):
+        """Run one AI section in a pool thread and close the thread's DB connections afterwards."""
+        from django.db import connections
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def _section_result(future):
+        """Return (content, error) for a section future; error is set if it failed or timed out."""
+        if not future.done():
+            future.cancel()
+            return None, 'Timed out'
+        try:
+            return future.result(), None
+        except Exception as e:
+            return None, str(e)
 
-        # 5. Statement of Facts
-        sections['facts'] = self._generate_facts(document_data)
+    def _complete(self, prompt_type, model, messages, temperature, max_tokens, on_delta=None,
+                  deadline=None, cancel=None) -> str:
+        """
+        Run a chat completion and return the stripped text.
+        With on_delta, the response is streamed and on_delta(text) is called for each chunk.
+        Small requests are routed to the prompt's small model (select_model).
 
-        # 6. Causes of Action (with case law integrated)
-        sections['causes_of_action'] = self._generate_causes_of_action(document_data)
+        deadline (a time.monotonic() value) and cancel (a threading.Event) bound
+        the call: each request's timeout is at most the time left, and a stream
+        is closed as soon as either trips. Raises TimeoutError when they do.
+        """
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        model = select_model(prompt_type, model, messages)
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                response = self.client.chat.completions.create(
+                    prompt_type=prompt_type,
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=on_delta is not None,
+                    timeout=self._time_left(deadline, cancel),
+                )
+                break
+            except (APIConnectionError, InternalServerError, RateLimitError) as e:
+                # APITimeoutError is an APIConnectionError; the retry gets only the time left
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"{prompt_type} call failed ({e}), retrying")
+                time.sleep(min(1, self._time_left(deadline, cancel)))
+
+        if on_delta is None:
+            return response.choices[0].message.content.strip()
 
-        # 7. Prayer for Relief
-        sections['prayer'] = self._generate_prayer(document_data)
+        parts = []
+        try:
+            for chunk in response:
+                self._time_left(deadline, cancel)
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    on_delta(text)
+        finally:
+            # Stop reading (and paying for) the rest of the response
+            response.close()
+        return ''.join(parts).strip()
+
+    @staticmethod
+    def _time_left(deadline, cancel) -> float:
+        """Request timeout for the next AI call: DOCUMENT_SECTION_TIMEOUT capped at the time left."""
+        timeout = getattr(settings, 'DOCUMENT_SECTION_TIMEOUT', 60)
+        if cancel is not None and cancel.is_set():
+            raise TimeoutError('Timed out')
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError('Timed out')
+        return min(timeout, remaining)
+
+    def stream_complaint(self, document_data: dict, sections: list = None):
+        """
+        Generate final document sections, yielding events as text is produced.
 
-        # 8. Jury Demand
-        sections['jury_demand'] = self._generate_jury_demand(document_data)
+        Template sections are yielded immediately. The AI sections (facts and each
+        cause of action) stream concurrently on the section pool, and their text
+        chunks are yielded as they arrive.
 
-        # 9. Signature Block
-        sections['signature'] = self._generate_signature(document_data)
+        Args:
+            document_data: Same dict as generate_complaint
+            sections: Section keys to generate (default: all FINAL_SECTIONS)
+
+        Yields:
+            (event, payload) tuples:
+            - ('delta', {'section', 'text', 'cause_number'?}) for each chunk of AI text
+            - ('section', {'section', 'content'}) when a section is complete
+            - ('done', {'failed_sections'})
+        """
+        import queue
+
+        wanted = [key for key in self.FINAL_SECTIONS if sections is None or key in sections]
+        events = queue.Queue()
+        failed_sections = []
+
+        deadline = time.monotonic() + getattr(settings, 'DOCUMENT_GENERATION_TIMEOUT', 100)
+        cancel = threading.Event()  # Set when the stream ends, e.g. the browser disconnected
+        stop = {'deadline': deadline, 'cancel': cancel}
+
+        cause_plans = self._plan_causes_of_action(document_data) if 'causes_of_action' in wanted else []
+        jobs = []
+        if 'facts' in wanted:
+            jobs.append(('facts', None, self._write_facts, (document_data,), stop))
+        for plan in cause_plans:
+            jobs.append(('causes_of_action', plan['cause_num'], self._write_cause, (), {**plan, **stop}))
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, getattr(settings, 'DOCUMENT_GENERATION_WORKERS', 4)),
+            thread_name_prefix='complaint-stream',
+        )
+        for section, cause_number, func, args, kwargs in jobs:
+            executor.submit(self._run_streamed_section, events, section, cause_number, func, *args, **kwargs)
 
-        return {
-            'success': True,
-            'document': sections,
-        }
+        try:
+            for key in wanted:
+                if key in self.TEMPLATE_SECTIONS:
+                    content = getattr(self, self.TEMPLATE_SECTIONS[key])(document_data)
+                    yield 'section', {'section': key, 'content': content}
+
+            pending = {(section, cause_number) for section, cause_number, *_ in jobs}
+            causes = {}
+            while pending:
+                remaining = deadline - time.monotonic()
+                try:
+                    kind, section, cause_number, value, error = events.get(timeout=max(0, remaining))
+                except queue.Empty:
+                    break
+
+                if kind == 'delta':
+                    payload = {'section': section, 'text': value}
+                    if cause_number is not None:
+                        payload['cause_number'] = cause_number
+                    yield 'delta', payload
+                    continue
+
+                pending.discard((section, cause_number))
+                if section == 'facts':
+                    if error:
+                        failed_sections.append('facts')
+                        value = self._facts_placeholder(document_data, error)
+                    yield 'section', {'section': 'facts', 'content': value}
+                else:
+                    causes[cause_number] = (value, error)
+
+            # Anything still running missed the deadline
+            for section, cause_number in pending:
+                if section == 'facts':
+                    failed_sections.append('facts')
+                    yield 'section', {'section': 'facts', 'content': self._facts_placeholder(document_data, 'Timed out')}
+                else:
+                    causes[cause_number] = (None, 'Timed out')
+
+            if cause_plans:
+                cause_list = []
+                for plan in cause_plans:
+                    content, error = causes[plan['cause_num']]
+                    if error:
+                        failed_sections.append(f"cause_of_action_{plan['cause_num']}")
+                        content = self._cause_placeholder(error=error, **plan)
+                    cause_list.append(self._cause_dict(content, **plan))
+                yield 'section', {'section': 'causes_of_action', 'content': cause_list}
+
+            yield 'done', {'failed_sections': failed_sections}
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run_streamed_section(events, section, cause_number, func, *args, **kwargs):
+        """Pool thread body for stream_complaint: push deltas and the final result onto the queue."""
+        from django.db import connections
+
+        def on_delta(text):
+            events.put(('delta', section, cause_number, text, None))
+
+        try:
+            content = func(*args, on_delta=on_delta, **kwargs)
+            events.put(('complete', section, cause_number, content, None))
+        except Exception as e:
+            events.put(('complete', section, cause_number, None, str(e)))
+        finally:
+            connections.close_all()
 
     def _generate_caption(self, data: dict) -> str:
         """Generate the case caption."""
@@ -232,7 +472,14 @@ ________________________________________"""
         return parties.strip()
 
     def _generate_facts(self, data: dict) -> str:
-        """Generate the statement of facts using AI."""
+        """Generate the statement of facts using AI (placeholder text on failure)."""
+        try:
+            return self._write_facts(data)
+        except Exception as e:
+            return self._facts_placeholder(data, e)
+
+    def _write_facts(self, data: dict, on_delta=None, deadline=None, cancel=None) -> str:
+        """Write the statement of facts with AI. Raises on API errors (see _complete for deadline/cancel)."""
         incident = data.get('incident', {})
         narrative = data.get('narrative', {})
         plaintiff = data.get('plaintiff', {})
@@ -306,6 +553,14 @@ ________________________________________"""
                     video_prompt_section += f"\nSpeakers: {speakers_str}"
                 video_prompt_section += f"\nTranscript:\n\"{vt.get('transcript', '')}\"\n"
 
+        # Fit the free-text inputs to the prompt's input budget (long narratives/transcripts are trimmed first)
+        narrative_keys = ['what_were_you_doing', 'detailed_narrative', 'what_was_said', 'physical_actions', 'how_it_ended']
+        *narrative_texts, witness_prompt_section, video_prompt_section = fit_texts(
+            [context[key] for key in narrative_keys] + [witness_prompt_section, video_prompt_section],
+            get_input_budget('generate_facts'),
+        )
+        context.update(zip(narrative_keys, narrative_texts))
+
         # Load prompt from database
         prompt_config = self._get_prompt('generate_facts')
 
@@ -371,34 +626,46 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
             temperature = 0.3
             max_tokens = 2000
 
-        try:
-            response = self.client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_message
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            return f"""STATEMENT OF FACTS
+        return self._complete(
+            prompt_type='generate_facts',
+            model=model_name,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_message
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            on_delta=on_delta,
+            deadline=deadline,
+            cancel=cancel,
+        )
+
+    def _facts_placeholder(self, data: dict, error) -> str:
+        """Statement of facts stub used when the AI call fails."""
+        incident = data.get('incident', {})
+        plaintiff = data.get('plaintiff', {})
+        plaintiff_name = f"{plaintiff.get('first_name', '')} {plaintiff.get('last_name', '')}".strip() or "Plaintiff"
+
+        return f"""STATEMENT OF FACTS
 
-10. On or about {context['incident_date']}, Plaintiff {context['plaintiff_name']} was present at {context['incident_location']}, {context['city']}, {context['state']}.
+10. On or about {incident.get('incident_date', '')}, Plaintiff {plaintiff_name} was present at {incident.get('incident_location', '')}, {incident.get('city', '')}, {incident.get('state', '')}.
 
 11. [Facts to be supplemented based on incident narrative]
 
-(Error generating detailed facts: {str(e)})"""
+(Error generating detailed facts: {str(error)})"""
 
-    def _generate_causes_of_action(self, data: dict) -> dict:
+    def _generate_causes_of_action(self, data: dict) -> list:
         """Generate causes of action with case law integrated."""
+        return [self._generate_single_cause(**plan) for plan in self._plan_causes_of_action(data)]
+
+    def _plan_causes_of_action(self, data: dict) -> list:
+        """Return the _generate_single_cause arguments for each cause of action to write."""
         rights = data.get('rights_violated', {})
         case_law = data.get('case_law', [])
         plaintiff = data.get('plaintiff', {})
@@ -422,7 +689,7 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
         # First Amendment violations
         if rights.get('first_amendment'):
             first_cases = case_law_by_amendment.get('first', [])
-            cause = self._generate_single_cause(
+            causes.append(dict(
                 cause_num=cause_num,
                 amendment="First",
                 violation_type=self._get_first_amendment_type(rights),
@@ -431,14 +698,13 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
                 narrative=narrative,
                 case_law=first_cases,
                 details=rights.get('first_amendment_details', '')
-            )
-            causes.append(cause)
+            ))
             cause_num += 1
 
         # Fourth Amendment violations
         if rights.get('fourth_amendment'):
             fourth_cases = case_law_by_amendment.get('fourth', [])
-            cause = self._generate_single_cause(
+            causes.append(dict(
                 cause_num=cause_num,
                 amendment="Fourth",
                 violation_type=self._get_fourth_amendment_type(rights),
@@ -447,14 +713,13 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
                 narrative=narrative,
                 case_law=fourth_cases,
                 details=rights.get('fourth_amendment_details', '')
-            )
-            causes.append(cause)
+            ))
             cause_num += 1
 
         # Fifth Amendment violations
         if rights.get('fifth_amendment'):
             fifth_cases = case_law_by_amendment.get('fifth', [])
-            cause = self._generate_single_cause(
+            causes.append(dict(
                 cause_num=cause_num,
                 amendment="Fifth",
                 violation_type=self._get_fifth_amendment_type(rights),
@@ -463,14 +728,13 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
                 narrative=narrative,
                 case_law=fifth_cases,
                 details=rights.get('fifth_amendment_details', '')
-            )
-            causes.append(cause)
+            ))
             cause_num += 1
 
         # Fourteenth Amendment violations
         if rights.get('fourteenth_amendment'):
             fourteenth_cases = case_law_by_amendment.get('fourteenth', [])
-            cause = self._generate_single_cause(
+            causes.append(dict(
                 cause_num=cause_num,
                 amendment="Fourteenth",
                 violation_type=self._get_fourteenth_amendment_type(rights),
@@ -479,8 +743,7 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
                 narrative=narrative,
                 case_law=fourteenth_cases,
                 details=rights.get('fourteenth_amendment_details', '')
-            )
-            causes.append(cause)
+            ))
             cause_num += 1
 
         return causes
@@ -488,7 +751,22 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
     def _generate_single_cause(self, cause_num: int, amendment: str, violation_type: str,
                                 plaintiff_name: str, defendant_names: list, narrative: dict,
                                 case_law: list, details: str) -> dict:
-        """Generate a single cause of action with AI."""
+        """Generate a single cause of action with AI (placeholder text on failure)."""
+        plan = dict(
+            cause_num=cause_num, amendment=amendment, violation_type=violation_type,
+            plaintiff_name=plaintiff_name, defendant_names=defendant_names,
+            narrative=narrative, case_law=case_law, details=details,
+        )
+        try:
+            content = self._write_cause(**plan)
+        except Exception as e:
+            content = self._cause_placeholder(error=e, **plan)
+        return self._cause_dict(content, **plan)
+
+    def _write_cause(self, cause_num: int, amendment: str, violation_type: str,
+                     plaintiff_name: str, defendant_names: list, narrative: dict,
+                     case_law: list, details: str, on_delta=None, deadline=None, cancel=None) -> str:
+        """Write a single cause of action with AI. Raises on API errors (see _complete for deadline/cancel)."""
 
         # Format case law for the prompt
         case_citations = []
@@ -501,6 +779,7 @@ Write ONLY the Statement of Facts section, starting with the header "STATEMENT O
             })
 
         facts_summary = narrative.get('detailed_narrative', '') or narrative.get('summary', '')
+        facts_summary, details = fit_texts([facts_summary, details or ''], get_input_budget('generate_cause'))
 
         prompt = f"""Write a CAUSE OF ACTION for a Section 1983 complaint with the following parameters:
 
@@ -536,35 +815,44 @@ EXAMPLE OF PROPER CASE LAW INTEGRATION:
 
 Write the complete cause of action:"""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert civil rights attorney drafting Section 1983 complaints. You write clear, persuasive legal arguments that properly integrate case law citations. Your writing follows federal court conventions and demonstrates how established legal precedent applies to the specific facts of each case."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=2000,
-            )
-            content = response.choices[0].message.content.strip()
-        except Exception as e:
-            content = f"""CAUSE OF ACTION {cause_num}
+        return self._complete(
+            prompt_type='generate_cause',
+            model="gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert civil rights attorney drafting Section 1983 complaints. You write clear, persuasive legal arguments that properly integrate case law citations. Your writing follows federal court conventions and demonstrates how established legal precedent applies to the specific facts of each case."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.3,
+            max_tokens=2000,
+            on_delta=on_delta,
+            deadline=deadline,
+            cancel=cancel,
+        )
+
+    @staticmethod
+    def _cause_placeholder(cause_num: int, amendment: str, violation_type: str,
+                           defendant_names: list, error, **kwargs) -> str:
+        """Cause of action stub used when the AI call fails."""
+        return f"""CAUSE OF ACTION {cause_num}
 ({violation_type} - {amendment} Amendment)
 Against Defendants {', '.join(defendant_names)}
 
-[Error generating cause of action: {str(e)}]
+[Error generating cause of action: {str(error)}]
 
 Plaintiff incorporates by reference all preceding paragraphs.
 
 Defendants violated Plaintiff's {amendment} Amendment rights by {violation_type.lower()}.
 """
 
+    @staticmethod
+    def _cause_dict(content: str, cause_num: int, amendment: str, violation_type: str,
+                    case_law: list, **kwargs) -> dict:
         return {
             'number': cause_num,
             'amendment': amendment,
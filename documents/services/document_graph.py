@@ -0,0 +1,285 @@
+"""
+Single-pass loader for a document's section tree.
+
+Loads the sections, their one-to-one data models, defendants, witnesses,
+evidence and video transcripts in a fixed number of queries (QUERY_COUNT),
+however many defendants, witnesses or captures the document has. The
+result is an immutable snapshot; as_generator_data() builds the plain dict
+the document generator and templates use.
+"""
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.db.models import Prefetch
+
+# One-to-one section data, keyed by section_type (also the reverse accessor name)
+ONE_TO_ONE_SECTIONS = (
+    'plaintiff_info', 'incident_overview', 'incident_narrative', 'rights_violated',
+    'damages', 'prior_complaints', 'relief_sought',
+)
+
+# Many-per-section data: section_type -> reverse accessor on DocumentSection
+MULTIPLE_SECTIONS = {
+    'defendants': 'defendants',
+    'witnesses': 'witnesses',
+    'evidence': 'evidence_items',
+}
+
+
+@dataclass(frozen=True)
+class DocumentGraph:
+    """Immutable snapshot of a document and all of its section data."""
+
+    # sections, defendants, witnesses, evidence (+ video evidence), captures, speakers (+ defendant)
+    QUERY_COUNT = 6
+
+    document: object
+    sections: MappingProxyType      # section_type -> DocumentSection
+    instances: MappingProxyType     # section_type -> one-to-one model instance (or None)
+    items: MappingProxyType         # section_type -> tuple of model instances
+
+    @classmethod
+    def load(cls, document):
+        """Load the graph for a document in QUERY_COUNT queries."""
+        from documents.models import DocumentSection, Evidence, VideoSpeaker
+
+        sections = list(
+            DocumentSection.objects
+            .filter(document=document)
+            .select_related(*ONE_TO_ONE_SECTIONS)
+            .prefetch_related(
+                'defendants',
+                'witnesses',
+                Prefetch('evidence_items', queryset=Evidence.objects.select_related('video_evidence')),
+                'evidence_items__video_evidence__captures',
+                Prefetch(
+                    'evidence_items__video_evidence__speakers',
+                    queryset=VideoSpeaker.objects.select_related('defendant'),
+                ),
+            )
+        )
+
+        sections_by_type = {}
+        instances = {}
+        items = {section_type: () for section_type in MULTIPLE_SECTIONS}
+        for section in sections:
+            sections_by_type[section.section_type] = section
+            if section.section_type in ONE_TO_ONE_SECTIONS:
+                # select_related caches missing rows too, so this never queries
+                instances[section.section_type] = getattr(section, section.section_type, None)
+            elif section.section_type in MULTIPLE_SECTIONS:
+                items[section.section_type] = tuple(getattr(section, MULTIPLE_SECTIONS[section.section_type]).all())
+
+        return cls(
+            document=document,
+            sections=MappingProxyType(sections_by_type),
+            instances=MappingProxyType(instances),
+            items=MappingProxyType(items),
+        )
+
+    def get(self, section_type):
+        """Return the one-to-one data instance for a section type, or None."""
+        return self.instances.get(section_type)
+
+    def as_generator_data(self):
+        """Build the document data dict used by DocumentGenerator and the review/PDF templates."""
+        data = {
+            'has_minimum_data': False,
+            'plaintiff': {},
+            'defendants': [],
+            'incident': {},
+            'narrative': {},
+            'rights_violated': {},
+            'damages': {},
+            'relief': {},
+            'court': '',
+        }
+
+        # Plaintiff info
+        pi = self.get('plaintiff_info')
+        if pi:
+            data['plaintiff'] = {
+                'first_name': pi.first_name,
+                'middle_name': pi.middle_name,
+                'last_name': pi.last_name,
+                'street_address': pi.street_address,
+                'city': pi.city,
+                'state': pi.state,
+                'zip_code': pi.zip_code,
+                'phone': pi.phone,
+                'email': pi.email,
+                'is_pro_se': pi.is_pro_se,
+                'attorney_name': pi.attorney_name,
+                'attorney_bar_number': pi.attorney_bar_number,
+                'attorney_firm_name': pi.attorney_firm_name,
+                'attorney_street_address': pi.attorney_street_address,
+                'attorney_city': pi.attorney_city,
+                'attorney_state': pi.attorney_state,
+                'attorney_zip_code': pi.attorney_zip_code,
+                'attorney_phone': pi.attorney_phone,
+                'attorney_email': pi.attorney_email,
+            }
+
+        # Defendants
+        for d in self.items['defendants']:
+            data['defendants'].append({
+                'name': d.name,
+                'defendant_type': d.defendant_type,
+                'badge_number': d.badge_number,
+                'title_rank': d.title_rank,
+                'agency_name': d.agency_name,
+                'address': d.address,
+                'description': d.description,
+            })
+
+        # Incident overview
+        io = self.get('incident_overview')
+        if io:
+            data['incident'] = {
+                'incident_date': str(io.incident_date) if io.incident_date else '',
+                'incident_time': io.incident_time,  # Keep as time object for template filter
+                'incident_location': io.incident_location,
+                'city': io.city,
+                'state': io.state,
+                'location_type': io.location_type,
+                'was_recording': io.was_recording,
+                'recording_device': io.recording_device,
+            }
+            data['court'] = io.federal_district_court or ''
+
+            # Parse court name to extract district (e.g., "Northern" from "United States District Court for the Northern District of Iowa")
+            if io.federal_district_court:
+                match = re.search(r'for the (\w+) District of (\w+)', io.federal_district_court, re.IGNORECASE)
+                if match:
+                    data['district'] = match.group(1).upper()
+                    data['state_name'] = match.group(2).upper()
+
+        # Incident narrative
+        n = self.get('incident_narrative')
+        if n:
+            data['narrative'] = {
+                'summary': n.summary,
+                'detailed_narrative': n.detailed_narrative,
+                'what_were_you_doing': n.what_were_you_doing,
+                'initial_contact': n.initial_contact,
+                'what_was_said': n.what_was_said,
+                'physical_actions': n.physical_actions,
+                'how_it_ended': n.how_it_ended,
+            }
+
+        # Rights violated
+        rv = self.get('rights_violated')
+        if rv:
+            data['rights_violated'] = {
+                'first_amendment': rv.first_amendment,
+                'first_amendment_speech': rv.first_amendment_speech,
+                'first_amendment_press': rv.first_amendment_press,
+                'first_amendment_assembly': rv.first_amendment_assembly,
+                'first_amendment_petition': rv.first_amendment_petition,
+                'first_amendment_details': rv.first_amendment_details,
+                'fourth_amendment': rv.fourth_amendment,
+                'fourth_amendment_search': rv.fourth_amendment_search,
+                'fourth_amendment_seizure': rv.fourth_amendment_seizure,
+                'fourth_amendment_arrest': rv.fourth_amendment_arrest,
+                'fourth_amendment_force': rv.fourth_amendment_force,
+                'fourth_amendment_details': rv.fourth_amendment_details,
+                'fifth_amendment': rv.fifth_amendment,
+                'fifth_amendment_self_incrimination': rv.fifth_amendment_self_incrimination,
+                'fifth_amendment_due_process': rv.fifth_amendment_due_process,
+                'fifth_amendment_details': rv.fifth_amendment_details,
+                'fourteenth_amendment': rv.fourteenth_amendment,
+                'fourteenth_amendment_due_process': rv.fourteenth_amendment_due_process,
+                'fourteenth_amendment_equal_protection': rv.fourteenth_amendment_equal_protection,
+                'fourteenth_amendment_details': rv.fourteenth_amendment_details,
+            }
+
+        # Damages
+        d = self.get('damages')
+        if d:
+            data['damages'] = {
+                'physical_injury': d.physical_injury,
+                'physical_injury_description': d.physical_injury_description,
+                'emotional_distress': d.emotional_distress,
+                'emotional_distress_description': d.emotional_distress_description,
+                'property_damage': d.property_damage,
+                'property_damage_description': d.property_damage_description,
+                'lost_wages': d.lost_wages,
+                'lost_wages_amount': float(d.lost_wages_amount) if d.lost_wages_amount else 0,
+                'medical_expenses': float(d.medical_expenses) if d.medical_expenses else 0,
+            }
+
+        # Relief sought
+        rs = self.get('relief_sought')
+        if rs:
+            data['relief'] = {
+                'compensatory_damages': rs.compensatory_damages,
+                'compensatory_amount': float(rs.compensatory_amount) if rs.compensatory_amount else None,
+                'punitive_damages': rs.punitive_damages,
+                'punitive_amount': float(rs.punitive_amount) if rs.punitive_amount else None,
+                'attorney_fees': rs.attorney_fees,
+                'injunctive_relief': rs.injunctive_relief,
+                'injunctive_description': rs.injunctive_description,
+                'declaratory_relief': rs.declaratory_relief,
+                'declaratory_description': rs.declaratory_description,
+                'jury_trial_demanded': rs.jury_trial_demanded,
+            }
+
+        # Witnesses (with enhanced fields for evidence capture)
+        data['witnesses'] = [
+            {
+                'name': w.name,
+                'contact_info': w.contact_info,
+                'relationship': w.relationship,
+                'what_they_witnessed': w.what_they_witnessed,
+                'willing_to_testify': w.willing_to_testify,
+                'has_evidence': w.has_evidence,
+                'evidence_description': w.evidence_description,
+                'prior_interactions': w.prior_interactions,
+                'additional_notes': w.additional_notes,
+            }
+            for w in self.items['witnesses']
+        ]
+
+        # Video Evidence (YouTube transcript extractions)
+        data['video_transcripts'] = []
+        for evidence in self.items['evidence']:
+            video_evidence = getattr(evidence, 'video_evidence', None) if evidence.evidence_type == 'video' else None
+            if video_evidence is None:
+                continue
+
+            # Speaker mapping is the same for every capture of the video
+            speaker_map = {}
+            for speaker in video_evidence.speakers.all():
+                if speaker.defendant:
+                    speaker_map[speaker.label] = speaker.defendant.name
+                elif speaker.is_plaintiff:
+                    speaker_map[speaker.label] = "Plaintiff"
+                else:
+                    speaker_map[speaker.label] = speaker.label
+
+            for capture in video_evidence.captures.all():
+                if capture.extraction_status != 'completed':
+                    continue
+                data['video_transcripts'].append({
+                    'video_title': video_evidence.video_title,
+                    'video_url': video_evidence.youtube_url,
+                    'start_time': capture.start_time_display,
+                    'end_time': capture.end_time_display,
+                    'transcript': capture.attributed_transcript or capture.raw_transcript,
+                    'speakers': dict(speaker_map),
+                })
+
+        # Check if we have minimum data to generate
+        has_plaintiff = bool(data['plaintiff'].get('first_name') and data['plaintiff'].get('last_name'))
+        has_narrative = bool(data['narrative'].get('detailed_narrative') or self.document.story_text)
+        has_rights = any([
+            data['rights_violated'].get('first_amendment'),
+            data['rights_violated'].get('fourth_amendment'),
+            data['rights_violated'].get('fifth_amendment'),
+            data['rights_violated'].get('fourteenth_amendment'),
+        ])
+
+        data['has_minimum_data'] = has_plaintiff and has_narrative and has_rights
+
+        return data
@@ -0,0 +1,163 @@
+"""
+Per-user job progress events for the job event stream (documents:job_events).
+
+Job handlers publish small notifications (a PDF stage change, story parsing
+finished, wizard analysis finished) and the stream forwards them to the
+user's open pages. Events are hints, not state: on a terminal event the page
+reads the existing status endpoint once, so a missed event only delays it
+until its fallback poll.
+
+Backends (EVENT_BUS_BACKEND setting):
+- 'postgres': LISTEN/NOTIFY, so events cross from run_workers to the web processes.
+- 'memory': in-process broker for sqlite development. Only streams served
+  by the publishing process receive events; pages fall back to polling.
+- 'auto' (default): 'postgres' when the default database is PostgreSQL.
+
+    publish(user.id, 'pdf_progress', document=document.slug, stage='rendering_html')
+
+    with subscribe(user.id) as subscription:
+        event = subscription.get(timeout=15)   # dict, or None on timeout
+"""
+import json
+import logging
+import queue
+import select
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+
+
+def _channel(user_id):
+    return f'user_events_{int(user_id)}'
+
+
+class InProcessEventBus:
+    """Broker for streams served by the same process as the publisher."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = defaultdict(set)
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._queues.get(user_id, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                pass  # A stalled stream loses hints, not state
+
+    @contextmanager
+    def subscribe(self, user_id):
+        q = queue.Queue(maxsize=100)
+        with self._lock:
+            self._queues[user_id].add(q)
+        try:
+            yield _QueueSubscription(q)
+        finally:
+            with self._lock:
+                self._queues[user_id].discard(q)
+                if not self._queues[user_id]:
+                    del self._queues[user_id]
+
+
+class _QueueSubscription:
+    def __init__(self, q):
+        self._queue = q
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class PostgresEventBus:
+    """LISTEN/NOTIFY on one channel per user."""
+
+    def publish(self, user_id, event):
+        from django.db import connection
+
+        payload = json.dumps(event, default=str)
+        if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps({'type': event.get('type'), 'truncated': True})
+
+        # Inside a transaction, NOTIFY is delivered on commit - after the state it announces
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [_channel(user_id), payload])
+
+    @contextmanager
+    def subscribe(self, user_id):
+        from django.db import connections
+
+        # A dedicated connection: LISTEN holds it for the life of the stream
+        wrapper = connections.create_connection('default')
+        try:
+            wrapper.ensure_connection()
+            wrapper.set_autocommit(True)
+            with wrapper.cursor() as cursor:
+                cursor.execute(f'LISTEN {_channel(user_id)}')
+            yield _PostgresSubscription(wrapper.connection)
+        finally:
+            wrapper.close()
+
+
+class _PostgresSubscription:
+    def __init__(self, raw_connection):
+        self._connection = raw_connection
+        self._pending = deque()
+
+    def get(self, timeout):
+        if not self._pending:
+            ready, _, _ = select.select([self._connection], [], [], timeout)
+            if ready:
+                self._connection.poll()
+                while self._connection.notifies:
+                    notify = self._connection.notifies.pop(0)
+                    try:
+                        self._pending.append(json.loads(notify.payload))
+                    except ValueError:
+                        logger.warning(f"Ignoring malformed event on {notify.channel}")
+        return self._pending.popleft() if self._pending else None
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """Return the configured event bus (EVENT_BUS_BACKEND setting)."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                from django.db import connection
+
+                backend = getattr(settings, 'EVENT_BUS_BACKEND', 'auto')
+                if backend == 'auto':
+                    backend = 'postgres' if connection.vendor == 'postgresql' else 'memory'
+                _bus = PostgresEventBus() if backend == 'postgres' else InProcessEventBus()
+    return _bus
+
+
+def publish(user_id, event_type, **data):
+    """
+    Publish a job event to a user's open streams. Never raises - events are
+    best-effort and must not fail the job that sends them.
+    """
+    try:
+        get_event_bus().publish(user_id, {'type': event_type, **data})
+    except Exception:
+        logger.exception(f"Failed to publish {event_type} event for user {user_id}")
+
+
+def subscribe(user_id):
+    """Context manager yielding a subscription with get(timeout) -> event dict or None."""
+    return get_event_bus().subscribe(user_id)
@@ -0,0 +1,243 @@
+"""
+Database-backed job queue for long-running AI and PDF work.
+
+Web requests enqueue a BackgroundJob and return immediately. A separate
+`python manage.py run_workers` process claims jobs, runs their handlers and
+retries failures with exponential backoff. Jobs whose worker dies mid-run are
+recovered once their visibility timeout expires.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Enqueue, claim, run and recover BackgroundJob rows."""
+
+    # Job type -> handler config. Handlers are called with the job payload as
+    # keyword arguments. on_failure is called with the same kwargs plus `error`
+    # once all retry attempts are exhausted.
+    JOB_HANDLERS = {
+        'process_story': {
+            'handler': 'documents.views._process_story_background',
+            'on_failure': 'documents.views._process_story_failed',
+            'visibility_timeout': 300,
+        },
+        'generate_pdf': {
+            'handler': 'documents.views._generate_pdf_background',
+            'on_failure': 'documents.views._generate_pdf_failed',
+            'visibility_timeout': 600,
+        },
+        'extract_wizard_story': {
+            'handler': 'documents.api.views._extract_story_background',
+            'on_failure': 'documents.api.views._extract_story_failed',
+            'visibility_timeout': 300,
+        },
+        'analyze_wizard_case': {
+            'handler': 'documents.api.views._analyze_case_background',
+            'on_failure': 'documents.api.views._analyze_case_failed',
+            'visibility_timeout': 300,
+        },
+        'refresh_jurisdiction': {
+            'handler': 'documents.services.jurisdiction_service.refresh_jurisdiction_job',
+            'visibility_timeout': 300,
+        },
+    }
+
+    ACTIVE_STATUSES = ('queued', 'running')
+
+    @classmethod
+    def enqueue(cls, job_type, payload=None, reference='', max_attempts=None, replace_payload=False):
+        """
+        Queue a job. If an active job of the same type already exists for the
+        same reference, that job is returned instead of creating a duplicate.
+
+        With replace_payload, a different payload isn't dropped: a queued job
+        (not started yet, or waiting to retry) takes the new payload and runs
+        now, and if the active job is already running a new job is queued
+        behind it.
+        """
+        from documents.models import BackgroundJob
+
+        if job_type not in cls.JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        payload = payload or {}
+        if reference:
+            existing = cls.find_active(job_type, reference)
+            if existing and (not replace_payload or existing.payload == payload):
+                return existing
+            if existing and existing.status == 'queued':
+                # Conditional so a job claimed in the meantime isn't changed under its worker
+                replaced = BackgroundJob.objects.filter(pk=existing.pk, status='queued').update(
+                    payload=payload, attempts=0, run_after=timezone.now(), last_error=''
+                )
+                if replaced:
+                    existing.refresh_from_db()
+                    return existing
+
+        return BackgroundJob.objects.create(
+            job_type=job_type,
+            payload=payload,
+            reference=reference,
+            max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+        )
+
+    @classmethod
+    def find_active(cls, job_type, reference):
+        """The newest queued or running job of this type for a reference, or None."""
+        from documents.models import BackgroundJob
+
+        return BackgroundJob.objects.filter(
+            job_type=job_type,
+            reference=reference,
+            status__in=cls.ACTIVE_STATUSES,
+        ).order_by('-created_at').first()
+
+    @classmethod
+    def claim_next(cls, worker_id):
+        """
+        Atomically claim the oldest runnable job for this worker.
+        Returns the claimed job or None if the queue is empty.
+        """
+        from documents.models import BackgroundJob
+
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                BackgroundJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='queued', run_after__lte=now)
+                .order_by('run_after', 'created_at')
+                .first()
+            )
+            if not job:
+                return None
+
+            timeout = cls.JOB_HANDLERS.get(job.job_type, {}).get(
+                'visibility_timeout', settings.JOB_QUEUE_VISIBILITY_TIMEOUT
+            )
+            # Conditional update so two workers can never claim the same row,
+            # even on databases without SELECT ... FOR UPDATE support.
+            claimed = BackgroundJob.objects.filter(pk=job.pk, status='queued').update(
+                status='running',
+                attempts=job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=timeout),
+                started_at=now,
+            )
+            if not claimed:
+                return None
+
+        job.refresh_from_db()
+        return job
+
+    @classmethod
+    def run(cls, job):
+        """Run a claimed job's handler and record the outcome."""
+        config = cls.JOB_HANDLERS.get(job.job_type)
+        if not config:
+            cls._mark_failed(job, f"Unknown job type: {job.job_type}", final=True)
+            return
+
+        from .ai_call_log import ai_call_context
+
+        try:
+            handler = import_string(config['handler'])
+            with ai_call_context(
+                document_id=job.payload.get('document_id'),
+                session_id=job.payload.get('session_id'),
+            ):
+                handler(**job.payload)
+        except Exception as e:
+            logger.exception(f"Job {job.pk} ({job.job_type}) failed on attempt {job.attempts}")
+            error = f"{e}\n\n{traceback.format_exc()}"
+            cls._mark_failed(job, error, final=not job.can_retry)
+            return
+
+        finished = cls._lease(job).update(
+            status='completed', finished_at=timezone.now(), locked_by='', locked_until=None
+        )
+        if finished:
+            job.status = 'completed'
+        else:
+            cls._log_lost_lease(job, 'completed')
+
+    @classmethod
+    def recover_stuck_jobs(cls):
+        """
+        Re-queue running jobs whose visibility timeout has expired (the worker
+        was killed or hung). Jobs out of attempts are failed instead.
+        Returns the number of jobs recovered.
+        """
+        from documents.models import BackgroundJob
+
+        now = timezone.now()
+        stuck = BackgroundJob.objects.filter(status='running', locked_until__lt=now)
+        count = 0
+        for job in stuck:
+            error = f"Visibility timeout expired while running on worker '{job.locked_by}'"
+            # Only while the lease is still expired: a concurrent sweep (another
+            # run_workers process) or the original worker finishing wins otherwise
+            lease = cls._lease(job).filter(locked_until__lt=now)
+            if cls._mark_failed(job, error, final=not job.can_retry, lease=lease):
+                logger.warning(f"Recovered stuck job {job.pk} ({job.job_type}): {error}")
+                count += 1
+        return count
+
+    @staticmethod
+    def _lease(job):
+        """The job's row while this claim still holds it (running, locked by the same worker)."""
+        from documents.models import BackgroundJob
+
+        return BackgroundJob.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+
+    @staticmethod
+    def _log_lost_lease(job, outcome):
+        logger.warning(
+            f"Job {job.pk} ({job.job_type}) lost its lease on worker '{job.locked_by}'; "
+            f"not marking it {outcome} (it was recovered or finished elsewhere)"
+        )
+
+    @classmethod
+    def _mark_failed(cls, job, error, final, lease=None):
+        """
+        Schedule a retry with backoff, or fail the job for good and run its
+        on_failure hook. Written only while the claim still holds the job, so
+        a recovered job is never failed (or its hook run) twice.
+
+        Returns:
+            True if the outcome was recorded, False if the lease was lost
+        """
+        lease = cls._lease(job) if lease is None else lease
+        fields = {'last_error': error, 'locked_by': '', 'locked_until': None}
+
+        if not final:
+            delay = min(
+                settings.JOB_QUEUE_RETRY_BACKOFF * (2 ** max(job.attempts - 1, 0)),
+                settings.JOB_QUEUE_RETRY_BACKOFF_MAX,
+            )
+            fields.update(status='queued', run_after=timezone.now() + timedelta(seconds=delay))
+        else:
+            fields.update(status='failed', finished_at=timezone.now())
+
+        if not lease.update(**fields):
+            cls._log_lost_lease(job, fields['status'])
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+
+        on_failure = cls.JOB_HANDLERS.get(job.job_type, {}).get('on_failure')
+        if final and on_failure:
+            try:
+                import_string(on_failure)(error=error.split('\n\n')[0], **job.payload)
+            except Exception:
+                logger.exception(f"on_failure hook for job {job.pk} ({job.job_type}) raised")
+        return True
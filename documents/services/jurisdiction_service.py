@@ -0,0 +1,255 @@
+"""
+Read-through store for law enforcement jurisdiction lookups.
+
+Agency and address lookups go through GPT web search and take 10-40 seconds.
+Results are saved as JurisdictionRecord rows keyed by normalized (city, state)
+and served from the database on later requests. Stale records are still
+served, and a background job is queued to refresh them.
+"""
+import logging
+import re
+
+from django.db.models import F
+from django.utils import timezone
+
+from common.constants import US_STATES
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME_TO_CODE = {name.upper(): code for code, name in US_STATES if code}
+
+
+def normalize_state(state):
+    """Return the two-letter code for a state code or full state name ('' if unknown)."""
+    state = (state or '').strip().upper().rstrip('.')
+    if len(state) == 2:
+        return state
+    return STATE_NAME_TO_CODE.get(state, '')
+
+
+def normalize_city(city):
+    """Lowercase, strip punctuation and collapse whitespace: 'St. Louis ' -> 'st louis'."""
+    city = re.sub(r'[^\w\s-]', '', (city or '').lower())
+    return re.sub(r'\s+', ' ', city).strip()
+
+
+def normalize_agency(agency_name):
+    """Normalize an agency name for use as an agency_addresses key."""
+    return normalize_city(agency_name)
+
+
+class JurisdictionService:
+    """Look up agency jurisdiction info from JurisdictionRecord first, GPT second."""
+
+    @staticmethod
+    def get_record(city, state):
+        """Return the JurisdictionRecord for a city/state, or None."""
+        from documents.models import JurisdictionRecord
+
+        city_key = normalize_city(city)
+        state_code = normalize_state(state)
+        if not city_key or not state_code:
+            return None
+
+        return JurisdictionRecord.objects.filter(city_key=city_key, state=state_code).first()
+
+    @classmethod
+    def find_agencies(cls, city, state, service=None):
+        """
+        Find the law enforcement agencies for a location.
+
+        Args:
+            city: City/town name
+            state: State code or name
+            service: Optional OpenAIService instance used on a miss
+
+        Returns:
+            dict in the same shape as OpenAIService.find_law_enforcement_agency
+        """
+        record = cls.get_record(city, state)
+        if record and record.agencies:
+            cls._touch(record)
+            return record.as_agency_result()
+
+        if service is None:
+            from .openai_service import OpenAIService
+            service = OpenAIService()
+
+        result = service.find_law_enforcement_agency(city, state)
+
+        # Only store real answers - the error path returns success with no agencies
+        if result.get('success') and result.get('agencies'):
+            cls.save_agencies(city, state, result, record=record)
+
+        return result
+
+    @classmethod
+    def lookup_agency_address(cls, service, agency_name, city='', state='',
+                              officer_name='', officer_title='', officer_description=''):
+        """
+        Look up an agency's headquarters address, using stored addresses when available.
+
+        If no agency name or officer details are given, the location's primary agency
+        is used. Otherwise behaves like OpenAIService.lookup_agency_address.
+
+        Returns:
+            dict with 'success', 'address', 'source_note', optionally 'suggested_agency',
+            and 'cached': True when served without an AI call
+        """
+        record = cls.get_record(city, state) if city and state else None
+
+        suggested_agency = None
+        if not agency_name and record and record.primary_agency and not (officer_title or officer_description):
+            agency_name = suggested_agency = record.primary_agency
+
+        if agency_name and record:
+            stored = record.agency_addresses.get(normalize_agency(agency_name))
+            if stored and stored.get('address'):
+                cls._touch(record)
+                result = {
+                    'success': True,
+                    'address': stored['address'],
+                    'confidence': stored.get('confidence', 'medium'),
+                    'source_note': stored.get('source_note') or 'Saved jurisdiction record',
+                    'cached': True,
+                }
+                if suggested_agency:
+                    result['suggested_agency'] = suggested_agency
+                return result
+
+        result = service.lookup_agency_address(
+            agency_name=agency_name,
+            city=city,
+            state=state,
+            officer_name=officer_name,
+            officer_title=officer_title,
+            officer_description=officer_description
+        )
+
+        if result.get('success') and city and state:
+            if suggested_agency and not result.get('suggested_agency'):
+                result['suggested_agency'] = suggested_agency
+            cls.save_agency_address(
+                city, state,
+                result.get('suggested_agency') or agency_name,
+                result,
+                record=record,
+            )
+
+        return result
+
+    @classmethod
+    def save_agencies(cls, city, state, result, record=None):
+        """Create or update a record from a find_law_enforcement_agency result."""
+        from documents.models import JurisdictionRecord
+
+        state_code = normalize_state(state)
+        city_key = normalize_city(city)
+        if not city_key or not state_code:
+            return None
+
+        if record is None:
+            record, _ = JurisdictionRecord.objects.get_or_create(
+                city_key=city_key, state=state_code, defaults={'city': city.strip()}
+            )
+
+        if record.is_verified:
+            # Never overwrite staff-verified agency data with GPT output
+            return record
+
+        agencies = result.get('agencies', [])
+        primary = next((a.get('name') for a in agencies if a.get('is_primary')), '')
+
+        record.county_name = result.get('county_name', '') or record.county_name
+        record.location_type = result.get('location_type', '') or record.location_type
+        record.has_local_police = result.get('has_local_police')
+        record.agencies = agencies
+        record.primary_agency = primary or (agencies[0].get('name', '') if agencies else '')
+        record.verification_warning = result.get('verification_warning', '')
+        record.source = 'gpt_web_search'
+        record.pending_result = None
+        record.refreshed_at = timezone.now()
+        record.save()
+        return record
+
+    @classmethod
+    def save_agency_address(cls, city, state, agency_name, result, record=None):
+        """Store an address from a lookup_agency_address result on the city's record."""
+        from documents.models import JurisdictionRecord
+
+        state_code = normalize_state(state)
+        city_key = normalize_city(city)
+        agency_key = normalize_agency(agency_name)
+        if not city_key or not state_code or not agency_key:
+            return None
+
+        if record is None:
+            record, _ = JurisdictionRecord.objects.get_or_create(
+                city_key=city_key, state=state_code, defaults={'city': city.strip()}
+            )
+
+        if record.is_verified and record.agency_addresses.get(agency_key, {}).get('address'):
+            # Never overwrite a staff-verified address with GPT output
+            return record
+
+        record.agency_addresses[agency_key] = {
+            'agency_name': agency_name,
+            'address': result.get('address', ''),
+            'confidence': result.get('confidence', 'medium'),
+            'source_note': result.get('source_note', ''),
+            'fetched_at': timezone.now().isoformat(),
+        }
+        record.save(update_fields=['agency_addresses', 'updated_at'])
+        return record
+
+    @classmethod
+    def refresh_record(cls, record_id, force=False):
+        """
+        Re-fetch agency data for a record from GPT (bypassing the AI response
+        cache). Skipped unless the record is stale or force=True.
+
+        Verified records are never overwritten: the fresh data is stored in
+        pending_result for staff to review and apply from the admin.
+        """
+        from documents.models import JurisdictionRecord
+        from .openai_service import OpenAIService
+
+        record = JurisdictionRecord.objects.filter(id=record_id).first()
+        if not record or not (force or record.is_stale):
+            return
+
+        result = OpenAIService().find_law_enforcement_agency(record.city, record.state, refresh=True)
+        if result.get('success') and result.get('agencies'):
+            if record.is_verified:
+                record.pending_result = result
+                record.refreshed_at = timezone.now()
+                record.save(update_fields=['pending_result', 'refreshed_at', 'updated_at'])
+            else:
+                cls.save_agencies(record.city, record.state, result, record=record)
+        else:
+            # Keep serving the old data, but don't retry on every request
+            record.refreshed_at = timezone.now()
+            record.save(update_fields=['refreshed_at', 'updated_at'])
+
+    @staticmethod
+    def _touch(record):
+        """Count the hit and queue a refresh if the record is stale."""
+        from documents.models import JurisdictionRecord
+        from .job_queue import JobQueue
+
+        JurisdictionRecord.objects.filter(id=record.id).update(hit_count=F('hit_count') + 1)
+
+        if record.is_stale:
+            try:
+                JobQueue.enqueue(
+                    'refresh_jurisdiction',
+                    {'record_id': record.id},
+                    reference=f'jurisdiction:{record.id}',
+                )
+            except Exception:
+                logger.exception(f"Could not queue refresh for jurisdiction record {record.id}")
+
+
+def refresh_jurisdiction_job(record_id, force=False):
+    """Background job handler for 'refresh_jurisdiction' (see JobQueue.JOB_HANDLERS)."""
+    JurisdictionService.refresh_record(record_id, force=force)
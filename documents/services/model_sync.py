@@ -0,0 +1,81 @@
+"""
+Bulk write helpers for applying generated data (wizard answers, parsed
+stories) to document section models.
+
+Both helpers only write what actually changed, so re-applying the same data
+costs no writes at all:
+
+    changed = assign_fields(overview, {'city': 'Tulsa', 'state': 'OK'})
+    if changed:
+        overview.save(update_fields=changed)
+
+    sync_child_rows(Defendant, section.defendants.all(), desired_rows,
+                    key_fields=('name', 'defendant_type'))
+"""
+
+
+def assign_fields(obj, values: dict) -> list:
+    """
+    Set attributes on a model instance.
+
+    Returns:
+        Names of the fields whose value actually changed (for save(update_fields=...))
+    """
+    changed = []
+    for field, value in values.items():
+        if getattr(obj, field) != value:
+            setattr(obj, field, value)
+            changed.append(field)
+    return changed
+
+
+def _row_key(values, key_fields):
+    return tuple(str(values.get(field) or '').strip().casefold() for field in key_fields)
+
+
+def sync_child_rows(model, existing, desired, key_fields) -> tuple:
+    """
+    Bring a section's child rows in line with a list of desired rows, in at
+    most two queries (one bulk_create, one bulk_update).
+
+    Desired rows are matched to existing ones on key_fields (case- and
+    whitespace-insensitive). Unmatched desired rows are created; matched rows
+    get their non-empty desired values, so a blank answer never wipes data the
+    user entered elsewhere. Existing rows with no desired match are kept.
+
+    Args:
+        model: Child model class (e.g. Defendant)
+        existing: Current child rows (a queryset or prefetched list)
+        desired: List of dicts of field values, each including the parent FK
+        key_fields: Field names identifying the same row across applies
+
+    Returns:
+        (created, updated) row counts
+    """
+    by_key = {_row_key({f: getattr(row, f) for f in key_fields}, key_fields): row for row in existing}
+
+    to_create, to_update, update_fields = [], [], set()
+    seen = set()
+    for values in desired:
+        key = _row_key(values, key_fields)
+        if key in seen:
+            continue  # Duplicate answer in the same apply
+        seen.add(key)
+
+        row = by_key.get(key)
+        if row is None:
+            to_create.append(model(**values))
+            continue
+
+        filled = {field: value for field, value in values.items()
+                  if value not in ('', None) and not model._meta.get_field(field).is_relation}
+        changed = assign_fields(row, filled)
+        if changed:
+            to_update.append(row)
+            update_fields.update(changed)
+
+    if to_create:
+        model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(update_fields))
+    return len(to_create), len(to_update)
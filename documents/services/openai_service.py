@@ -4,6 +4,8 @@ OpenAI service for AI-powered features in Section 1983 complaint building.
 from django.conf import settings
 from openai import OpenAI
 
+from .token_budget import select_model
+
 
 class OpenAIService:
     """Service for interacting with OpenAI API for legal document assistance."""
@@ -12,12 +14,13 @@ class OpenAIService:
         api_key = settings.OPENAI_API_KEY
         if not api_key:
             raise ValueError("OPENAI_API_KEY not configured in settings")
+        from .ai_call_log import instrument
         # Set timeout to 45 seconds per call - Gunicorn timeout is 120s
-        self.client = OpenAI(api_key=api_key, timeout=45.0)
+        self.client = instrument(OpenAI(api_key=api_key, timeout=45.0))
 
     def _get_prompt(self, prompt_type: str) -> dict:
         """
-        Fetch a prompt from the database AIPrompt model.
+        Fetch an active AIPrompt config (served from memory by PromptRegistry).
 
         Args:
             prompt_type: The type of prompt (e.g., 'parse_story', 'analyze_rights')
@@ -28,11 +31,8 @@ class OpenAIService:
         Raises:
             ValueError: If prompt not found or inactive. Run 'python manage.py seed_ai_prompts' to fix.
         """
-        from documents.models import AIPrompt
-        prompt = AIPrompt.objects.filter(
-            prompt_type=prompt_type,
-            is_active=True
-        ).first()
+        from .prompt_registry import PromptRegistry
+        prompt = PromptRegistry.get(prompt_type)
 
         if not prompt:
             raise ValueError(
@@ -40,13 +40,94 @@ class OpenAIService:
                 f"Run 'python manage.py seed_ai_prompts' to populate prompts."
             )
 
-        return {
-            'system_message': prompt.system_message,
-            'user_prompt_template': prompt.user_prompt_template,
-            'model_name': prompt.model_name,
-            'temperature': prompt.temperature,
-            'max_tokens': prompt.max_tokens,
-        }
+        return prompt
+
+    def _cached_json_completion(self, prompt_type: str, prompt_version: int, model: str,
+                                messages: list, temperature: float, max_tokens: int,
+                                refresh: bool = False) -> str:
+        """
+        Run a JSON-mode chat completion through the AI response cache.
+
+        Args:
+            prompt_type: Cache namespace (AIPrompt.prompt_type or a fixed name)
+            prompt_version: AIPrompt.version (0 for hardcoded prompts)
+            model, messages, temperature, max_tokens: Passed to chat.completions.create
+            refresh: Skip the cached response (the new one still replaces it)
+
+        Returns:
+            The response content string (JSON)
+        """
+        import json
+        from .ai_response_cache import AIResponseCache
+
+        model = select_model(prompt_type, model, messages)
+        use_cache = AIResponseCache.is_enabled(prompt_type)
+        if use_cache:
+            cache_key = AIResponseCache.make_key(
+                prompt_type, prompt_version, model, temperature, messages, max_tokens=max_tokens
+            )
+            cached = None if refresh else AIResponseCache.get(cache_key, prompt_type)
+            if cached is not None:
+                return cached
+
+        response = self.client.chat.completions.create(
+            prompt_type=prompt_type,
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        content = response.choices[0].message.content
+
+        if use_cache:
+            try:
+                json.loads(content)
+            except (TypeError, ValueError):
+                return content  # Don't cache truncated/invalid JSON
+            AIResponseCache.set(cache_key, prompt_type, prompt_version, model, content)
+
+        return content
+
+    def _cached_web_search(self, prompt_type: str, prompt_version: int, model: str, query: str) -> str:
+        """
+        Run a web search (Responses API) through the AI response cache.
+
+        Returns:
+            The text of the first output message, or '' if none
+        """
+        from .ai_response_cache import AIResponseCache
+
+        model = select_model(prompt_type, model, query)
+        use_cache = AIResponseCache.is_enabled(prompt_type)
+        if use_cache:
+            cache_key = AIResponseCache.make_key(
+                prompt_type, prompt_version, model, None, query, tools='web_search_preview'
+            )
+            cached = AIResponseCache.get(cache_key, prompt_type)
+            if cached is not None:
+                return cached
+
+        response = self.client.responses.create(
+            prompt_type=prompt_type,
+            model=model,
+            tools=[{"type": "web_search_preview"}],
+            input=query
+        )
+
+        # Extract the text response
+        response_text = ""
+        for item in response.output:
+            if hasattr(item, 'content'):
+                for content in item.content:
+                    if hasattr(content, 'text'):
+                        response_text = content.text
+                        break
+
+        if use_cache and response_text:
+            AIResponseCache.set(cache_key, prompt_type, prompt_version, model, response_text)
+
+        return response_text
 
     def analyze_rights_violations(self, document_data: dict) -> dict:
         """
@@ -90,12 +171,14 @@ class OpenAIService:
         user_prompt = prompt['user_prompt_template'].format(context=context)
 
         try:
+            messages = [
+                {"role": "system", "content": prompt['system_message']},
+                {"role": "user", "content": user_prompt}
+            ]
             response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
+                prompt_type=prompt['prompt_type'],
+                model=select_model(prompt['prompt_type'], prompt['model_name'], messages),
+                messages=messages,
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
                 response_format={"type": "json_object"}
@@ -132,24 +215,18 @@ class OpenAIService:
                 'error': 'No story text provided',
             }
 
-        # Get prompt from database (required)
-        prompt = self._get_prompt('parse_story')
-        user_prompt = prompt['user_prompt_template'].format(story_text=story_text)
+        prompt, messages = self._parse_story_messages(story_text)
 
         try:
-            response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
+            content = self._cached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
+                messages=messages,
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
-                response_format={"type": "json_object"}
             )
 
             import json
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
 
             # Post-process: Verify inferred agencies using smart lookup
             result = self._verify_inferred_agencies(result)
@@ -165,6 +242,35 @@ class OpenAIService:
                 'error': str(e),
             }
 
+    def _parse_story_messages(self, story_text: str, sections=None) -> tuple:
+        """
+        Return (prompt config, chat messages) for parse_story.
+
+        Args:
+            story_text: Raw text from user describing their incident
+            sections: Optional subset of top-level sections to extract (incremental
+                re-parse); questions_to_ask is always included
+        """
+        from .story_diff import ALWAYS_REPARSED
+        from .token_budget import get_input_budget, trim_to_tokens
+
+        # Get prompt from database (required)
+        prompt = self._get_prompt('parse_story')
+        story_text = trim_to_tokens(story_text, get_input_budget('parse_story'))
+        user_prompt = prompt['user_prompt_template'].format(story_text=story_text)
+        messages = [
+            {"role": "system", "content": prompt['system_message']},
+            {"role": "user", "content": user_prompt}
+        ]
+        if sections is not None:
+            keys = ', '.join(sorted(sections) + list(ALWAYS_REPARSED))
+            messages.append({
+                "role": "user",
+                "content": f"Only extract these sections this time: {keys}. Return a JSON object "
+                           f"with exactly these top-level keys, using the structure above."
+            })
+        return prompt, messages
+
     def _verify_inferred_agencies(self, parsed_result: dict) -> dict:
         """
         Post-process parsed story to verify/correct inferred agency names.
@@ -186,8 +292,9 @@ class OpenAIService:
             if not has_inferred:
                 return parsed_result
 
-            # Use smart lookup to find correct agency
-            agency_info = self.find_law_enforcement_agency(city, state)
+            # Use smart lookup to find correct agency (saved jurisdiction record first)
+            from .jurisdiction_service import JurisdictionService
+            agency_info = JurisdictionService.find_agencies(city, state, service=self)
 
             if not agency_info.get('success'):
                 return parsed_result
@@ -240,6 +347,32 @@ class OpenAIService:
                 'error': 'No extracted data provided',
             }
 
+        prompt, messages = self._suggest_relief_messages(extracted_data)
+
+        try:
+            content = self._cached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
+                messages=messages,
+                temperature=prompt['temperature'],
+                max_tokens=prompt['max_tokens'],
+            )
+
+            import json
+            result = json.loads(content)
+
+            return {
+                'success': True,
+                'relief': result,
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+            }
+
+    def _suggest_relief_messages(self, extracted_data: dict) -> tuple:
+        """Return (prompt config, chat messages) for suggest_relief."""
         # Build context from extracted data
         rights = extracted_data.get('rights_violated', {}).get('suggested_violations', [])
         damages = extracted_data.get('damages', {})
@@ -266,32 +399,10 @@ INCIDENT SUMMARY:
         # Get prompt from database (required)
         prompt = self._get_prompt('suggest_relief')
         user_prompt = prompt['user_prompt_template'].format(context=context)
-
-        try:
-            response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=prompt['temperature'],
-                max_tokens=prompt['max_tokens'],
-                response_format={"type": "json_object"}
-            )
-
-            import json
-            result = json.loads(response.choices[0].message.content)
-
-            return {
-                'success': True,
-                'relief': result,
-            }
-
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-            }
+        return prompt, [
+            {"role": "system", "content": prompt['system_message']},
+            {"role": "user", "content": user_prompt}
+        ]
 
     def suggest_agency(self, context: dict) -> dict:
         """
@@ -324,8 +435,10 @@ INCIDENT SUMMARY:
         else:
             existing_list = "None yet"
 
-        # First, use web search to find the correct law enforcement agency for this location
-        agency_info = self.find_law_enforcement_agency(city, state)
+        # First, find the correct law enforcement agency for this location
+        # (saved jurisdiction record, falling back to web search)
+        from .jurisdiction_service import JurisdictionService
+        agency_info = JurisdictionService.find_agencies(city, state, service=self)
         agency_context = ""
         if agency_info.get('success'):
             agencies = agency_info.get('agencies', [])
@@ -407,6 +520,7 @@ Return a JSON object with this format:
 
         try:
             response = self.client.chat.completions.create(
+                prompt_type='suggest_agency',
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -462,7 +576,7 @@ Return a JSON object with this format:
                 'error': str(e),
             }
 
-    def find_law_enforcement_agency(self, city: str, state: str) -> dict:
+    def find_law_enforcement_agency(self, city: str, state: str, refresh: bool = False) -> dict:
         """
         Find the correct law enforcement agency for a location.
         Handles small towns that don't have their own police department.
@@ -470,6 +584,7 @@ Return a JSON object with this format:
         Args:
             city: City/town name
             state: State name or abbreviation
+            refresh: Bypass the AI response cache (jurisdiction refreshes)
 
         Returns:
             dict with 'success', 'agencies' (list of possible agencies with addresses)
@@ -485,19 +600,19 @@ Return a JSON object with this format:
         user_prompt = prompt['user_prompt_template'].format(city=city, state=state)
 
         try:
-            response = self.client.chat.completions.create(
-                model=prompt['model_name'],
+            content = self._cached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
                 messages=[
                     {"role": "system", "content": prompt['system_message']},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
-                response_format={"type": "json_object"}
+                refresh=refresh,
             )
 
             import json
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
 
             return {
                 'success': True,
@@ -559,19 +674,18 @@ Return a JSON object with this format:
                 officer_info=officer_info
             )
 
-            response = self.client.chat.completions.create(
-                model=prompt_config['model_name'],
+            content = self._cached_json_completion(
+                prompt_config['prompt_type'], prompt_config['version'], prompt_config['model_name'],
                 messages=[
                     {"role": "system", "content": prompt_config['system_message']},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=prompt_config['temperature'],
                 max_tokens=prompt_config['max_tokens'],
-                response_format={"type": "json_object"}
             )
 
             import json
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
 
             if result.get('agency_name'):
                 return {
@@ -641,20 +755,7 @@ Return a JSON object with this format:
 
         try:
             # Use OpenAI with web search tool
-            response = self.client.responses.create(
-                model="gpt-4o-mini",
-                tools=[{"type": "web_search_preview"}],
-                input=query
-            )
-
-            # Extract the text response
-            address_text = ""
-            for item in response.output:
-                if hasattr(item, 'content'):
-                    for content in item.content:
-                        if hasattr(content, 'text'):
-                            address_text = content.text
-                            break
+            address_text = self._cached_web_search('lookup_agency_address', 0, "gpt-4o-mini", query)
 
             if not address_text:
                 return {
@@ -687,19 +788,18 @@ If no clear address is found, return:
     "source_note": "Could not find official address"
 }}"""
 
-            parse_response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            parse_content = self._cached_json_completion(
+                'lookup_agency_address_parse', 0, "gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Extract addresses from text. Return only valid JSON."},
                     {"role": "user", "content": parse_prompt}
                 ],
                 temperature=0.1,
                 max_tokens=500,
-                response_format={"type": "json_object"}
             )
 
             import json
-            result = json.loads(parse_response.choices[0].message.content)
+            result = json.loads(parse_content)
 
             if result.get('address'):
                 response_data = {
@@ -749,21 +849,11 @@ If no clear address is found, return:
             user_prompt = prompt['user_prompt_template'].format(city=city, state=state)
 
             # Use GPT with web search to find the correct federal court
-            response = self.client.responses.create(
-                model=prompt['model_name'],
-                tools=[{"type": "web_search_preview"}],
-                input=f"{prompt['system_message']}\n\n{user_prompt}"
+            response_text = self._cached_web_search(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
+                f"{prompt['system_message']}\n\n{user_prompt}"
             )
 
-            # Extract the text response
-            response_text = ""
-            for item in response.output:
-                if hasattr(item, 'content'):
-                    for content in item.content:
-                        if hasattr(content, 'text'):
-                            response_text = content.text
-                            break
-
             if not response_text:
                 return {
                     'success': False,
@@ -791,19 +881,18 @@ If no clear court can be determined, return:
     "source": "Could not determine federal court"
 }}"""
 
-            parse_response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            parse_content = self._cached_json_completion(
+                'lookup_federal_court_parse', 0, "gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Extract federal court information from text. Return only valid JSON."},
                     {"role": "user", "content": parse_prompt}
                 ],
                 temperature=0.1,
                 max_tokens=500,
-                response_format={"type": "json_object"}
             )
 
             import json
-            result = json.loads(parse_response.choices[0].message.content)
+            result = json.loads(parse_content)
 
             if result.get('court_name'):
                 return {
@@ -870,12 +959,14 @@ If no clear court can be determined, return:
                 existing=existing_data.get('existing', 'None yet')
             )
 
+            messages = [
+                {"role": "system", "content": prompt['system_message']},
+                {"role": "user", "content": user_prompt}
+            ]
             response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
+                prompt_type=prompt['prompt_type'],
+                model=select_model(prompt['prompt_type'], prompt['model_name'], messages),
+                messages=messages,
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
                 response_format={"type": "json_object"}
@@ -931,18 +1022,17 @@ If no clear court can be determined, return:
                 document_json=document_json
             )
 
-            response = self.client.chat.completions.create(
-                model=prompt['model_name'],
+            content = self._cached_json_completion(
+                prompt['prompt_type'], prompt['version'], prompt['model_name'],
                 messages=[
                     {"role": "system", "content": prompt['system_message']},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
-                response_format={"type": "json_object"}
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(content)
 
             return {
                 'success': True,
@@ -1002,12 +1092,14 @@ If no clear court can be determined, return:
                 document_context=document_context
             )
 
+            messages = [
+                {"role": "system", "content": prompt['system_message']},
+                {"role": "user", "content": user_prompt}
+            ]
             response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
+                prompt_type=prompt['prompt_type'],
+                model=select_model(prompt['prompt_type'], prompt['model_name'], messages),
+                messages=messages,
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
                 response_format={"type": "json_object"}
@@ -1049,40 +1141,56 @@ If no clear court can be determined, return:
                 'error': 'Please generate the document first before requesting AI review.',
             }
 
+        from .token_budget import fit_texts, get_input_budget
+
+        # Fit the sections to the prompt's input budget (long facts/causes are trimmed first)
+        causes = [cause.get('content', '') for cause in document.final_causes_of_action or []]
+        (introduction, jurisdiction, parties, facts, prayer, jury_demand, signature, *causes) = fit_texts(
+            [
+                document.final_introduction or '', document.final_jurisdiction or '',
+                document.final_parties or '', document.final_facts or '',
+                document.final_prayer or '', document.final_jury_demand or '',
+                document.final_signature or '', *causes,
+            ],
+            get_input_budget('review_final_document'),
+        )
+
         # Build the full document text for review
         document_text = f"""
 INTRODUCTION:
-{document.final_introduction}
+{introduction}
 
-{document.final_jurisdiction}
+{jurisdiction}
 
-{document.final_parties}
+{parties}
 
-{document.final_facts}
+{facts}
 
 """
         # Add causes of action
-        for cause in document.final_causes_of_action or []:
-            document_text += f"\n{cause.get('content', '')}\n"
+        for cause in causes:
+            document_text += f"\n{cause}\n"
 
         document_text += f"""
-{document.final_prayer}
+{prayer}
 
-{document.final_jury_demand}
+{jury_demand}
 
-{document.final_signature}
+{signature}
 """
 
         try:
             prompt = self._get_prompt('review_final_document')
             user_prompt = prompt['user_prompt_template'].format(document_text=document_text)
 
+            messages = [
+                {"role": "system", "content": prompt['system_message']},
+                {"role": "user", "content": user_prompt}
+            ]
             response = self.client.chat.completions.create(
-                model=prompt['model_name'],
-                messages=[
-                    {"role": "system", "content": prompt['system_message']},
-                    {"role": "user", "content": user_prompt}
-                ],
+                prompt_type=prompt['prompt_type'],
+                model=select_model(prompt['prompt_type'], prompt['model_name'], messages),
+                messages=messages,
                 temperature=prompt['temperature'],
                 max_tokens=prompt['max_tokens'],
                 response_format={"type": "json_object"}
@@ -0,0 +1,184 @@
+"""
+Process pool for WeasyPrint PDF rendering.
+
+Renders run in a few long-lived worker processes instead of the web or job
+thread that asked for them, so a render's memory spike never lands in a
+gunicorn worker. Each worker parses the PDF stylesheets and builds its
+FontConfiguration once at start-up and reuses them for every render.
+The pool is replaced after PDF_RENDER_MAX_TASKS_PER_WORKER renders per
+worker, which caps WeasyPrint's memory growth (the old pool finishes its
+queued renders and exits).
+
+    pdf_bytes = PdfRenderService.render('document_pdf', html_string)
+
+    future = PdfRenderService.submit('final_pdf', html_string)
+    ...
+    pdf_bytes = future.result()
+
+The PDF templates carry no static CSS of their own; it lives in the
+STYLESHEETS files and is applied here.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Stylesheet name -> template path of its CSS
+STYLESHEETS = {
+    'document_pdf': 'documents/pdf/document_pdf.css',
+    'final_pdf': 'documents/pdf/final_pdf.css',
+}
+
+
+# =============================================================================
+# Worker process state (also used in-process when PDF_RENDER_WORKERS = 0)
+# =============================================================================
+
+_worker_stylesheets = None
+_worker_font_config = None
+
+
+def _init_worker(stylesheet_sources):
+    """Parse every stylesheet once with a shared FontConfiguration."""
+    global _worker_stylesheets, _worker_font_config
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    _worker_font_config = FontConfiguration()
+    _worker_stylesheets = {
+        name: CSS(string=source, font_config=_worker_font_config)
+        for name, source in stylesheet_sources.items()
+    }
+
+
+def _render(stylesheet, html_string):
+    from weasyprint import HTML
+
+    return HTML(string=html_string).write_pdf(
+        stylesheets=[_worker_stylesheets[stylesheet]],
+        font_config=_worker_font_config,
+    )
+
+
+# =============================================================================
+# Service
+# =============================================================================
+
+class PdfRenderService:
+    """Submit/await API over the per-process render pool."""
+
+    _pool = None
+    _pool_pid = None
+    _pool_renders = 0
+    _lock = threading.Lock()
+    _sources = None
+
+    @classmethod
+    def stylesheet_sources(cls):
+        """CSS text for every stylesheet, read from the template directories once per process."""
+        if cls._sources is None:
+            from django.template.loader import get_template
+
+            cls._sources = {
+                name: get_template(path).template.source
+                for name, path in STYLESHEETS.items()
+            }
+        return cls._sources
+
+    @classmethod
+    def stylesheet_hash(cls, stylesheet):
+        """SHA-256 of a stylesheet, so artifacts keyed on HTML also change when the CSS does."""
+        return hashlib.sha256(cls.stylesheet_sources()[stylesheet].encode('utf-8')).hexdigest()
+
+    @classmethod
+    def submit(cls, stylesheet, html_string):
+        """
+        Queue a render.
+
+        Args:
+            stylesheet: Key of STYLESHEETS to apply
+            html_string: Rendered PDF template HTML
+
+        Returns:
+            concurrent.futures.Future resolving to the PDF bytes
+        """
+        if stylesheet not in STYLESHEETS:
+            raise ValueError(f'Unknown PDF stylesheet: {stylesheet}')
+
+        if getattr(settings, 'PDF_RENDER_WORKERS', 2) <= 0:
+            return cls._render_in_process(stylesheet, html_string)
+
+        try:
+            return cls._get_pool().submit(_render, stylesheet, html_string)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool and try once more
+            logger.warning('PDF render pool was broken; restarting it')
+            cls.shutdown()
+            return cls._get_pool().submit(_render, stylesheet, html_string)
+
+    @classmethod
+    def render(cls, stylesheet, html_string, timeout=None):
+        """Render and wait for the PDF bytes (PDF_RENDER_TIMEOUT seconds by default)."""
+        if timeout is None:
+            timeout = getattr(settings, 'PDF_RENDER_TIMEOUT', 90)
+        return cls.submit(stylesheet, html_string).result(timeout=timeout)
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the pool's workers (a new pool is started on the next submit)."""
+        with cls._lock:
+            pool, cls._pool, cls._pool_pid = cls._pool, None, None
+            cls._pool_renders = 0
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _get_pool(cls):
+        workers = getattr(settings, 'PDF_RENDER_WORKERS', 2)
+        max_renders = workers * getattr(settings, 'PDF_RENDER_MAX_TASKS_PER_WORKER', 50)
+        retired = None
+
+        with cls._lock:
+            # A pool inherited through fork (gunicorn --preload) belongs to the parent
+            if cls._pool is not None and cls._pool_pid != os.getpid():
+                cls._pool = None
+            # Recycled by hand: ProcessPoolExecutor's max_tasks_per_child can deadlock on Python 3.11
+            elif cls._pool is not None and cls._pool_renders >= max_renders:
+                retired, cls._pool = cls._pool, None
+
+            if cls._pool is None:
+                cls._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    # Workers don't need Django; spawn avoids forking a threaded web/job process
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(cls.stylesheet_sources(),),
+                )
+                cls._pool_pid = os.getpid()
+                cls._pool_renders = 0
+
+            cls._pool_renders += 1
+            pool = cls._pool
+
+        if retired is not None:
+            retired.shutdown(wait=False)
+        return pool
+
+    @classmethod
+    def _render_in_process(cls, stylesheet, html_string):
+        future = Future()
+        try:
+            with cls._lock:
+                if _worker_stylesheets is None:
+                    _init_worker(cls.stylesheet_sources())
+            future.set_result(_render(stylesheet, html_string))
+        except Exception as e:
+            future.set_exception(e)
+        return future
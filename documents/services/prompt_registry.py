@@ -0,0 +1,88 @@
+"""
+In-process registry of active AIPrompt rows.
+
+Every AI call needs its prompt; instead of one query per call, the registry
+loads all active prompts in one query and serves them from memory.
+
+Staleness across processes (web workers, run_workers) is bounded by a
+version stamp - the row count and latest updated_at over all prompts - which
+is re-read at most every PROMPT_REGISTRY_CHECK_SECONDS. A save or delete
+through the model also clears the registry of the process that made it, so
+admin edits show up there immediately.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+
+class PromptRegistry:
+    """Active prompts by prompt_type, loaded once and refreshed when the version stamp changes."""
+
+    _prompts = None
+    _stamp = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, prompt_type):
+        """
+        Return the active prompt config for a type.
+
+        Returns:
+            dict with prompt_type, version, system_message, user_prompt_template,
+            model_name, temperature, max_tokens and the budget/routing fields,
+            or None if not found/inactive
+        """
+        prompt = cls._active_prompts().get(prompt_type)
+        return dict(prompt) if prompt else None
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the loaded prompts; the next get() reloads them."""
+        with cls._lock:
+            cls._prompts = None
+
+    @classmethod
+    def _active_prompts(cls):
+        interval = getattr(settings, 'PROMPT_REGISTRY_CHECK_SECONDS', 5)
+        with cls._lock:
+            now = time.monotonic()
+            if cls._prompts is not None and now - cls._checked_at < interval:
+                return cls._prompts
+
+            stamp = cls._version_stamp()
+            if cls._prompts is None or stamp != cls._stamp:
+                cls._prompts = cls._load()
+                cls._stamp = stamp
+            cls._checked_at = now
+            return cls._prompts
+
+    @staticmethod
+    def _version_stamp():
+        """Cheap aggregate that changes whenever a prompt is added, edited, toggled or deleted."""
+        from django.db.models import Count, Max
+        from documents.models import AIPrompt
+
+        stamp = AIPrompt.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+        return stamp['count'], stamp['updated']
+
+    @staticmethod
+    def _load():
+        from documents.models import AIPrompt
+
+        return {
+            prompt.prompt_type: {
+                'prompt_type': prompt.prompt_type,
+                'version': prompt.version,
+                'system_message': prompt.system_message,
+                'user_prompt_template': prompt.user_prompt_template,
+                'model_name': prompt.model_name,
+                'temperature': prompt.temperature,
+                'max_tokens': prompt.max_tokens,
+                'max_input_tokens': prompt.max_input_tokens,
+                'small_model_name': prompt.small_model_name,
+                'small_model_max_input_tokens': prompt.small_model_max_input_tokens,
+            }
+            for prompt in AIPrompt.objects.filter(is_active=True)
+        }
@@ -0,0 +1,135 @@
+"""
+Story diffing for incremental re-parses.
+
+When a user edits a story that was already parsed, only the parse_story
+sections the edit can affect are extracted again; the rest are reused from
+the previous parsing_result. The old and new stories are compared paragraph
+by paragraph and each changed paragraph is mapped to sections by keyword:
+a new paragraph about a friend who was filming touches witnesses and
+evidence, not defendants or damages.
+
+    sections = affected_sections(document.parsed_story_text, story_text)
+    # None  -> parse everything (no baseline, or too much changed)
+    # set() -> nothing material changed, reuse the previous result
+    # {...} -> re-extract just these sections
+"""
+import difflib
+import re
+
+# Top-level sections of the parse_story result that can be re-extracted on their own
+PARSE_SECTIONS = (
+    'incident_overview', 'incident_narrative', 'defendants', 'witnesses',
+    'evidence', 'damages', 'rights_violated',
+)
+
+# Always regenerated with any partial re-parse - they depend on the whole story
+ALWAYS_REPARSED = ('questions_to_ask',)
+
+# suggest_relief reads these sections; relief is reused when none of them changed
+RELIEF_INPUTS = {'rights_violated', 'damages', 'evidence', 'incident_narrative'}
+
+_MONTHS = 'january|february|march|april|may|june|july|august|september|october|november|december'
+_DAYS = 'monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+
+SECTION_PATTERNS = {
+    'incident_overview': re.compile(
+        rf"\b({_MONTHS}|{_DAYS}|yesterday|today|tonight|last (week|night|month|year)|"
+        r"\d{1,2}(:\d{2})?\s*(am|pm|a\.m\.|p\.m\.)|o'?clock|morning|afternoon|evening|midnight|noon|"
+        r"\d+\s+\w+(\s\w+)?\s(street|st|avenue|ave|road|rd|boulevard|blvd|drive|dr|lane|ln)|"
+        r"highway|hwy|intersection|corner of|city hall|county|town|downtown|address|located|"
+        r"record(ed|ing)?|filming|phone|camera)\b|\b(19|20)\d{2}\b",
+        re.IGNORECASE,
+    ),
+    'defendants': re.compile(
+        r"\b(officers?|deput(y|ies)|sergeant|sgt|lieutenant|lt\.|detectives?|troopers?|sheriff|police|"
+        r"cops?|badge|agents?|guards?|chief|captain|department|dept|agency|officials?|clerk|"
+        r"warden|jailer|security)\b",
+        re.IGNORECASE,
+    ),
+    'witnesses': re.compile(
+        r"\b(witness(es|ed)?|bystanders?|passers?-?by|onlookers?|crowd|neighbou?rs?|friends?|"
+        r"coworkers?|co-workers?|(my|his|her) (wife|husband|partner|girlfriend|boyfriend|brother|"
+        r"sister|mother|father|mom|dad|son|daughter|cousin)|saw (it|everything|the whole)|watched)\b",
+        re.IGNORECASE,
+    ),
+    'evidence': re.compile(
+        r"\b(record(ed|ing|ings)?|video|film(ed|ing)?|footage|cameras?|body ?cams?|dash ?cams?|"
+        r"photos?|pictures?|screenshots?|audio|911|reports?|receipts?|documents?|texts?|emails?|"
+        r"surveillance|youtube|live ?stream(ed|ing)?|records)\b",
+        re.IGNORECASE,
+    ),
+    'damages': re.compile(
+        r"\b(injur(y|ies|ed)|hurt|pain(ful)?|bruis(e|es|ed|ing)|bleed(ing)?|blood|broke|broken|"
+        r"fractur(e|ed)|sprain(ed)?|concussion|hospital|doctor|medical|emergency room|ambulance|"
+        r"stitches|therap(y|ist)|anxiety|depress(ed|ion)|ptsd|trauma(tized)?|nightmares?|"
+        r"humiliat(ed|ing|ion)|embarrass(ed|ing|ment)|afraid|scared|lost (my )?(job|wages|income)|"
+        r"missed work|damaged?|towed|impound(ed)?|bail|fines?|lawyer|attorney)\b|\$\d",
+        re.IGNORECASE,
+    ),
+    'rights_violated': re.compile(
+        r"\b(arrest(ed)?|detain(ed)?|handcuff(ed|s)?|search(ed)?|seiz(e|ed|ure)|grabb(ed)?|push(ed)?|"
+        r"shov(e|ed)|tackl(e|ed)|punch(ed)?|hit|kick(ed)?|slam(med)?|tas(er|ed)|pepper|choke(d)?|"
+        r"force|threat(en|ened)?|retaliat(e|ed|ion)|speech|protest(ing)?|press|religio(n|us)|"
+        r"warrant|probable cause|miranda|jail(ed)?|charged|ticket(ed)?|citation|cited|trespass)\b",
+        re.IGNORECASE,
+    ),
+}
+
+# A changed paragraph about the encounter itself also changes the narrative
+NARRATIVE_TRIGGERS = {'defendants', 'rights_violated'}
+
+# Above this share of changed text a partial parse saves little - parse everything
+FULL_REPARSE_RATIO = 0.5
+
+
+def split_paragraphs(text: str) -> list:
+    """Paragraphs of a story (blank-line separated), whitespace-normalized."""
+    return [' '.join(p.split()) for p in re.split(r'\n\s*\n', text or '') if p.strip()]
+
+
+def changed_paragraphs(old_text: str, new_text: str) -> list:
+    """New or edited paragraphs of new_text plus paragraphs removed from old_text."""
+    old, new = split_paragraphs(old_text), split_paragraphs(new_text)
+    changed = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(a=old, b=new, autojunk=False).get_opcodes():
+        if tag != 'equal':
+            changed.extend(old[i1:i2])
+            changed.extend(new[j1:j2])
+    return changed
+
+
+def classify_paragraph(paragraph: str) -> set:
+    """parse_story sections a paragraph can affect."""
+    sections = {name for name, pattern in SECTION_PATTERNS.items() if pattern.search(paragraph)}
+    if not sections or sections & NARRATIVE_TRIGGERS:
+        sections.add('incident_narrative')
+    return sections
+
+
+def affected_sections(old_text: str, new_text: str):
+    """
+    Sections to re-extract after editing a parsed story.
+
+    Returns:
+        None to parse the whole story, an empty set if nothing material
+        changed, otherwise the set of PARSE_SECTIONS to re-extract
+    """
+    if not old_text:
+        return None
+
+    changed = changed_paragraphs(old_text, new_text)
+    if not changed:
+        return set()
+
+    changed_chars = sum(len(p) for p in changed)
+    if changed_chars > FULL_REPARSE_RATIO * max(len(new_text), 1):
+        return None
+
+    sections = set()
+    for paragraph in changed:
+        sections |= classify_paragraph(paragraph)
+
+    # Re-extracting nearly everything costs about as much as a full parse
+    if len(sections) >= len(PARSE_SECTIONS) - 1:
+        return None
+    return sections
@@ -0,0 +1,146 @@
+"""
+Prompt-size budgeting and model routing for AI calls.
+
+Inputs that grow with the user's case (the story, wizard answers, video
+transcripts, the generated complaint) are trimmed to the AIPrompt's
+max_input_tokens budget before they are sent, so large cases stay under the
+model's context limit. Trimming keeps the head and tail of each text and
+marks the cut; when several texts share a budget, the largest are trimmed
+first and short ones are left intact.
+
+Small requests can be routed to a cheaper/faster model: when the estimated
+prompt size is at most AIPrompt.small_model_max_input_tokens, the call uses
+AIPrompt.small_model_name instead of model_name.
+
+Token counts are local estimates - tiktoken when installed, otherwise
+about four characters per token.
+"""
+import math
+
+from django.conf import settings
+
+try:
+    import tiktoken
+except ImportError:  # Optional - fall back to the character estimate
+    tiktoken = None
+
+CHARS_PER_TOKEN = 4
+
+# Share of a trimmed text kept from the start; the rest comes from the end
+HEAD_RATIO = 0.7
+
+# Room left for the omission marker
+MARKER_TOKENS = 15
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        _encoding = tiktoken.get_encoding('o200k_base')
+    return _encoding
+
+
+def estimate_tokens(text) -> int:
+    """Estimated token count of a string."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages) -> int:
+    """Estimated prompt tokens for a chat messages list (or a plain input string)."""
+    if isinstance(messages, str):
+        return estimate_tokens(messages)
+    # ~4 tokens of per-message framing
+    return sum(estimate_tokens(message.get('content') or '') + 4 for message in messages)
+
+
+def trim_to_tokens(text, max_tokens: int) -> str:
+    """
+    Trim text to about max_tokens, keeping the beginning and end.
+
+    Returns:
+        The text unchanged if it fits, otherwise head + omission marker + tail
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    if max_tokens <= MARKER_TOKENS:
+        return ''
+
+    keep_chars = int(len(text) * (max_tokens - MARKER_TOKENS) / tokens)
+    head_chars = int(keep_chars * HEAD_RATIO)
+    tail_chars = keep_chars - head_chars
+
+    # Cut on whitespace so words aren't split
+    head = text[:head_chars]
+    if ' ' in head:
+        head = head[:head.rfind(' ')]
+    tail = text[len(text) - tail_chars:] if tail_chars else ''
+    if ' ' in tail:
+        tail = tail[tail.find(' ') + 1:]
+
+    omitted = len(text[len(head):len(text) - len(tail)].split())
+    return f"{head.rstrip()}\n[... {omitted} words omitted to fit the length limit ...]\n{tail.lstrip()}"
+
+
+def fit_texts(texts, budget: int) -> list:
+    """
+    Trim a list of texts so that together they fit a token budget.
+
+    Texts smaller than their fair share are kept whole and their unused share
+    goes to the larger ones, so only the biggest inputs are cut.
+
+    Returns:
+        List of (possibly trimmed) texts, in the original order
+    """
+    sizes = [estimate_tokens(text) for text in texts]
+    if sum(sizes) <= budget:
+        return list(texts)
+
+    allotted = [0] * len(texts)
+    remaining = max(budget, 0)
+    order = sorted(range(len(texts)), key=lambda i: sizes[i])
+    for position, index in enumerate(order):
+        share = remaining // (len(texts) - position)
+        allotted[index] = min(sizes[index], share)
+        remaining -= allotted[index]
+
+    return [trim_to_tokens(text, allotted[i]) for i, text in enumerate(texts)]
+
+
+def get_input_budget(prompt_type: str) -> int:
+    """Token budget for a prompt type's inputs: AIPrompt.max_input_tokens, else AI_INPUT_TOKEN_BUDGET."""
+    from .prompt_registry import PromptRegistry
+
+    prompt = PromptRegistry.get(prompt_type)
+    if prompt and prompt.get('max_input_tokens'):
+        return prompt['max_input_tokens']
+    return getattr(settings, 'AI_INPUT_TOKEN_BUDGET', 12000)
+
+
+def select_model(prompt_type: str, model: str, messages) -> str:
+    """
+    Apply the AIPrompt's routing rule to a request.
+
+    Args:
+        prompt_type: AIPrompt.prompt_type (types without a prompt are never routed)
+        model: The model the caller would use (the prompt's model_name)
+        messages: Rendered chat messages, or the input string for the Responses API
+
+    Returns:
+        small_model_name for requests within small_model_max_input_tokens, else model
+    """
+    from .prompt_registry import PromptRegistry
+
+    prompt = PromptRegistry.get(prompt_type)
+    if not prompt or not prompt.get('small_model_name') or model != prompt['model_name']:
+        return model
+    if estimate_messages_tokens(messages) <= prompt.get('small_model_max_input_tokens', 0):
+        return prompt['small_model_name']
+    return model
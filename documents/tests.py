@@ -0,0 +1,565 @@
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .models import (
+    AIPrompt, BackgroundJob, Defendant, Document, Evidence, IncidentOverview, VideoCapture,
+    VideoEvidence, VideoSpeaker, Witness, WizardSession,
+)
+from .services.artifact_store import FileSystemArtifactStore, content_hash
+from .services.court_lookup_service import extract_zip_code, location_zip_code
+from .services.document_generator import DocumentGenerator
+from .services.document_graph import DocumentGraph
+from .services.job_queue import JobQueue
+from .services.model_sync import sync_child_rows
+from .services.story_diff import affected_sections, changed_paragraphs
+from .services.token_budget import estimate_messages_tokens, estimate_tokens, fit_texts, trim_to_tokens
+
+
+def make_document(email='plaintiff@example.com'):
+    """A document with every section created."""
+    from .api.views import _ensure_sections_exist
+
+    user = get_user_model().objects.create_user(email=email, password='pw')
+    document = Document.objects.create(user=user, title='Test v. City')
+    _ensure_sections_exist(document)
+    return document
+
+
+class DocumentGraphQueryCountTests(TestCase):
+    """DocumentGraph.load must not grow with the number of child rows."""
+
+    def setUp(self):
+        self.document = make_document()
+        sections = {s.section_type: s for s in self.document.sections.all()}
+        IncidentOverview.objects.create(section=sections['incident_overview'], city='Tulsa', state='OK')
+
+        defendants = [
+            Defendant.objects.create(section=sections['defendants'], defendant_type='individual', name=f'Officer {i}')
+            for i in range(4)
+        ]
+        for i in range(3):
+            Witness.objects.create(section=sections['witnesses'], name=f'Witness {i}')
+        for i in range(2):
+            evidence = Evidence.objects.create(section=sections['evidence'], evidence_type='video', title=f'Clip {i}')
+            video = VideoEvidence.objects.create(
+                evidence=evidence, youtube_url=f'https://youtu.be/abc{i}', video_id=f'abc{i}'
+            )
+            for start in (0, 60, 120):
+                VideoCapture.objects.create(video_evidence=video, start_time_seconds=start, end_time_seconds=start + 30)
+            VideoSpeaker.objects.create(video_evidence=video, label='Speaker 1', defendant=defendants[i])
+
+    def test_load_query_count(self):
+        document = Document.objects.get(pk=self.document.pk)
+        with self.assertNumQueries(DocumentGraph.QUERY_COUNT):
+            graph = DocumentGraph.load(document)
+        self.assertEqual(len(graph.items['defendants']), 4)
+        self.assertEqual(len(graph.items['witnesses']), 3)
+        self.assertEqual(len(graph.items['evidence']), 2)
+
+    def test_collect_document_data_query_count(self):
+        from .views import _collect_document_data
+
+        document = Document.objects.select_related('user').get(pk=self.document.pk)
+        with self.assertNumQueries(DocumentGraph.QUERY_COUNT):
+            data = _collect_document_data(document)
+        self.assertEqual(len(data['defendants']), 4)
+
+
+class ArtifactResponseTests(SimpleTestCase):
+    """Stored PDFs are served whole or by byte range."""
+
+    CONTENT = bytes(range(256)) * 4
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.store = FileSystemArtifactStore(root)
+        digest = content_hash(self.CONTENT)
+        self.key = self.store.make_key(1, digest)
+        self.store.save(self.key, self.CONTENT)
+        self.etag = f'"{digest}"'
+
+    def get(self, **headers):
+        from .views import _artifact_response
+
+        request = RequestFactory().get('/documents/test/pdf/', headers=headers)
+        return _artifact_response(request, self.store, self.key, 'complaint.pdf')
+
+    def test_full_download(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_byte_range(self):
+        response = self.get(Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/1024')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[100:200])
+
+    def test_open_ended_and_suffix_ranges(self):
+        response = self.get(Range='bytes=1000-5000')
+        self.assertEqual(response['Content-Range'], 'bytes 1000-1023/1024')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[1000:])
+
+        response = self.get(Range='bytes=-24')
+        self.assertEqual(response['Content-Range'], 'bytes 1000-1023/1024')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-24:])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(Range='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range(self):
+        self.assertEqual(self.get(Range='bytes=0-9', **{'If-Range': self.etag}).status_code, 206)
+        # A resume against a different artifact gets the whole new file
+        response = self.get(Range='bytes=0-9', **{'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+
+    def test_malformed_range_serves_full_file(self):
+        self.assertEqual(self.get(Range='bytes=0-9,20-29').status_code, 200)
+        self.assertEqual(self.get(Range='bytes=-').status_code, 200)
+
+
+class TokenBudgetTests(SimpleTestCase):
+    LONG = ' '.join(f'word{i}' for i in range(3000))
+
+    def test_short_text_unchanged(self):
+        self.assertEqual(trim_to_tokens('a short story', 100), 'a short story')
+
+    def test_trim_keeps_head_and_tail(self):
+        trimmed = trim_to_tokens(self.LONG, 200)
+        self.assertTrue(trimmed.startswith('word0 '))
+        self.assertTrue(trimmed.endswith('word2999'))
+        self.assertIn('words omitted', trimmed)
+        self.assertLessEqual(estimate_tokens(trimmed), 200 * 1.1)
+
+    def test_tiny_budget_returns_empty(self):
+        self.assertEqual(trim_to_tokens(self.LONG, 5), '')
+
+    def test_fit_texts_trims_largest_first(self):
+        short = 'a brief witness statement'
+        fitted = fit_texts([short, self.LONG], 300)
+        self.assertEqual(fitted[0], short)
+        self.assertIn('words omitted', fitted[1])
+        self.assertLessEqual(sum(estimate_tokens(text) for text in fitted), 300 * 1.1)
+
+    def test_fit_texts_within_budget_untouched(self):
+        self.assertEqual(fit_texts(['one', 'two'], 100), ['one', 'two'])
+
+
+class StoryDiffTests(SimpleTestCase):
+    STORY = (
+        "On March 3 at about 2 pm I was filming the outside of city hall from the public sidewalk.\n\n"
+        "Officer Smith walked up and demanded my ID. I told him I was not required to give it.\n\n"
+        "He grabbed my phone and arrested me for obstruction. I spent six hours in jail.\n\n"
+        "I still have anxiety when I see a patrol car and I missed two days of work."
+    )
+
+    def test_no_baseline_parses_everything(self):
+        self.assertIsNone(affected_sections('', self.STORY))
+
+    def test_whitespace_only_edit_changes_nothing(self):
+        self.assertEqual(affected_sections(self.STORY, self.STORY.replace('. ', '.  ')), set())
+
+    def test_new_witness_paragraph(self):
+        edited = self.STORY + "\n\nMy neighbor Dana saw the whole thing from across the street."
+        self.assertEqual(changed_paragraphs(self.STORY, edited), [
+            "My neighbor Dana saw the whole thing from across the street.",
+        ])
+        sections = affected_sections(self.STORY, edited)
+        self.assertIn('witnesses', sections)
+        self.assertNotIn('defendants', sections)
+        self.assertNotIn('damages', sections)
+
+    def test_rewrite_parses_everything(self):
+        self.assertIsNone(affected_sections(self.STORY, "Something else entirely happened to me."))
+
+
+class SyncChildRowsTests(TestCase):
+    def setUp(self):
+        self.section = make_document().sections.get(section_type='defendants')
+        self.officer = Defendant.objects.create(
+            section=self.section, defendant_type='individual', name='Officer Smith', badge_number='123'
+        )
+
+    def test_matches_case_insensitively_and_creates_new(self):
+        desired = [
+            {'section': self.section, 'defendant_type': 'individual', 'name': ' officer smith ',
+             'badge_number': '', 'title_rank': 'Sergeant'},
+            {'section': self.section, 'defendant_type': 'agency', 'name': 'Tulsa Police Department'},
+            {'section': self.section, 'defendant_type': 'agency', 'name': 'TULSA POLICE DEPARTMENT'},
+        ]
+        created, updated = sync_child_rows(
+            Defendant, self.section.defendants.all(), desired, key_fields=('name', 'defendant_type')
+        )
+        self.assertEqual((created, updated), (1, 1))
+        self.officer.refresh_from_db()
+        self.assertEqual(self.officer.title_rank, 'Sergeant')
+        self.assertEqual(self.officer.badge_number, '123')  # Blank answers never wipe data
+        self.assertEqual(self.section.defendants.count(), 2)
+
+    def test_reapply_writes_nothing(self):
+        desired = [{'section': self.section, 'defendant_type': 'individual', 'name': 'Officer Smith'}]
+        existing = list(self.section.defendants.all())
+        with self.assertNumQueries(0):
+            result = sync_child_rows(Defendant, existing, desired, key_fields=('name', 'defendant_type'))
+        self.assertEqual(result, (0, 0))
+
+
+class SectionCounterTests(TestCase):
+    """Document.sections_done / sections_total follow section writes."""
+
+    def setUp(self):
+        self.document = make_document()
+        self.total = self.document.sections.count()
+        self.section = self.document.sections.get(section_type='witnesses')
+
+    def counters(self):
+        self.document.refresh_from_db(fields=['sections_done', 'sections_total'])
+        return self.document.sections_done, self.document.sections_total
+
+    def test_new_document_counts_every_section(self):
+        self.assertEqual(self.counters(), (0, self.total))
+
+    def test_status_changes_move_done(self):
+        self.section.status = 'completed'
+        self.section.save()
+        self.assertEqual(self.counters(), (1, self.total))
+
+        self.section.status = 'not_applicable'
+        self.section.save()
+        self.assertEqual(self.counters(), (1, self.total))
+
+        self.section.status = 'needs_work'
+        self.section.save(update_fields=['status'])
+        self.assertEqual(self.counters(), (0, self.total))
+        self.assertEqual(self.document.get_completion_percentage(), 0)
+
+    def test_saves_without_a_status_change_skip_the_update(self):
+        with self.assertNumQueries(1):
+            self.section.save()
+        self.section.notes = 'Add the neighbor'
+        with self.assertNumQueries(1):
+            self.section.save(update_fields=['notes'])
+
+    def test_delete_and_percentage(self):
+        self.section.status = 'completed'
+        self.section.save()
+        other = self.document.sections.exclude(pk=self.section.pk).first()
+        other.delete()
+        self.assertEqual(self.counters(), (1, self.total - 1))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.document.get_completion_percentage(), int(100 / (self.total - 1)))
+
+        self.section.delete()
+        self.assertEqual(self.counters(), (0, self.total - 2))
+
+    def test_repair_section_counts(self):
+        Document.objects.filter(pk=self.document.pk).update(sections_done=5, sections_total=1)
+
+        out = StringIO()
+        call_command('repair_section_counts', '--dry-run', stdout=out)
+        self.assertIn('Would repair 1 of 1', out.getvalue())
+        self.assertEqual(self.counters(), (5, 1))
+
+        call_command('repair_section_counts', stdout=StringIO())
+        self.assertEqual(self.counters(), (0, self.total))
+
+
+class WizardStepDataTests(TestCase):
+    def setUp(self):
+        self.session = WizardSession.objects.create(document=make_document())
+
+    def test_patch_merges_changed_keys(self):
+        self.session.set_step_data(1, {'city': 'Tulsa', 'state': 'OK', 'incident_date': '2024-03-05'})
+        revision = self.session.revision
+
+        new_revision = self.session.patch_step_data(1, {'city': 'Norman'}, expected_revision=revision)
+
+        self.assertEqual(new_revision, revision + 1)
+        self.assertEqual(self.session.get_step_data(1), {'city': 'Norman', 'state': 'OK', 'incident_date': '2024-03-05'})
+        self.assertEqual(self.session.current_step, 2)
+        self.assertEqual(self.session.status, 'in_progress')
+
+    def test_patch_creates_missing_step(self):
+        self.session.patch_step_data(5, {'lost_wages': '100'})
+        self.assertEqual(self.session.interview_data, {'step_5': {'lost_wages': '100'}})
+        self.assertEqual(self.session.current_step, 6)
+
+    def test_stale_revision_writes_nothing(self):
+        self.session.set_step_data(2, {'defendants': [{'name': 'Officer Smith'}]})
+        stale = self.session.revision - 1
+
+        self.assertIsNone(self.session.patch_step_data(2, {'defendants': []}, expected_revision=stale))
+        self.assertEqual(self.session.get_step_data(2), {'defendants': [{'name': 'Officer Smith'}]})
+
+    def test_current_step_never_moves_back(self):
+        self.session.patch_step_data(4, {'selections': ['excessive_force']})
+        self.session.patch_step_data(1, {'city': 'Tulsa'})
+        self.assertEqual(self.session.current_step, 5)
+
+    def test_step_one_fills_typed_columns(self):
+        self.session.set_step_data(1, {'city': 'Tulsa', 'state': 'OK', 'incident_date': '2024-03-05'})
+        self.session.patch_step_data(1, {'city': 'Norman', 'incident_time': 'not a time'})
+
+        step = self.session.steps.get(step_number=1)
+        self.assertEqual((step.city, step.state, str(step.incident_date)), ('Norman', 'OK', '2024-03-05'))
+        self.assertIsNone(step.incident_time)
+        self.assertEqual(WizardSession.objects.get(pk=self.session.pk).get_step_data(1)['city'], 'Norman')
+
+
+class JobQueueEnqueueTests(TestCase):
+    PAYLOAD = {'document_id': 1, 'story_text': 'first draft'}
+    EDITED = {'document_id': 1, 'story_text': 'edited draft'}
+
+    def test_same_reference_is_deduplicated(self):
+        job = JobQueue.enqueue('process_story', self.PAYLOAD, reference='document:1')
+        again = JobQueue.enqueue('process_story', self.EDITED, reference='document:1')
+        self.assertEqual(again.pk, job.pk)
+        self.assertEqual(again.payload, self.PAYLOAD)
+
+    def test_queued_job_takes_the_new_payload(self):
+        job = JobQueue.enqueue('process_story', self.PAYLOAD, reference='document:1')
+        BackgroundJob.objects.filter(pk=job.pk).update(attempts=2, last_error='timeout')
+
+        again = JobQueue.enqueue('process_story', self.EDITED, reference='document:1', replace_payload=True)
+        self.assertEqual(again.pk, job.pk)
+        self.assertEqual((again.payload, again.attempts, again.last_error), (self.EDITED, 0, ''))
+
+    def test_running_job_gets_a_follow_up(self):
+        job = JobQueue.enqueue('process_story', self.PAYLOAD, reference='document:1')
+        BackgroundJob.objects.filter(pk=job.pk).update(status='running')
+
+        follow_up = JobQueue.enqueue('process_story', self.EDITED, reference='document:1', replace_payload=True)
+        self.assertNotEqual(follow_up.pk, job.pk)
+        self.assertEqual((follow_up.status, follow_up.payload), ('queued', self.EDITED))
+        self.assertEqual(JobQueue.find_active('process_story', 'document:1'), follow_up)
+
+
+failure_hook_calls = []
+
+
+def succeeding_job(**payload):
+    pass
+
+
+def record_job_failure(error, **payload):
+    failure_hook_calls.append(error)
+
+
+@mock.patch.dict(JobQueue.JOB_HANDLERS, {'test_job': {
+    'handler': 'documents.tests.succeeding_job',
+    'on_failure': 'documents.tests.record_job_failure',
+}})
+class JobQueueLeaseTests(TestCase):
+    """Outcomes are only written while the worker's claim still holds the job."""
+
+    def setUp(self):
+        failure_hook_calls.clear()
+
+    def claim(self, max_attempts=3):
+        JobQueue.enqueue('test_job', {'document_id': 1}, max_attempts=max_attempts)
+        return JobQueue.claim_next('host:1:0')
+
+    def expire(self, job):
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+    def test_claimed_job_completes(self):
+        job = self.claim()
+        JobQueue.run(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ('completed', ''))
+
+    def test_completion_after_recovery_is_dropped(self):
+        job = self.claim()
+        self.expire(job)
+        self.assertEqual(JobQueue.recover_stuck_jobs(), 1)
+
+        JobQueue.run(job)  # The original worker finishes late
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+
+    def test_on_failure_runs_once(self):
+        job = self.claim(max_attempts=1)
+        self.expire(job)
+        stale = BackgroundJob.objects.get(pk=job.pk)
+
+        self.assertEqual(JobQueue.recover_stuck_jobs(), 1)
+        self.assertEqual(JobQueue.recover_stuck_jobs(), 0)
+        self.assertFalse(JobQueue._mark_failed(stale, 'Visibility timeout expired', final=True))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(len(failure_hook_calls), 1)
+
+
+class ZipCodeTests(SimpleTestCase):
+    def test_extract_zip_code(self):
+        self.assertEqual(extract_zip_code('10001 Elm Ave, Houston, TX 77002'), '77002')
+        self.assertEqual(extract_zip_code('Main St and 5th, Tulsa 74103-1234'), '74103')
+        self.assertIsNone(extract_zip_code('12345 Main Street, Tulsa'))
+        self.assertIsNone(extract_zip_code(''))
+
+    def test_plaintiff_zip_only_for_the_same_city(self):
+        plaintiff = {'city': 'Tulsa', 'state': 'Oklahoma', 'zip_code': '74103'}
+        self.assertEqual(location_zip_code('Main St and 5th', 'tulsa', 'OK', plaintiff), '74103')
+        self.assertIsNone(location_zip_code('Main St and 5th', 'Norman', 'OK', plaintiff))
+        self.assertEqual(location_zip_code('Main St, Norman, OK 73069', 'Norman', 'OK', plaintiff), '73069')
+
+
+class DocumentSaveTests(TestCase):
+    def test_full_save_keeps_concurrent_counter_updates(self):
+        document = make_document()
+        stale = Document.objects.get(pk=document.pk)
+
+        Document.objects.filter(pk=document.pk).update(ai_cost_used=F('ai_cost_used') + Decimal('0.25'))
+        section = document.sections.get(section_type='witnesses')
+        section.status = 'completed'
+        section.save()
+
+        stale.title = 'Renamed v. City'
+        stale.save()
+
+        document.refresh_from_db()
+        self.assertEqual(document.title, 'Renamed v. City')
+        self.assertEqual(document.ai_cost_used, Decimal('0.25'))
+        self.assertEqual(document.sections_done, 1)
+
+
+class RecordingChatClient:
+    """Stands in for the OpenAI client; records each chat.completions.create call."""
+
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=' STATEMENT OF FACTS '))])
+
+
+class DocumentGeneratorBudgetTests(TestCase):
+    """Complaint sections use the same input budgets and model routing as other AI calls."""
+
+    LONG = ' '.join(f'word{i}' for i in range(3000))
+
+    def setUp(self):
+        AIPrompt.objects.create(
+            prompt_type='generate_facts', title='Facts', description='Statement of facts',
+            system_message='Write the facts.', user_prompt_template='{detailed_narrative}{video_section}',
+            model_name='gpt-4o', max_input_tokens=1000,
+            small_model_name='gpt-4o-mini', small_model_max_input_tokens=200,
+        )
+        self.generator = DocumentGenerator()
+        self.generator.client = RecordingChatClient()
+
+    def test_small_request_uses_the_small_model(self):
+        self.generator._write_facts({'narrative': {'detailed_narrative': 'Officer Smith took my phone.'}})
+        self.assertEqual(self.generator.client.calls[0]['model'], 'gpt-4o-mini')
+
+    def test_long_facts_inputs_fit_the_budget(self):
+        self.generator._write_facts({
+            'narrative': {'detailed_narrative': self.LONG},
+            'video_transcripts': [{'video_title': 'Bodycam', 'transcript': self.LONG}],
+        })
+        call = self.generator.client.calls[0]
+        self.assertEqual(call['model'], 'gpt-4o')
+        self.assertIn('words omitted', call['messages'][1]['content'])
+        self.assertLessEqual(estimate_messages_tokens(call['messages']), 1000 * 1.1 + 50)
+
+    @override_settings(AI_INPUT_TOKEN_BUDGET=500)
+    def test_cause_inputs_fit_the_default_budget(self):
+        self.generator._write_cause(
+            cause_num=1, amendment='First', violation_type='Retaliation', plaintiff_name='Jane Doe',
+            defendant_names=['Officer Smith'], narrative={'detailed_narrative': self.LONG},
+            case_law=[], details=self.LONG,
+        )
+        prompt = self.generator.client.calls[0]['messages'][1]['content']
+        self.assertEqual(prompt.count('words omitted'), 2)
+        self.assertLess(estimate_tokens(prompt), 500 + 1000)  # Budget plus the fixed instructions
+
+
+class StreamingChatClient(RecordingChatClient):
+    """RecordingChatClient whose streamed responses track how far they were read."""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.stream()
+
+    def stream(self):
+        try:
+            for text in self.chunks:
+                self.read += 1
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        finally:
+            self.closed = True
+
+
+class DocumentGeneratorDeadlineTests(TestCase):
+    """AI section calls stop at the complaint deadline instead of running on in the background."""
+
+    MESSAGES = [{'role': 'user', 'content': 'Write the facts.'}]
+
+    def setUp(self):
+        self.generator = DocumentGenerator()
+        self.generator.client = RecordingChatClient()
+
+    def complete(self, **kwargs):
+        return self.generator._complete('generate_facts', 'gpt-4o', self.MESSAGES, 0.3, 100, **kwargs)
+
+    @override_settings(DOCUMENT_SECTION_TIMEOUT=60)
+    def test_request_timeout_is_capped_at_the_time_left(self):
+        self.complete(deadline=time.monotonic() + 5)
+        self.assertLessEqual(self.generator.client.calls[0]['timeout'], 5)
+
+        self.complete()
+        self.assertEqual(self.generator.client.calls[1]['timeout'], 60)
+
+    def test_no_call_once_the_deadline_passed_or_cancel_is_set(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(TimeoutError):
+            self.complete(deadline=time.monotonic() - 1)
+        with self.assertRaises(TimeoutError):
+            self.complete(cancel=cancel)
+        self.assertEqual(self.generator.client.calls, [])
+
+    def test_stream_stops_when_cancel_is_set(self):
+        client = self.generator.client = StreamingChatClient(['One. ', 'Two. ', 'Three.'])
+        cancel = threading.Event()
+        deltas = []
+
+        def on_delta(text):
+            deltas.append(text)
+            cancel.set()
+
+        with self.assertRaises(TimeoutError):
+            self.complete(on_delta=on_delta, cancel=cancel)
+        self.assertEqual(deltas, ['One. '])
+        self.assertEqual(client.read, 2)
+        self.assertTrue(client.closed)
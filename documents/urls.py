@@ -7,6 +7,9 @@ urlpatterns = [
     # District court lookup (must be before <str:document_slug> catch-all)
     path('lookup-district-court/', views.lookup_district_court, name='lookup_district_court'),
 
+    # Background job progress events (server-sent events; must also be before the catch-all)
+    path('events/', views.job_events, name='job_events'),
+
     # Document CRUD
     path('', views.document_list, name='document_list'),
     path('new/', views.document_create, name='document_create'),
@@ -23,6 +26,7 @@ urlpatterns = [
     path('<str:document_slug>/final/save-section/', views.save_final_section, name='save_final_section'),
     path('<str:document_slug>/final/ai-review/', views.ai_review_final, name='ai_review_final'),
     path('<str:document_slug>/final/regenerate-section/', views.regenerate_final_section, name='regenerate_final_section'),
+    path('<str:document_slug>/final/stream/', views.stream_final_document, name='stream_final_document'),
     path('<str:document_slug>/final/download-pdf/', views.download_final_pdf, name='download_final_pdf'),
     path('<str:document_slug>/generate-pdf/', views.start_pdf_generation, name='start_pdf_generation'),
     path('<str:document_slug>/generate-pdf/status/', views.pdf_generation_status, name='pdf_generation_status'),
@@ -94,6 +98,9 @@ urlpatterns = [
     path('admin/referrals/usage/<int:usage_id>/mark-paid/', views.admin_mark_usage_paid, name='admin_mark_usage_paid'),
     path('admin/referrals/code/<int:code_id>/edit/', views.admin_edit_promo_code, name='admin_edit_promo_code'),
 
+    # Admin AI usage dashboard
+    path('admin/ai-usage/', views.admin_ai_usage, name='admin_ai_usage'),
+
     # Video Analysis (YouTube transcript extraction - subscribers only)
     path('<str:document_slug>/video-analysis/', views.video_analysis, name='video_analysis'),
     path('<str:document_slug>/video-analysis/add-video/', views.video_add, name='video_add'),
@@ -11,7 +11,7 @@ from django.urls import reverse
 from decimal import Decimal, InvalidOperation
 import stripe
 import json
-import threading
+import functools
 from .help_content import get_section_help
 from django.core.mail import send_mail
 from django.contrib.admin.views.decorators import staff_member_required
@@ -23,6 +23,8 @@ from .models import (
     VideoEvidence, VideoCapture, VideoSpeaker,
     WizardSession,
 )
+from .services.event_bus import publish as publish_event
+from .services.job_queue import JobQueue
 
 # Initialize Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -190,7 +192,11 @@ SECTION_CONFIG = {
 @login_required
 def document_list(request):
     """List all documents for the current user."""
-    documents = Document.objects.filter(user=request.user)
+    from django.db.models import Exists, OuterRef
+    # Progress comes from the counter fields; the needs-work flag is annotated so rows cost no queries
+    documents = Document.objects.filter(user=request.user).annotate(
+        needs_work=Exists(DocumentSection.objects.filter(document=OuterRef('pk'), status='needs_work'))
+    )
     return render(request, 'documents/document_list.html', {'documents': documents})
 
 
@@ -272,8 +278,8 @@ def document_detail(request, document_slug):
     """Wizard-centric document hub — shows wizard progress, case summary, and edit links."""
     document = get_object_or_404(Document, slug=document_slug, user=request.user)
 
-    # Get wizard session
-    session = getattr(document, 'wizard_session', None)
+    # Get wizard session (progress only - step data is read below, the AI payloads aren't needed)
+    session = WizardSession.objects.filter(document=document).only('id', 'status', 'current_step').first()
     wizard_status = session.status if session else 'not_started'
     wizard_current_step = session.current_step if session else 1
     wizard_progress = session.progress_percent if session else 0
@@ -294,10 +300,23 @@ def document_detail(request, document_slug):
         {'number': 7, 'title': 'Preferences', 'description': 'Case law and complaint options', 'icon': 'bi-gear'},
     ]
 
+    # Saved steps, reading only the typed columns and the JSON keys the hub shows
+    saved_steps = {}
+    if session:
+        from django.db.models.fields.json import KeyTextTransform, KeyTransform
+        for row in session.steps.exclude(data={}).values(
+            'step_number', 'incident_date', 'incident_time', 'city', 'state',
+            defendants=KeyTransform('defendants', 'data'),
+            selections=KeyTransform('selections', 'data'),
+            federal_district_court=KeyTextTransform('federal_district_court', 'data'),
+            court_district_confirmed=KeyTransform('court_district_confirmed', 'data'),
+        ):
+            saved_steps[row['step_number']] = row
+
     wizard_steps = []
     for meta in step_meta:
         step_num = meta['number']
-        step_data = session.get_step_data(step_num) if session else {}
+        step_data = saved_steps.get(step_num, {})
         has_data = bool(step_data)
 
         if wizard_status == 'completed' or wizard_status == 'analyzed':
@@ -323,14 +342,14 @@ def document_detail(request, document_slug):
                     parts.append(city_state)
                 summary = ' — '.join(parts)
             elif step_num == 2:
-                defendants = step_data.get('defendants', [])
+                defendants = step_data.get('defendants') or []
                 names = [d.get('name', '') for d in defendants if d.get('name')]
                 if names:
                     summary = ', '.join(names[:3])
                     if len(names) > 3:
                         summary += f' +{len(names) - 3} more'
             elif step_num == 4:
-                selections = step_data.get('selections', [])
+                selections = step_data.get('selections') or []
                 if selections:
                     summary = f'{len(selections)} violation{"s" if len(selections) != 1 else ""} selected'
 
@@ -340,45 +359,43 @@ def document_detail(request, document_slug):
             'summary': summary,
         })
 
-    # Build case summary from interview data
+    # Build case summary from the saved steps
     case_summary = {}
-    if session and session.interview_data:
-        interview = session.interview_data
-
-        # Step 1 data
-        step_1 = interview.get('step_1', {})
-        if step_1:
-            case_summary['incident_date'] = step_1.get('incident_date', '')
-            case_summary['incident_time'] = step_1.get('incident_time', '')
-            case_summary['city'] = step_1.get('city', '')
-            case_summary['state'] = step_1.get('state', '')
-            case_summary['federal_district_court'] = step_1.get('federal_district_court', '')
-            case_summary['court_district_confirmed'] = step_1.get('court_district_confirmed', False)
-
-        # Step 2 data — defendant names
-        step_2 = interview.get('step_2', {})
-        if step_2:
-            defendants = step_2.get('defendants', [])
-            case_summary['defendants'] = [d.get('name', 'Unknown') for d in defendants if d.get('name')]
-
-        # Step 4 data — violation labels
-        step_4 = interview.get('step_4', {})
-        if step_4:
-            violation_map = {
-                'searched_without_warrant': 'Unreasonable Search',
-                'arrested_no_cause': 'False Arrest',
-                'excessive_force': 'Excessive Force',
-                'punished_for_speech': 'Free Speech',
-                'punished_for_recording': 'Right to Record',
-                'racial_discrimination': 'Racial Discrimination',
-                'gender_discrimination': 'Gender Discrimination',
-                'forced_statements': 'Coerced Statements',
-                'denied_medical_care': 'Denied Medical Care',
-                'denied_due_process': 'Due Process',
-                'retaliation': 'Retaliation',
-            }
-            selections = step_4.get('selections', [])
-            case_summary['violations'] = [violation_map.get(s, s) for s in selections]
+
+    # Step 1 data
+    step_1 = saved_steps.get(1)
+    if step_1:
+        case_summary['incident_date'] = str(step_1['incident_date'] or '')
+        case_summary['incident_time'] = str(step_1['incident_time'] or '')
+        case_summary['city'] = step_1['city']
+        case_summary['state'] = step_1['state']
+        case_summary['federal_district_court'] = step_1['federal_district_court'] or ''
+        case_summary['court_district_confirmed'] = bool(step_1['court_district_confirmed'])
+
+    # Step 2 data — defendant names
+    step_2 = saved_steps.get(2)
+    if step_2:
+        defendants = step_2['defendants'] or []
+        case_summary['defendants'] = [d.get('name', 'Unknown') for d in defendants if d.get('name')]
+
+    # Step 4 data — violation labels
+    step_4 = saved_steps.get(4)
+    if step_4:
+        violation_map = {
+            'searched_without_warrant': 'Unreasonable Search',
+            'arrested_no_cause': 'False Arrest',
+            'excessive_force': 'Excessive Force',
+            'punished_for_speech': 'Free Speech',
+            'punished_for_recording': 'Right to Record',
+            'racial_discrimination': 'Racial Discrimination',
+            'gender_discrimination': 'Gender Discrimination',
+            'forced_statements': 'Coerced Statements',
+            'denied_medical_care': 'Denied Medical Care',
+            'denied_due_process': 'Due Process',
+            'retaliation': 'Retaliation',
+        }
+        selections = step_4['selections'] or []
+        case_summary['violations'] = [violation_map.get(s, s) for s in selections]
 
     return render(request, 'documents/document_detail.html', {
         'document': document,
@@ -900,13 +917,15 @@ def document_review(request, document_slug):
         messages.info(request, 'This document has been finalized. You can view or download the PDF.')
         return redirect('documents:document_preview', document_slug=document.slug)
 
-    # Collect all document data from the database
-    document_data = _collect_document_data(document)
+    # Load the whole section tree once and share it
+    from .services.document_graph import DocumentGraph
+    graph = DocumentGraph.load(document)
+    document_data = _collect_document_data(document, graph=graph)
 
     # Load section data with forms for editing (in SECTION_TYPES order)
     sections_data = {}
     section_type_order = [choice[0] for choice in DocumentSection.SECTION_TYPES]
-    ordered_sections = sorted(document.sections.all(), key=lambda s: section_type_order.index(s.section_type) if s.section_type in section_type_order else 999)
+    ordered_sections = sorted(graph.sections.values(), key=lambda s: section_type_order.index(s.section_type) if s.section_type in section_type_order else 999)
     for section in ordered_sections:
         config = SECTION_CONFIG.get(section.section_type, {})
         Model = config.get('model')
@@ -915,7 +934,7 @@ def document_review(request, document_slug):
 
         if Model and Form:
             if is_multiple:
-                items = list(Model.objects.filter(section=section))
+                items = list(graph.items.get(section.section_type, ()))
                 form = Form()  # Empty form for adding new items
                 sections_data[section.section_type] = {
                     'section': section,
@@ -925,12 +944,8 @@ def document_review(request, document_slug):
                     'is_multiple': True,
                 }
             else:
-                try:
-                    instance = Model.objects.get(section=section)
-                    form = Form(instance=instance)
-                except Model.DoesNotExist:
-                    instance = None
-                    form = Form()
+                instance = graph.get(section.section_type)
+                form = Form(instance=instance) if instance else Form()
 
                 sections_data[section.section_type] = {
                     'section': section,
@@ -950,235 +965,16 @@ def document_review(request, document_slug):
     return render(request, 'documents/document_review.html', context)
 
 
-def _collect_document_data(document):
-    """Collect all document data for the generator."""
-    data = {
-        'has_minimum_data': False,
-        'plaintiff': {},
-        'defendants': [],
-        'incident': {},
-        'narrative': {},
-        'rights_violated': {},
-        'damages': {},
-        'relief': {},
-        'court': '',
-    }
-
-    # Plaintiff info
-    try:
-        plaintiff_section = document.sections.get(section_type='plaintiff_info')
-        pi = plaintiff_section.plaintiff_info
-        data['plaintiff'] = {
-            'first_name': pi.first_name,
-            'middle_name': pi.middle_name,
-            'last_name': pi.last_name,
-            'street_address': pi.street_address,
-            'city': pi.city,
-            'state': pi.state,
-            'zip_code': pi.zip_code,
-            'phone': pi.phone,
-            'email': pi.email,
-            'is_pro_se': pi.is_pro_se,
-            'attorney_name': pi.attorney_name,
-            'attorney_bar_number': pi.attorney_bar_number,
-            'attorney_firm_name': pi.attorney_firm_name,
-            'attorney_street_address': pi.attorney_street_address,
-            'attorney_city': pi.attorney_city,
-            'attorney_state': pi.attorney_state,
-            'attorney_zip_code': pi.attorney_zip_code,
-            'attorney_phone': pi.attorney_phone,
-            'attorney_email': pi.attorney_email,
-        }
-    except (DocumentSection.DoesNotExist, PlaintiffInfo.DoesNotExist):
-        pass
-
-    # Defendants
-    try:
-        defendants_section = document.sections.get(section_type='defendants')
-        for d in Defendant.objects.filter(section=defendants_section):
-            data['defendants'].append({
-                'name': d.name,
-                'defendant_type': d.defendant_type,
-                'badge_number': d.badge_number,
-                'title_rank': d.title_rank,
-                'agency_name': d.agency_name,
-                'address': d.address,
-                'description': d.description,
-            })
-    except DocumentSection.DoesNotExist:
-        pass
-
-    # Incident overview
-    try:
-        incident_section = document.sections.get(section_type='incident_overview')
-        io = incident_section.incident_overview
-        data['incident'] = {
-            'incident_date': str(io.incident_date) if io.incident_date else '',
-            'incident_time': io.incident_time,  # Keep as time object for template filter
-            'incident_location': io.incident_location,
-            'city': io.city,
-            'state': io.state,
-            'location_type': io.location_type,
-            'was_recording': io.was_recording,
-            'recording_device': io.recording_device,
-        }
-        data['court'] = io.federal_district_court or ''
-
-        # Parse court name to extract district (e.g., "Northern" from "United States District Court for the Northern District of Iowa")
-        if io.federal_district_court:
-            import re
-            match = re.search(r'for the (\w+) District of (\w+)', io.federal_district_court, re.IGNORECASE)
-            if match:
-                data['district'] = match.group(1).upper()
-                data['state_name'] = match.group(2).upper()
-    except (DocumentSection.DoesNotExist, IncidentOverview.DoesNotExist):
-        pass
-
-    # Incident narrative
-    try:
-        narrative_section = document.sections.get(section_type='incident_narrative')
-        n = narrative_section.incident_narrative
-        data['narrative'] = {
-            'summary': n.summary,
-            'detailed_narrative': n.detailed_narrative,
-            'what_were_you_doing': n.what_were_you_doing,
-            'initial_contact': n.initial_contact,
-            'what_was_said': n.what_was_said,
-            'physical_actions': n.physical_actions,
-            'how_it_ended': n.how_it_ended,
-        }
-    except (DocumentSection.DoesNotExist, IncidentNarrative.DoesNotExist):
-        pass
-
-    # Rights violated
-    try:
-        rights_section = document.sections.get(section_type='rights_violated')
-        rv = rights_section.rights_violated
-        data['rights_violated'] = {
-            'first_amendment': rv.first_amendment,
-            'first_amendment_speech': rv.first_amendment_speech,
-            'first_amendment_press': rv.first_amendment_press,
-            'first_amendment_assembly': rv.first_amendment_assembly,
-            'first_amendment_petition': rv.first_amendment_petition,
-            'first_amendment_details': rv.first_amendment_details,
-            'fourth_amendment': rv.fourth_amendment,
-            'fourth_amendment_search': rv.fourth_amendment_search,
-            'fourth_amendment_seizure': rv.fourth_amendment_seizure,
-            'fourth_amendment_arrest': rv.fourth_amendment_arrest,
-            'fourth_amendment_force': rv.fourth_amendment_force,
-            'fourth_amendment_details': rv.fourth_amendment_details,
-            'fifth_amendment': rv.fifth_amendment,
-            'fifth_amendment_self_incrimination': rv.fifth_amendment_self_incrimination,
-            'fifth_amendment_due_process': rv.fifth_amendment_due_process,
-            'fifth_amendment_details': rv.fifth_amendment_details,
-            'fourteenth_amendment': rv.fourteenth_amendment,
-            'fourteenth_amendment_due_process': rv.fourteenth_amendment_due_process,
-            'fourteenth_amendment_equal_protection': rv.fourteenth_amendment_equal_protection,
-            'fourteenth_amendment_details': rv.fourteenth_amendment_details,
-        }
-    except (DocumentSection.DoesNotExist, RightsViolated.DoesNotExist):
-        pass
-
-    # Damages
-    try:
-        damages_section = document.sections.get(section_type='damages')
-        d = damages_section.damages
-        data['damages'] = {
-            'physical_injury': d.physical_injury,
-            'physical_injury_description': d.physical_injury_description,
-            'emotional_distress': d.emotional_distress,
-            'emotional_distress_description': d.emotional_distress_description,
-            'property_damage': d.property_damage,
-            'property_damage_description': d.property_damage_description,
-            'lost_wages': d.lost_wages,
-            'lost_wages_amount': float(d.lost_wages_amount) if d.lost_wages_amount else 0,
-            'medical_expenses': float(d.medical_expenses) if d.medical_expenses else 0,
-        }
-    except (DocumentSection.DoesNotExist, Damages.DoesNotExist):
-        pass
-
-    # Relief sought
-    try:
-        relief_section = document.sections.get(section_type='relief_sought')
-        rs = relief_section.relief_sought
-        data['relief'] = {
-            'compensatory_damages': rs.compensatory_damages,
-            'compensatory_amount': float(rs.compensatory_amount) if rs.compensatory_amount else None,
-            'punitive_damages': rs.punitive_damages,
-            'punitive_amount': float(rs.punitive_amount) if rs.punitive_amount else None,
-            'attorney_fees': rs.attorney_fees,
-            'injunctive_relief': rs.injunctive_relief,
-            'injunctive_description': rs.injunctive_description,
-            'declaratory_relief': rs.declaratory_relief,
-            'declaratory_description': rs.declaratory_description,
-            'jury_trial_demanded': rs.jury_trial_demanded,
-        }
-    except (DocumentSection.DoesNotExist, ReliefSought.DoesNotExist):
-        pass
-
-    # Witnesses (with enhanced fields for evidence capture)
-    data['witnesses'] = []
-    try:
-        witnesses_section = document.sections.get(section_type='witnesses')
-        for w in Witness.objects.filter(section=witnesses_section):
-            data['witnesses'].append({
-                'name': w.name,
-                'contact_info': w.contact_info,
-                'relationship': w.relationship,
-                'what_they_witnessed': w.what_they_witnessed,
-                'willing_to_testify': w.willing_to_testify,
-                'has_evidence': w.has_evidence,
-                'evidence_description': w.evidence_description,
-                'prior_interactions': w.prior_interactions,
-                'additional_notes': w.additional_notes,
-            })
-    except DocumentSection.DoesNotExist:
-        pass
-
-    # Video Evidence (YouTube transcript extractions)
-    data['video_transcripts'] = []
-    try:
-        evidence_section = document.sections.get(section_type='evidence')
-        for evidence in evidence_section.evidence_items.filter(evidence_type='video'):
-            try:
-                video_evidence = evidence.video_evidence
-                for capture in video_evidence.captures.filter(extraction_status='completed'):
-                    # Build speaker mapping for this capture
-                    speaker_map = {}
-                    for speaker in video_evidence.speakers.all():
-                        if speaker.defendant:
-                            speaker_map[speaker.label] = speaker.defendant.name
-                        elif speaker.is_plaintiff:
-                            speaker_map[speaker.label] = "Plaintiff"
-                        else:
-                            speaker_map[speaker.label] = speaker.label
-
-                    data['video_transcripts'].append({
-                        'video_title': video_evidence.video_title,
-                        'video_url': video_evidence.youtube_url,
-                        'start_time': capture.start_time_display,
-                        'end_time': capture.end_time_display,
-                        'transcript': capture.attributed_transcript or capture.raw_transcript,
-                        'speakers': speaker_map,
-                    })
-            except VideoEvidence.DoesNotExist:
-                pass
-    except DocumentSection.DoesNotExist:
-        pass
-
-    # Check if we have minimum data to generate
-    has_plaintiff = bool(data['plaintiff'].get('first_name') and data['plaintiff'].get('last_name'))
-    has_narrative = bool(data['narrative'].get('detailed_narrative') or document.story_text)
-    has_rights = any([
-        data['rights_violated'].get('first_amendment'),
-        data['rights_violated'].get('fourth_amendment'),
-        data['rights_violated'].get('fifth_amendment'),
-        data['rights_violated'].get('fourteenth_amendment'),
-    ])
-
-    data['has_minimum_data'] = has_plaintiff and has_narrative and has_rights
+def _collect_document_data(document, graph=None):
+    """
+    Collect all document data for the generator.
+    Pass a DocumentGraph to reuse one already loaded for the request.
+    """
+    from .services.document_graph import DocumentGraph
 
-    return data
+    if graph is None:
+        graph = DocumentGraph.load(document)
+    return graph.as_generator_data()
 
 
 def _generate_rendered_document_text(document_data):
@@ -1449,24 +1245,30 @@ def _update_section_relevance(document, extracted_data):
         damages.get('other_damages')
     )
 
-    # Update each section
+    # Update each section, writing only the ones whose relevance changed in one query
+    changed_sections = []
     for section in document.sections.all():
         if section.section_type in always_relevant:
-            section.story_relevance = 'relevant'
+            relevance = 'relevant'
         elif section.section_type == 'witnesses':
-            section.story_relevance = 'relevant' if has_witnesses else 'may_not_apply'
+            relevance = 'relevant' if has_witnesses else 'may_not_apply'
         elif section.section_type == 'evidence':
-            section.story_relevance = 'relevant' if has_evidence else 'may_not_apply'
+            relevance = 'relevant' if has_evidence else 'may_not_apply'
         elif section.section_type == 'damages':
             # Damages usually apply even if not mentioned - people often have at least emotional distress
-            section.story_relevance = 'relevant' if has_damages else 'may_not_apply'
+            relevance = 'relevant' if has_damages else 'may_not_apply'
         elif section.section_type == 'prior_complaints':
             # Prior complaints are rarely mentioned in stories
-            section.story_relevance = 'may_not_apply'
+            relevance = 'may_not_apply'
         else:
-            section.story_relevance = 'unknown'
+            relevance = 'unknown'
+
+        if section.story_relevance != relevance:
+            section.story_relevance = relevance
+            changed_sections.append(section)
 
-        section.save(update_fields=['story_relevance'])
+    if changed_sections:
+        DocumentSection.objects.bulk_update(changed_sections, ['story_relevance'])
 
 
 @login_required
@@ -2352,8 +2154,10 @@ def lookup_address(request, document_slug):
             })
 
         from .services.openai_service import OpenAIService
+        from .services.jurisdiction_service import JurisdictionService
         service = OpenAIService()
-        result = service.lookup_agency_address(
+        result = JurisdictionService.lookup_agency_address(
+            service,
             agency_name=agency_name,
             city=city,
             state=state,
@@ -2362,9 +2166,10 @@ def lookup_address(request, document_slug):
             officer_description=officer_description
         )
 
-        # Record AI usage on success and include updated usage info
+        # Record AI usage on success (saved records don't use AI) and include updated usage info
         if result.get('success'):
-            document.record_ai_usage()
+            if not result.get('cached'):
+                document.record_ai_usage()
             result.update(get_ai_usage_info(document))
 
         return JsonResponse(result)
@@ -2383,11 +2188,13 @@ def lookup_address(request, document_slug):
 
 @login_required
 def lookup_district_court(request):
-    """AJAX endpoint to lookup federal district court based on city and state."""
+    """AJAX endpoint to lookup federal district court based on city and state (optionally county and ZIP)."""
     city = request.GET.get('city', '').strip()
     state = request.GET.get('state', '').strip().upper()
+    county = request.GET.get('county', '').strip()
+    zip_code = request.GET.get('zip', '').strip()
 
-    if not city or not state:
+    if not state or not (city or county or zip_code):
         return JsonResponse({
             'success': False,
             'error': 'City and state are required',
@@ -2395,7 +2202,7 @@ def lookup_district_court(request):
 
     try:
         from .services.court_lookup_service import CourtLookupService
-        result = CourtLookupService.lookup_court_by_location(city, state)
+        result = CourtLookupService.lookup_court_by_location(city, state, county=county, zip_code=zip_code)
 
         if result:
             return JsonResponse({
@@ -2493,6 +2300,7 @@ def wizard(request, document_slug):
         'ai_analysis': json.dumps(session.ai_analysis) if session else '{}',
         'current_step': session.current_step if session else 1,
         'wizard_status': session.status if session else 'not_started',
+        'wizard_revision': session.revision if session else 0,
         'analysis_status': session.analysis_status if session else 'pending',
         'us_states': US_STATES,
     }
@@ -2507,181 +2315,219 @@ def wizard(request, document_slug):
 
 def _process_story_background(document_id, story_text):
     """
-    Background function to process story with OpenAI.
-    Runs in a separate thread to avoid blocking the request.
+    Job handler to process story with OpenAI.
+    Runs in a `run_workers` process; unexpected errors propagate so the job is retried.
     """
-    import django
-    django.setup()  # Ensure Django is set up in this thread
-
     from datetime import datetime
     from .models import Document, DocumentSection, IncidentOverview
-    from .services.openai_service import OpenAIService
-    from .services.court_lookup_service import CourtLookupService
+    from .services.async_openai_service import AsyncOpenAIService, run_async
+
+    document = Document.objects.get(id=document_id)
+
+    # Relief suggestions, agency verification and the court lookup all run
+    # concurrently once the story has been parsed. An edit of an already parsed
+    # story only re-extracts the sections it affects.
+    service = AsyncOpenAIService()
+    result = run_async(service.process_story(
+        story_text,
+        court_lookup=functools.partial(_lookup_incident_court, document_id),
+        previous_text=document.parsed_story_text,
+        previous_result=document.parsing_result,
+    ))
+    court_result = result.pop('court_result', None)
+
+    if result.get('success'):
+        # Save story text
+        document.story_text = story_text
+        document.parsed_story_text = story_text
+        document.story_told_at = timezone.now()
+
+        # Get extracted sections
+        extracted = result.get('sections', {})
+        reparsed = set(result.get('reparsed_sections', []))
+
+        # Auto-apply incident_overview fields (only when re-extracted, so reused
+        # data doesn't overwrite edits made since the last parse)
+        incident_data = extracted.get('incident_overview', {}) if 'incident_overview' in reparsed else {}
+
+        if incident_data:
+            try:
+                doc_section = DocumentSection.objects.get(
+                    document=document, section_type='incident_overview'
+                )
+                obj, created = IncidentOverview.objects.get_or_create(section=doc_section)
+
+                # Apply extracted fields
+                if incident_data.get('incident_date'):
+                    date_str = incident_data['incident_date']
+                    parsed_date = None
+
+                    # Try various date formats
+                    date_formats = [
+                        '%Y-%m-%d',       # 2024-03-15
+                        '%m/%d/%Y',       # 03/15/2024
+                        '%m-%d-%Y',       # 03-15-2024
+                        '%B %d, %Y',      # March 15, 2024
+                        '%b %d, %Y',      # Mar 15, 2024
+                        '%d %B %Y',       # 15 March 2024
+                        '%d %b %Y',       # 15 Mar 2024
+                        '%Y/%m/%d',       # 2024/03/15
+                    ]
+
+                    for fmt in date_formats:
+                        try:
+                            parsed_date = datetime.strptime(date_str, fmt).date()
+                            break
+                        except ValueError:
+                            continue
+
+                    if parsed_date:
+                        obj.incident_date = parsed_date
+                if incident_data.get('incident_time'):
+                    # Parse various time formats to TimeField
+                    time_str = incident_data['incident_time']
+                    try:
+                        from datetime import time as dt_time
+                        import re
+
+                        # Try various formats
+                        parsed_time = None
+
+                        # Format: HH:MM or H:MM
+                        if re.match(r'^\d{1,2}:\d{2}$', time_str):
+                            parts = time_str.split(':')
+                            parsed_time = dt_time(int(parts[0]), int(parts[1]))
+                        # Format: HH:MM:SS
+                        elif re.match(r'^\d{1,2}:\d{2}:\d{2}$', time_str):
+                            parts = time_str.split(':')
+                            parsed_time = dt_time(int(parts[0]), int(parts[1]), int(parts[2]))
+                        # Format: HH:MM AM/PM or H:MM AM/PM
+                        elif re.match(r'^\d{1,2}:\d{2}\s*(AM|PM|am|pm)$', time_str, re.IGNORECASE):
+                            match = re.match(r'^(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)$', time_str, re.IGNORECASE)
+                            hour = int(match.group(1))
+                            minute = int(match.group(2))
+                            ampm = match.group(3).upper()
+                            if ampm == 'PM' and hour != 12:
+                                hour += 12
+                            elif ampm == 'AM' and hour == 12:
+                                hour = 0
+                            parsed_time = dt_time(hour, minute)
+
+                        if parsed_time:
+                            obj.incident_time = parsed_time
+                    except (ValueError, AttributeError):
+                        pass  # Can't parse time, skip it
+                if incident_data.get('incident_location'):
+                    obj.incident_location = incident_data['incident_location']
+                if incident_data.get('city'):
+                    obj.city = incident_data['city']
+                if incident_data.get('state'):
+                    obj.state = incident_data['state']
+                if incident_data.get('location_type'):
+                    obj.location_type = incident_data['location_type']
+                if incident_data.get('was_recording') is not None:
+                    obj.was_recording = incident_data['was_recording'] in [True, 'true', 'True']
+                if incident_data.get('recording_device'):
+                    obj.recording_device = incident_data['recording_device']
+
+                # Apply the federal district court looked up alongside the AI calls
+                if court_result and court_result.get('court_name') and not obj.federal_district_court:
+                    obj.federal_district_court = court_result['court_name']
+                    obj.district_lookup_confidence = court_result.get('confidence', 'medium')
 
-    try:
-        document = Document.objects.get(id=document_id)
+                obj.save()
 
-        service = OpenAIService()
-        result = service.parse_story(story_text)
+                # Update section status
+                if check_section_complete(doc_section, obj):
+                    doc_section.status = 'completed'
+                elif doc_section.status == 'not_started':
+                    doc_section.status = 'in_progress'
+                doc_section.save()
+
+                # Add auto-applied notice
+                result['auto_applied'] = {
+                    'incident_overview': True,
+                    'fields_applied': [k for k, v in incident_data.items() if v]
+                }
+            except Exception:
+                pass  # Don't fail if incident overview update fails
 
-        if result.get('success'):
-            # Save story text
-            document.story_text = story_text
-            document.story_told_at = timezone.now()
+        # Update story_relevance for all sections
+        _update_section_relevance(document, extracted)
 
-            # Get extracted sections
-            extracted = result.get('sections', {})
+        # Record AI usage for billing/limits (not when the previous result was reused as is)
+        if reparsed:
+            document.record_ai_usage()
 
-            # Call suggest_relief with extracted data
-            relief_result = service.suggest_relief(extracted)
-            if relief_result.get('success'):
-                result['relief_suggestions'] = relief_result.get('relief', {})
+        # Add updated AI usage info to result
+        result['ai_remaining'] = document.user.get_free_ai_remaining()
+        result['ai_usage_display'] = document.get_ai_usage_display()
 
-            # Auto-apply incident_overview fields
-            incident_data = extracted.get('incident_overview', {})
+        # Store successful result
+        document.parsing_status = 'completed'
+        document.parsing_result = result
+        document.parsing_error = ''
+        document.save(update_fields=[
+            'story_text', 'parsed_story_text', 'story_told_at',
+            'parsing_status', 'parsing_result', 'parsing_error'
+        ])
+    else:
+        # Store failed result
+        document.parsing_status = 'failed'
+        document.parsing_error = result.get('error', 'Unknown error during parsing')
+        document.parsing_result = None
+        document.save(update_fields=['parsing_status', 'parsing_error', 'parsing_result'])
 
-            if incident_data:
-                try:
-                    doc_section = DocumentSection.objects.get(
-                        document=document, section_type='incident_overview'
-                    )
-                    obj, created = IncidentOverview.objects.get_or_create(section=doc_section)
+    publish_event(document.user_id, 'parse_story', document=document.slug, status=document.parsing_status)
 
-                    # Apply extracted fields
-                    if incident_data.get('incident_date'):
-                        date_str = incident_data['incident_date']
-                        parsed_date = None
-
-                        # Try various date formats
-                        date_formats = [
-                            '%Y-%m-%d',       # 2024-03-15
-                            '%m/%d/%Y',       # 03/15/2024
-                            '%m-%d-%Y',       # 03-15-2024
-                            '%B %d, %Y',      # March 15, 2024
-                            '%b %d, %Y',      # Mar 15, 2024
-                            '%d %B %Y',       # 15 March 2024
-                            '%d %b %Y',       # 15 Mar 2024
-                            '%Y/%m/%d',       # 2024/03/15
-                        ]
-
-                        for fmt in date_formats:
-                            try:
-                                parsed_date = datetime.strptime(date_str, fmt).date()
-                                break
-                            except ValueError:
-                                continue
 
-                        if parsed_date:
-                            obj.incident_date = parsed_date
-                    if incident_data.get('incident_time'):
-                        # Parse various time formats to TimeField
-                        time_str = incident_data['incident_time']
-                        try:
-                            from datetime import time as dt_time
-                            import re
-
-                            # Try various formats
-                            parsed_time = None
-
-                            # Format: HH:MM or H:MM
-                            if re.match(r'^\d{1,2}:\d{2}$', time_str):
-                                parts = time_str.split(':')
-                                parsed_time = dt_time(int(parts[0]), int(parts[1]))
-                            # Format: HH:MM:SS
-                            elif re.match(r'^\d{1,2}:\d{2}:\d{2}$', time_str):
-                                parts = time_str.split(':')
-                                parsed_time = dt_time(int(parts[0]), int(parts[1]), int(parts[2]))
-                            # Format: HH:MM AM/PM or H:MM AM/PM
-                            elif re.match(r'^\d{1,2}:\d{2}\s*(AM|PM|am|pm)$', time_str, re.IGNORECASE):
-                                match = re.match(r'^(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)$', time_str, re.IGNORECASE)
-                                hour = int(match.group(1))
-                                minute = int(match.group(2))
-                                ampm = match.group(3).upper()
-                                if ampm == 'PM' and hour != 12:
-                                    hour += 12
-                                elif ampm == 'AM' and hour == 12:
-                                    hour = 0
-                                parsed_time = dt_time(hour, minute)
-
-                            if parsed_time:
-                                obj.incident_time = parsed_time
-                        except (ValueError, AttributeError):
-                            pass  # Can't parse time, skip it
-                    if incident_data.get('incident_location'):
-                        obj.incident_location = incident_data['incident_location']
-                    if incident_data.get('city'):
-                        obj.city = incident_data['city']
-                    if incident_data.get('state'):
-                        obj.state = incident_data['state']
-                    if incident_data.get('location_type'):
-                        obj.location_type = incident_data['location_type']
-                    if incident_data.get('was_recording') is not None:
-                        obj.was_recording = incident_data['was_recording'] in [True, 'true', 'True']
-                    if incident_data.get('recording_device'):
-                        obj.recording_device = incident_data['recording_device']
-
-                    # Auto-lookup federal district court
-                    if obj.city and obj.state and not obj.federal_district_court:
-                        try:
-                            court_result = CourtLookupService.lookup_court_by_location(obj.city, obj.state)
-                            if court_result and court_result.get('court_name'):
-                                obj.federal_district_court = court_result['court_name']
-                                obj.district_lookup_confidence = court_result.get('confidence', 'medium')
-                        except Exception:
-                            pass
+def _lookup_incident_court(document_id, incident_data):
+    """
+    Look up the federal district court for a parsed incident_overview.
+    Skipped if the document already has a court. Used by _process_story_background.
+    """
+    from .models import IncidentOverview
+    from .models import PlaintiffInfo
+    from .services.court_lookup_service import CourtLookupService, location_zip_code
+    from .services.jurisdiction_service import JurisdictionService
 
-                    obj.save()
+    existing = IncidentOverview.objects.filter(section__document_id=document_id).first()
+    if existing and existing.federal_district_court:
+        return None
 
-                    # Update section status
-                    if check_section_complete(doc_section, obj):
-                        doc_section.status = 'completed'
-                    elif doc_section.status == 'not_started':
-                        doc_section.status = 'in_progress'
-                    doc_section.save()
-
-                    # Add auto-applied notice
-                    result['auto_applied'] = {
-                        'incident_overview': True,
-                        'fields_applied': [k for k, v in incident_data.items() if v]
-                    }
-                except Exception:
-                    pass  # Don't fail if incident overview update fails
+    city = incident_data.get('city') or (existing.city if existing else '')
+    state = incident_data.get('state') or (existing.state if existing else '')
+    if not city or not state:
+        return None
+
+    # County and ZIP pin down the district where city names are ambiguous
+    county = incident_data.get('county', '')
+    if not county:
+        record = JurisdictionService.get_record(city, state)
+        county = record.county_name if record else ''
+    location = incident_data.get('incident_location') or (existing.incident_location if existing else '')
+    plaintiff = PlaintiffInfo.objects.filter(section__document_id=document_id).values(
+        'city', 'state', 'zip_code'
+    ).first()
 
-            # Update story_relevance for all sections
-            _update_section_relevance(document, extracted)
+    return CourtLookupService.lookup_court_by_location(
+        city, state,
+        county=county,
+        zip_code=location_zip_code(location, city, state, plaintiff),
+    )
 
-            # Record AI usage for billing/limits
-            document.record_ai_usage()
 
-            # Add updated AI usage info to result
-            result['ai_remaining'] = document.user.get_free_ai_remaining()
-            result['ai_usage_display'] = document.get_ai_usage_display()
-
-            # Store successful result
-            document.parsing_status = 'completed'
-            document.parsing_result = result
-            document.parsing_error = ''
-            document.save(update_fields=[
-                'story_text', 'story_told_at',
-                'parsing_status', 'parsing_result', 'parsing_error'
-            ])
-        else:
-            # Store failed result
-            document.parsing_status = 'failed'
-            document.parsing_error = result.get('error', 'Unknown error during parsing')
-            document.parsing_result = None
-            document.save(update_fields=['parsing_status', 'parsing_error', 'parsing_result'])
+def _process_story_failed(document_id, error, **kwargs):
+    """Job failure hook: called once all story parsing attempts are exhausted."""
+    from .models import Document
 
-    except Exception as e:
-        # Handle unexpected errors
-        try:
-            document = Document.objects.get(id=document_id)
-            document.parsing_status = 'failed'
-            document.parsing_error = str(e)
-            document.parsing_result = None
-            document.save(update_fields=['parsing_status', 'parsing_error', 'parsing_result'])
-        except Exception:
-            pass  # Can't save error status
+    Document.objects.filter(id=document_id).update(
+        parsing_status='failed',
+        parsing_error=error,
+        parsing_result=None,
+    )
+    for user_id, slug in Document.objects.filter(id=document_id).values_list('user_id', 'slug'):
+        publish_event(user_id, 'parse_story', document=slug, status='failed')
 
 
 @login_required
@@ -2712,8 +2558,12 @@ def parse_story(request, document_slug):
                 'error': 'Please enter your story first.',
             })
 
-        # Check if already processing (prevent duplicate requests)
-        if document.parsing_status == 'processing':
+        # Check if this story is already processing (prevent duplicate requests).
+        # An edited story is always queued - it replaces the pending job's text below
+        reference = f'document:{document.id}'
+        active_job = JobQueue.find_active('process_story', reference)
+        if (document.parsing_status == 'processing' and active_job
+                and active_job.payload.get('story_text') == story_text):
             # Check if it's been processing for more than 2 minutes (stale)
             if document.parsing_started_at:
                 elapsed = (timezone.now() - document.parsing_started_at).total_seconds()
@@ -2724,20 +2574,20 @@ def parse_story(request, document_slug):
                         'message': 'Analysis already in progress...'
                     })
 
-        # Mark as processing and start background thread
+        # Mark as processing and queue background job. parsing_result is kept:
+        # it's the baseline the job re-parses incrementally against
         document.parsing_status = 'processing'
         document.parsing_started_at = timezone.now()
-        document.parsing_result = None
         document.parsing_error = ''
-        document.save(update_fields=['parsing_status', 'parsing_started_at', 'parsing_result', 'parsing_error'])
-
-        # Start background processing
-        thread = threading.Thread(
-            target=_process_story_background,
-            args=(document.id, story_text),
-            daemon=True
+        document.save(update_fields=['parsing_status', 'parsing_started_at', 'parsing_error'])
+
+        # Queue background processing (picked up by run_workers)
+        JobQueue.enqueue(
+            'process_story',
+            {'document_id': document.id, 'story_text': story_text},
+            reference=reference,
+            replace_payload=True,
         )
-        thread.start()
 
         return JsonResponse({
             'success': True,
@@ -3787,6 +3637,87 @@ def admin_edit_promo_code(request, code_id):
     return redirect('documents:admin_referrals')
 
 
+# ============================================================================
+# Admin AI Usage Dashboard
+# ============================================================================
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0 for an empty list)."""
+    if not sorted_values:
+        return 0
+    index = max(0, -(-len(sorted_values) * pct // 100) - 1)
+    return sorted_values[int(index)]
+
+
+@staff_member_required
+def admin_ai_usage(request):
+    """Admin view of AI call volume, latency (p50/p95) and spend by prompt type."""
+    from datetime import timedelta
+    from collections import defaultdict
+    from .models import AICallLog
+
+    try:
+        days = max(1, min(int(request.GET.get('days', 7)), 90))
+    except ValueError:
+        days = 7
+    calls = AICallLog.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+
+    by_prompt = list(calls.values('prompt_type').annotate(
+        calls=db_models.Count('id'),
+        cache_hits=db_models.Count('id', filter=db_models.Q(cache_hit=True)),
+        errors=db_models.Count('id', filter=db_models.Q(success=False)),
+        prompt_tokens=db_models.Sum('prompt_tokens'),
+        completion_tokens=db_models.Sum('completion_tokens'),
+        spend=db_models.Sum('cost'),
+    ).order_by('-spend'))
+
+    # Latency percentiles over real API calls only (cache hits would drag them to ~0)
+    latencies = defaultdict(list)
+    for prompt_type, latency_ms in calls.filter(cache_hit=False).values_list('prompt_type', 'latency_ms'):
+        latencies[prompt_type].append(latency_ms)
+    for row in by_prompt:
+        values = sorted(latencies[row['prompt_type']])
+        row['p50_ms'] = _percentile(values, 50)
+        row['p95_ms'] = _percentile(values, 95)
+        row['hit_rate'] = round(row['cache_hits'] / row['calls'] * 100, 1) if row['calls'] else 0
+
+    by_model = calls.exclude(api='cache').values('model_name').annotate(
+        calls=db_models.Count('id'),
+        prompt_tokens=db_models.Sum('prompt_tokens'),
+        completion_tokens=db_models.Sum('completion_tokens'),
+        spend=db_models.Sum('cost'),
+    ).order_by('-spend')
+
+    totals = calls.aggregate(
+        calls=db_models.Count('id'),
+        cache_hits=db_models.Count('id', filter=db_models.Q(cache_hit=True)),
+        spend=db_models.Sum('cost'),
+    )
+    all_latencies = sorted(latency for values in latencies.values() for latency in values)
+
+    top_documents = calls.filter(document__isnull=False).values(
+        'document__slug', 'document__title'
+    ).annotate(
+        calls=db_models.Count('id'),
+        spend=db_models.Sum('cost'),
+    ).order_by('-spend')[:20]
+
+    context = {
+        'days': days,
+        'day_options': [1, 7, 30, 90],
+        'by_prompt': by_prompt,
+        'by_model': by_model,
+        'top_documents': top_documents,
+        'total_calls': totals['calls'],
+        'total_cache_hits': totals['cache_hits'],
+        'total_spend': totals['spend'] or 0,
+        'overall_p50_ms': _percentile(all_latencies, 50),
+        'overall_p95_ms': _percentile(all_latencies, 95),
+    }
+
+    return render(request, 'documents/admin_ai_usage.html', context)
+
+
 @require_GET
 def validate_promo_code(request):
     """AJAX endpoint to validate a promo code."""
@@ -3821,7 +3752,6 @@ def validate_promo_code(request):
 @login_required
 def download_pdf(request, document_slug):
     """Download the finalized document as a PDF."""
-    import os
     import re
 
     document = get_object_or_404(Document, slug=document_slug, user=request.user)
@@ -3836,28 +3766,16 @@ def download_pdf(request, document_slug):
     safe_title = re.sub(r'\s+', '_', safe_title.strip())
     filename = f"{safe_title}_Section_1983_Complaint.pdf"
 
-    # Check if we have a pre-generated PDF file
-    if document.pdf_file_path and os.path.exists(document.pdf_file_path):
-        # Serve the pre-generated file
-        with open(document.pdf_file_path, 'rb') as pdf_file:
-            pdf_bytes = pdf_file.read()
+    from .services.artifact_store import get_artifact_store
 
-        # Clean up the temp file after serving
-        try:
-            os.remove(document.pdf_file_path)
-            document.pdf_file_path = ''
-            document.save(update_fields=['pdf_file_path'])
-        except Exception:
-            pass
+    store = get_artifact_store()
 
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+    # Serve the stored artifact if the background job (or an earlier download) produced one
+    if store.exists(document.pdf_file_path):
+        return _artifact_response(request, store, document.pdf_file_path, filename)
 
     # Fallback: Generate PDF synchronously (for direct URL access)
-    from django.template.loader import render_to_string
-    from weasyprint import HTML
-    from .services.document_generator import DocumentGenerator
+    from .services.complaint_cache import ComplaintCache
 
     document_data = _collect_document_data(document)
 
@@ -3865,8 +3783,8 @@ def download_pdf(request, document_slug):
         messages.error(request, 'Document is missing required data for PDF generation.')
         return redirect('documents:document_preview', document_slug=document.slug)
 
-    generator = DocumentGenerator()
-    result = generator.generate_complaint(document_data)
+    # Reuses the cached complaint unless the document data has changed
+    result = ComplaintCache.get_or_generate(document, document_data)
 
     if not result.get('success'):
         messages.error(request, f'Error generating document: {result.get("error", "Unknown error")}')
@@ -3874,117 +3792,186 @@ def download_pdf(request, document_slug):
 
     generated_document = result.get('document')
 
-    html_string = render_to_string('documents/document_pdf.html', {
-        'document': document,
-        'generated_document': generated_document,
-        'document_data': document_data,
-    })
+    html_string = ComplaintCache.get_or_render_html(
+        document, document_data, generated_document, result['fingerprint']
+    )
 
-    html = HTML(string=html_string)
-    pdf = html.write_pdf()
+    key = _store_pdf_artifact(document, html_string)
+    return _artifact_response(request, store, key, filename)
 
-    response = HttpResponse(pdf, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
+def _store_pdf_artifact(document, html_string):
+    """
+    Render the PDF for a document's HTML into the artifact store, unless an artifact
+    for the same HTML and stylesheet already exists, and point document.pdf_file_path at it.
+
+    Returns:
+        The artifact key
+    """
+    from .services.artifact_store import content_hash, get_artifact_store
+    from .services.pdf_render_service import PdfRenderService
+
+    store = get_artifact_store()
+    key = store.make_key(
+        document.id, content_hash(PdfRenderService.stylesheet_hash('document_pdf') + html_string)
+    )
+
+    if not store.exists(key):
+        store.save(key, PdfRenderService.render('document_pdf', html_string))
+
+    previous_key = document.pdf_file_path
+    if previous_key != key:
+        Document.objects.filter(id=document.id).update(pdf_file_path=key)
+        document.pdf_file_path = key
+        # The superseded artifact is never served again
+        if store.parse_key(previous_key):
+            store.delete(previous_key)
+
+    return key
+
+
+def _artifact_response(request, store, key, filename):
+    """
+    Stream a stored PDF artifact, honouring a single `Range: bytes=` request header
+    so browsers and download managers can resume.
+    """
+    import re
+    from django.http import FileResponse
+
+    size = store.size(key)
+    etag = f'"{store.parse_key(key)[1]}"'
+    start, end = 0, size - 1
+    status = 200
+
+    range_header = request.headers.get('Range', '')
+    if_range = request.headers.get('If-Range')
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', range_header.strip())
+    # Multi-range and malformed headers fall back to the full file
+    if match and match.group(0) != 'bytes=-' and (not if_range or if_range == etag):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+        if start > end or start >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        status = 206
+
+    response = FileResponse(store.open(key, start, end), status=status, content_type='application/pdf')
+    response['Content-Length'] = str(end - start + 1)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
     return response
 
 
 def _generate_pdf_background(document_id):
     """
-    Background function to generate PDF.
-    Runs in a separate thread to avoid blocking the request.
+    Job handler to generate PDF.
+    Runs in a `run_workers` process; unexpected errors propagate so the job is retried.
     """
-    import django
-    django.setup()  # Ensure Django is set up in this thread
-
-    import tempfile
-    import re
-    from django.template.loader import render_to_string
-    from weasyprint import HTML
     from .models import Document
-    from .services.document_generator import DocumentGenerator
+    from .services.complaint_cache import ComplaintCache
 
-    try:
-        document = Document.objects.get(id=document_id)
+    document = Document.objects.get(id=document_id)
 
-        # Stage 1: Collecting document data
-        document.pdf_progress_stage = 'collecting_data'
-        document.save(update_fields=['pdf_progress_stage'])
+    # Stage 1: Collecting document data
+    document.pdf_progress_stage = 'collecting_data'
+    document.save(update_fields=['pdf_progress_stage'])
+    _publish_pdf_progress(document)
 
-        document_data = _collect_document_data(document)
+    document_data = _collect_document_data(document)
 
-        if not document_data.get('has_minimum_data'):
-            document.pdf_status = 'failed'
-            document.pdf_error = 'Document is missing required data for PDF generation.'
-            document.pdf_progress_stage = ''
-            document.save(update_fields=['pdf_status', 'pdf_error', 'pdf_progress_stage'])
-            return
+    if not document_data.get('has_minimum_data'):
+        document.pdf_status = 'failed'
+        document.pdf_error = 'Document is missing required data for PDF generation.'
+        document.pdf_progress_stage = ''
+        document.save(update_fields=['pdf_status', 'pdf_error', 'pdf_progress_stage'])
+        _publish_pdf_progress(document)
+        return
 
-        # Stage 2: Generating legal document
-        document.pdf_progress_stage = 'generating_document'
-        document.save(update_fields=['pdf_progress_stage'])
+    # Stage 2: Generating legal document
+    document.pdf_progress_stage = 'generating_document'
+    document.save(update_fields=['pdf_progress_stage'])
+    _publish_pdf_progress(document)
 
-        generator = DocumentGenerator()
-        result = generator.generate_complaint(document_data)
+    # Reuses the cached complaint unless the document data has changed
+    result = ComplaintCache.get_or_generate(document, document_data)
 
-        if not result.get('success'):
-            document.pdf_status = 'failed'
-            document.pdf_error = f'Error generating document: {result.get("error", "Unknown error")}'
-            document.pdf_progress_stage = ''
-            document.save(update_fields=['pdf_status', 'pdf_error', 'pdf_progress_stage'])
-            return
+    if not result.get('success'):
+        document.pdf_status = 'failed'
+        document.pdf_error = f'Error generating document: {result.get("error", "Unknown error")}'
+        document.pdf_progress_stage = ''
+        document.save(update_fields=['pdf_status', 'pdf_error', 'pdf_progress_stage'])
+        _publish_pdf_progress(document)
+        return
 
-        generated_document = result.get('document')
+    generated_document = result.get('document')
 
-        # Stage 3: Rendering HTML
-        document.pdf_progress_stage = 'rendering_html'
-        document.save(update_fields=['pdf_progress_stage'])
+    # Stage 3: Rendering HTML
+    document.pdf_progress_stage = 'rendering_html'
+    document.save(update_fields=['pdf_progress_stage'])
+    _publish_pdf_progress(document)
 
-        html_string = render_to_string('documents/document_pdf.html', {
-            'document': document,
-            'generated_document': generated_document,
-            'document_data': document_data,
-        })
+    html_string = ComplaintCache.get_or_render_html(
+        document, document_data, generated_document, result['fingerprint']
+    )
 
-        # Stage 4: Creating PDF file
-        document.pdf_progress_stage = 'creating_pdf'
-        document.save(update_fields=['pdf_progress_stage'])
+    # Stage 4: Creating PDF file
+    document.pdf_progress_stage = 'creating_pdf'
+    document.save(update_fields=['pdf_progress_stage'])
+    _publish_pdf_progress(document)
+
+    # Skips the render if this exact HTML was already turned into a stored PDF
+    _store_pdf_artifact(document, html_string)
+
+    # Mark as completed
+    document.pdf_status = 'completed'
+    document.pdf_progress_stage = 'ready'
+    document.pdf_error = ''
+    document.save(update_fields=['pdf_status', 'pdf_progress_stage', 'pdf_error'])
+    _publish_pdf_progress(document)
+
+
+# Map internal PDF stages to user-friendly messages
+PDF_STAGE_MESSAGES = {
+    'starting': 'Starting PDF generation...',
+    'collecting_data': 'Collecting document data...',
+    'generating_document': 'Generating legal document...',
+    'rendering_html': 'Formatting document...',
+    'creating_pdf': 'Creating PDF file...',
+    'ready': 'PDF ready for download!'
+}
 
-        html = HTML(string=html_string)
-        pdf_bytes = html.write_pdf()
 
-        # Save to temp file
-        safe_title = re.sub(r'[^\w\s-]', '', document.title)
-        safe_title = re.sub(r'\s+', '_', safe_title.strip())
-        filename = f"{safe_title}_Section_1983_Complaint.pdf"
+def _publish_pdf_progress(document):
+    """Push the document's current PDF status/stage to the owner's job event stream."""
+    publish_event(
+        document.user_id, 'pdf_progress',
+        document=document.slug,
+        status=document.pdf_status,
+        stage=document.pdf_progress_stage,
+        message=PDF_STAGE_MESSAGES.get(document.pdf_progress_stage, 'Processing...'),
+    )
 
-        # Create temp file that persists
-        temp_file = tempfile.NamedTemporaryFile(
-            mode='wb',
-            suffix='.pdf',
-            prefix=f'doc_{document_id}_',
-            delete=False
-        )
-        temp_file.write(pdf_bytes)
-        temp_file.close()
 
-        # Mark as completed
-        document.pdf_status = 'completed'
-        document.pdf_progress_stage = 'ready'
-        document.pdf_error = ''
-        document.pdf_file_path = temp_file.name
-        document.save(update_fields=['pdf_status', 'pdf_progress_stage', 'pdf_error', 'pdf_file_path'])
+def _generate_pdf_failed(document_id, error, **kwargs):
+    """Job failure hook: called once all PDF generation attempts are exhausted."""
+    from .models import Document
 
-    except Exception as e:
-        # Handle unexpected errors
-        try:
-            document = Document.objects.get(id=document_id)
-            document.pdf_status = 'failed'
-            document.pdf_error = str(e)
-            document.pdf_progress_stage = ''
-            document.save(update_fields=['pdf_status', 'pdf_error', 'pdf_progress_stage'])
-        except Exception:
-            pass  # Can't save error status
+    Document.objects.filter(id=document_id).update(
+        pdf_status='failed',
+        pdf_error=error,
+        pdf_progress_stage='',
+    )
+    for user_id, slug in Document.objects.filter(id=document_id).values_list('user_id', 'slug'):
+        publish_event(user_id, 'pdf_progress', document=slug, status='failed', stage='')
 
 
 @login_required
@@ -4014,33 +4001,22 @@ def start_pdf_generation(request, document_slug):
                         'message': 'PDF generation already in progress...'
                     })
 
-        # Clean up any old temp file
-        if document.pdf_file_path:
-            import os
-            try:
-                if os.path.exists(document.pdf_file_path):
-                    os.remove(document.pdf_file_path)
-            except Exception:
-                pass
-
-        # Mark as processing and start background thread
+        # Mark as processing and queue background job
         document.pdf_status = 'processing'
         document.pdf_started_at = timezone.now()
         document.pdf_progress_stage = 'starting'
+        # pdf_file_path is kept: the job replaces it, and reuses the artifact if nothing changed
         document.pdf_error = ''
-        document.pdf_file_path = ''
         document.save(update_fields=[
-            'pdf_status', 'pdf_started_at', 'pdf_progress_stage',
-            'pdf_error', 'pdf_file_path'
+            'pdf_status', 'pdf_started_at', 'pdf_progress_stage', 'pdf_error'
         ])
 
-        # Start background processing
-        thread = threading.Thread(
-            target=_generate_pdf_background,
-            args=(document.id,),
-            daemon=True
+        # Queue background processing (picked up by run_workers)
+        JobQueue.enqueue(
+            'generate_pdf',
+            {'document_id': document.id},
+            reference=f'document:{document.id}',
         )
-        thread.start()
 
         return JsonResponse({
             'success': True,
@@ -4063,22 +4039,12 @@ def pdf_generation_status(request, document_slug):
     try:
         document = get_object_or_404(Document, slug=document_slug, user=request.user)
 
-        # Map internal stages to user-friendly messages
-        stage_messages = {
-            'starting': 'Starting PDF generation...',
-            'collecting_data': 'Collecting document data...',
-            'generating_document': 'Generating legal document...',
-            'rendering_html': 'Formatting document...',
-            'creating_pdf': 'Creating PDF file...',
-            'ready': 'PDF ready for download!'
-        }
-
         if document.pdf_status == 'processing':
             return JsonResponse({
                 'success': True,
                 'status': 'processing',
                 'stage': document.pdf_progress_stage,
-                'message': stage_messages.get(document.pdf_progress_stage, 'Processing...')
+                'message': PDF_STAGE_MESSAGES.get(document.pdf_progress_stage, 'Processing...')
             })
         elif document.pdf_status == 'completed':
             # Reset status for next time (but keep file path)
@@ -4120,6 +4086,48 @@ def pdf_generation_status(request, document_slug):
         })
 
 
+@login_required
+@require_GET
+def job_events(request):
+    """
+    Server-sent event stream of the user's background job progress: PDF stages,
+    story parsing, wizard extraction and wizard analysis.
+
+    Pages open it while a job runs instead of polling the status endpoints
+    (see static/js/job-events.js). The stream ends after JOB_EVENTS_MAX_SECONDS
+    and the browser reconnects on its own.
+
+    Events: job {type, status, document|session, stage?, message?}. Comment lines are heartbeats.
+    """
+    import time
+    from django.http import StreamingHttpResponse
+    from .services.event_bus import subscribe
+
+    user_id = request.user.id
+    max_seconds = getattr(settings, 'JOB_EVENTS_MAX_SECONDS', 120)
+    heartbeat = getattr(settings, 'JOB_EVENTS_HEARTBEAT_SECONDS', 15)
+
+    def event_stream():
+        deadline = time.monotonic() + max_seconds
+        with subscribe(user_id) as subscription:
+            # First bytes only after subscribing, so the page's catch-up check can't miss an event
+            yield 'retry: 3000\n\n'
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                event = subscription.get(timeout=min(heartbeat, remaining))
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield f'event: job\ndata: {json.dumps(event)}\n\n'
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
 # =============================================================================
 # Video Analysis Views (YouTube transcript extraction - subscribers only)
 # =============================================================================
@@ -4861,12 +4869,19 @@ def analyze_video_evidence(request, document_slug):
     if defendants_section:
         defendants = list(defendants_section.defendants.values_list('name', flat=True))
 
+    # Fit the story and transcripts to the input budget (the longest clips are trimmed first)
+    from .services.token_budget import fit_texts, get_input_budget
+    story_text, *transcript_texts = fit_texts(
+        [story_text] + [t['transcript'] for t in transcripts],
+        get_input_budget('analyze_video_evidence'),
+    )
+
     # Build transcript context for AI
     transcript_context = ""
-    for i, t in enumerate(transcripts, 1):
+    for i, (t, transcript_text) in enumerate(zip(transcripts, transcript_texts), 1):
         transcript_context += f"\n--- Video Clip {i}: {t['video_title']} [{t['start_time']} - {t['end_time']}] ---\n"
         transcript_context += f"YouTube URL: {t['youtube_url']}&t={_time_to_seconds(t['start_time'])}\n"
-        transcript_context += f"Transcript:\n{t['transcript']}\n"
+        transcript_context += f"Transcript:\n{transcript_text}\n"
 
     # Call OpenAI for analysis
     from .services.openai_service import OpenAIService
@@ -4916,6 +4931,7 @@ Include the YouTube link with timestamp for each suggestion so it can be referen
 
     try:
         response = service.client.chat.completions.create(
+            prompt_type='analyze_video_evidence',
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_message},
@@ -5148,7 +5164,12 @@ def final_review(request, document_slug):
                 document.final_signature = sections.get('signature', '')
                 document.final_causes_of_action = sections.get('causes_of_action', [])
                 document.final_generated_at = timezone.now()
-                document.save()
+                # Only the generated text - ai_cost_used was updated by the AI call log meanwhile
+                document.save(update_fields=[
+                    'final_introduction', 'final_jurisdiction', 'final_parties', 'final_facts',
+                    'final_prayer', 'final_jury_demand', 'final_signature', 'final_causes_of_action',
+                    'final_generated_at', 'updated_at',
+                ])
                 document.record_ai_usage()
         except Exception as e:
             auto_generate_error = str(e)
@@ -5251,14 +5272,24 @@ def generate_final_document(request, document_slug):
 
         document.final_generated_at = timezone.now()
         document.final_edited_at = None  # Reset edited time
-        document.save()
+        # Only the generated text - ai_cost_used was updated by the AI call log meanwhile
+        document.save(update_fields=[
+            'final_introduction', 'final_jurisdiction', 'final_parties', 'final_facts',
+            'final_prayer', 'final_jury_demand', 'final_signature', 'final_causes_of_action',
+            'final_generated_at', 'final_edited_at', 'updated_at',
+        ])
 
         # Record AI usage
         document.record_ai_usage()
 
+        failed_sections = result.get('failed_sections', [])
         return JsonResponse({
             'success': True,
-            'message': 'Document generated successfully.',
+            'message': (
+                'Document generated. Some sections could not be written and need to be regenerated.'
+                if failed_sections else 'Document generated successfully.'
+            ),
+            'failed_sections': failed_sections,
             **get_ai_usage_info(document)
         })
 
@@ -5470,6 +5501,81 @@ def regenerate_final_section(request, document_slug):
         })
 
 
+@login_required
+@require_POST
+def stream_final_document(request, document_slug):
+    """
+    Streaming version of generate_final_document / regenerate_final_section.
+
+    Sends server-sent events while the sections are written and saves each
+    section to its final_* field as soon as it is complete. POST body may
+    contain {"section": "<key>"} to regenerate a single section.
+
+    Events: delta {section, text, cause_number?}, section {section, content},
+    done {failed_sections, ai usage info}, error {error}.
+    """
+    from django.http import StreamingHttpResponse
+    from .services.document_generator import DocumentGenerator
+
+    document = get_object_or_404(Document, slug=document_slug, user=request.user)
+
+    if not document.can_edit():
+        return JsonResponse({
+            'success': False,
+            'error': 'Document cannot be edited.'
+        })
+
+    if not document.can_use_ai():
+        return JsonResponse({
+            'success': False,
+            'limit_reached': True,
+            'error': 'AI limit reached. Please upgrade to continue.'
+        })
+
+    try:
+        data = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid request format.'})
+
+    section_key = (data.get('section') or '').strip()
+    if section_key and section_key not in DocumentGenerator.FINAL_SECTIONS:
+        return JsonResponse({'success': False, 'error': f'Unknown section: {section_key}'})
+
+    document_data = _collect_document_data(document)
+    generator = DocumentGenerator()
+
+    def sse(event, payload):
+        return f'event: {event}\ndata: {json.dumps(payload)}\n\n'
+
+    def event_stream():
+        try:
+            sections = [section_key] if section_key else None
+            for event, payload in generator.stream_complaint(document_data, sections=sections):
+                if event == 'section':
+                    # Save as soon as the section is complete, so a dropped connection keeps it
+                    Document.objects.filter(id=document.id).update(
+                        **{f"final_{payload['section']}": payload['content']}
+                    )
+                elif event == 'done':
+                    now = timezone.now()
+                    if section_key:
+                        Document.objects.filter(id=document.id).update(final_edited_at=now)
+                    else:
+                        Document.objects.filter(id=document.id).update(
+                            final_generated_at=now, final_edited_at=None
+                        )
+                    document.record_ai_usage()
+                    payload = {**payload, 'success': True, **get_ai_usage_info(document)}
+                yield sse(event, payload)
+        except Exception as e:
+            yield sse('error', {'success': False, 'error': f'Error generating document: {str(e)}'})
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
 @login_required
 def download_final_pdf(request, document_slug):
     """
@@ -5485,8 +5591,8 @@ def download_final_pdf(request, document_slug):
     is_draft = document.payment_status in ('draft', 'expired')
 
     try:
-        from weasyprint import HTML
         from django.template.loader import render_to_string
+        from .services.pdf_render_service import PdfRenderService
 
         # Collect document data for caption
         document_data = _collect_document_data(document)
@@ -5500,7 +5606,7 @@ def download_final_pdf(request, document_slug):
         })
 
         # Generate PDF
-        pdf = HTML(string=html_content).write_pdf()
+        pdf = PdfRenderService.render('final_pdf', html_content)
 
         # Create response
         response = HttpResponse(pdf, content_type='application/pdf')
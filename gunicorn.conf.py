@@ -0,0 +1,11 @@
+"""
+Gunicorn settings, passed with `-c gunicorn.conf.py` by start.sh and the
+Render startCommand so both run the same worker setup.
+"""
+import os
+
+# Threaded workers, so open event streams (job progress, final document)
+# don't block other requests
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 120
@@ -0,0 +1,135 @@
+"""
+Page cache for the public civil-rights pages.
+
+The landing, Know Your Rights, amendment and CMS pages are the same for
+every anonymous visitor, so their rendered HTML is cached (Django's cache
+backend, PUBLIC_PAGE_CACHE_SECONDS) and served with ETag / Last-Modified
+headers; a conditional GET with a matching validator gets a 304.
+
+    @cache_public_page
+    def know_your_rights(request):
+        ...
+
+Pages are keyed on scheme, host and path - tracking query strings (fbclid,
+utm_*) share the cached page. Only anonymous GET/HEAD requests are cached: signed-in users see their name
+and account links in the header, so their pages are always rendered. Pages
+carrying a flash message or a CSRF token are never stored. The theme is
+applied client-side (localStorage), so it doesn't change the HTML.
+
+Cache keys include a content version - the count and latest updated_at of
+CivilRightsPage rows plus the PageSection count - re-read at most every
+PUBLIC_PAGE_CACHE_CHECK_SECONDS. Admin saves and deletes change the version
+(PageSection saves touch their page's updated_at) and reset the check in the
+process that made them, so edits replace the cached pages.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+KEY_PREFIX = 'public_pages'
+
+
+class ContentVersion:
+    """In-process copy of the public page content version."""
+
+    _version = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        interval = getattr(settings, 'PUBLIC_PAGE_CACHE_CHECK_SECONDS', 30)
+        with cls._lock:
+            now = time.monotonic()
+            if cls._version is None or now - cls._checked_at >= interval:
+                cls._version = cls._load()
+                cls._checked_at = now
+            return cls._version
+
+    @classmethod
+    def invalidate(cls):
+        """Re-read the version on the next request (after an admin edit)."""
+        with cls._lock:
+            cls._version = None
+
+    @staticmethod
+    def _load():
+        from django.db.models import Count, Max
+        from .models import CivilRightsPage, PageSection
+
+        pages = CivilRightsPage.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+        stamp = f"{pages['count']}:{pages['updated']}:{PageSection.objects.count()}"
+        return hashlib.md5(stamp.encode()).hexdigest()[:12]
+
+
+def _page_key(request):
+    # Templates use the scheme, host and path (canonical link, structured data).
+    # The query string is left out: none of these views read it, and shared links
+    # carry a unique fbclid / utm_* per click that would otherwise flood the cache
+    url = hashlib.md5(f'{request.scheme}://{request.get_host()}{request.path}'.encode()).hexdigest()
+    return f'{KEY_PREFIX}:page:{ContentVersion.get()}:anon:{url}'
+
+
+def _has_messages(request):
+    from django.contrib.messages import get_messages
+    return len(get_messages(request)) > 0
+
+
+def _with_validators(request, response, entry):
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_vary_headers(response, ['Cookie'])
+    return get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified'], response=response
+    )
+
+
+def cache_public_page(view_func):
+    """Serve a public page view from the anonymous page cache, with conditional GET support."""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or _has_messages(request)):
+            return view_func(request, *args, **kwargs)
+
+        key = _page_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = view_func(request, *args, **kwargs)
+            if (response.status_code != 200 or response.streaming or response.cookies
+                    or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')):
+                return response
+            content = response.content
+            entry = {
+                'content': content,
+                'content_type': response['Content-Type'],
+                'etag': f'"{hashlib.md5(content).hexdigest()}"',
+                'last_modified': int(time.time()),
+            }
+            cache.set(key, entry, getattr(settings, 'PUBLIC_PAGE_CACHE_SECONDS', 600))
+        else:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+
+        return _with_validators(request, response, entry)
+
+    return wrapper
+
+
+def cached_nav_pages():
+    """Published navigation pages, cached under the content version."""
+    from .models import CivilRightsPage
+
+    return cache.get_or_set(
+        f'{KEY_PREFIX}:nav:{ContentVersion.get()}',
+        lambda: list(CivilRightsPage.objects.filter(is_published=True, show_in_nav=True).order_by('order')),
+        getattr(settings, 'PUBLIC_PAGE_CACHE_SECONDS', 600),
+    )
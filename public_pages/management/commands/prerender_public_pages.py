@@ -0,0 +1,64 @@
+"""
+Management command to pre-render the public pages (landing, Know Your
+Rights, published CMS pages and the sitemap) to compressed static HTML in
+PRERENDER_ROOT, served by PrerenderedPagesMiddleware when
+PRERENDER_PUBLIC_PAGES is on.
+
+Pages are rendered for PRERENDER_HOST, or the Site domain when it is unset.
+The command fails without writing anything if that host can't be used for
+public canonical links (localhost, example.com, .onrender.com, ...).
+
+Usage:
+    python manage.py prerender_public_pages
+    python manage.py prerender_public_pages --clear
+    python manage.py prerender_public_pages --page fourth-amendment-guide
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from public_pages import prerender
+
+
+class Command(BaseCommand):
+    help = 'Render the public pages and sitemap to static HTML for WhiteNoise'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete everything in PRERENDER_ROOT first (drops pages that were unpublished)'
+        )
+        parser.add_argument(
+            '--page', action='append', dest='slugs', metavar='SLUG',
+            help='Only re-render this CMS page (and the sitemap); can be repeated'
+        )
+
+    def handle(self, *args, **options):
+        root = prerender.get_root()
+        if not prerender.is_enabled():
+            self.stdout.write(self.style.WARNING(
+                'PRERENDER_PUBLIC_PAGES is off - files are written but not served'
+            ))
+
+        try:
+            host = prerender.get_host()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+        self.stdout.write(f'Rendering for https://{host}')
+
+        if options['slugs']:
+            paths = [prerender.cms_page_path(slug) for slug in options['slugs']] + [prerender.SITEMAP_PATH]
+            results = {'written': [], 'skipped': []}
+            for path in paths:
+                results['written' if prerender.prerender_path(path, host) else 'skipped'].append(path)
+        else:
+            results = prerender.prerender_all(clear=options['clear'])
+
+        for path in results['written']:
+            self.stdout.write(f'  {path}')
+        for path in results['skipped']:
+            self.stdout.write(self.style.WARNING(f'  {path} (skipped - not a shareable 200 page)'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {len(results['written'])} page(s) to {root}"
+            + (f", skipped {len(results['skipped'])}" if results['skipped'] else '')
+        ))
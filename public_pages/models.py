@@ -67,6 +67,29 @@ class CivilRightsPage(models.Model):
         status = "✓" if self.is_published else "✗"
         return f"[{status}] {self.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored slug so a renamed page's pre-rendered copy is removed
+        instance._saved_slug = instance.__dict__.get('slug')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .cache import ContentVersion
+        from .prerender import schedule_page_update
+        ContentVersion.invalidate()
+        schedule_page_update(self.slug, old_slug=getattr(self, '_saved_slug', None))
+        self._saved_slug = self.slug
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .cache import ContentVersion
+        from .prerender import schedule_page_update
+        ContentVersion.invalidate()
+        schedule_page_update(self.slug)
+        return result
+
     def get_absolute_url(self):
         return reverse('cms_page', kwargs={'slug': self.slug})
 
@@ -173,6 +196,24 @@ class PageSection(models.Model):
         visible = "✓" if self.is_visible else "✗"
         return f"[{visible}] {self.page.title} - {self.get_section_type_display()}: {self.title or '(no title)'}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._touch_page()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._touch_page()
+        return result
+
+    def _touch_page(self):
+        """Bump the page's updated_at so cached and pre-rendered copies of it are replaced."""
+        from django.utils import timezone
+        from .cache import ContentVersion
+        from .prerender import schedule_page_update
+        CivilRightsPage.objects.filter(pk=self.page_id).update(updated_at=timezone.now())
+        ContentVersion.invalidate()
+        schedule_page_update(self.page.slug)
+
     def get_background_class(self):
         """Return CSS class for section background."""
         mapping = {
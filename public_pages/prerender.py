@@ -0,0 +1,249 @@
+"""
+Static pre-rendering of the public pages.
+
+`manage.py prerender_public_pages` renders the landing page, the Know Your
+Rights pages, every published CivilRightsPage and the sitemap into
+PRERENDER_ROOT as index.html files with gzip (and brotli, when installed)
+variants:
+
+    prerendered/index.html(.gz)                      -> /
+    prerendered/rights/fourth-amendment/index.html   -> /rights/fourth-amendment/
+    prerendered/page/<slug>/index.html               -> /page/<slug>/
+    prerendered/sitemap.xml                          -> /sitemap.xml
+
+With PRERENDER_PUBLIC_PAGES on, PrerenderedPagesMiddleware (WhiteNoise)
+serves those files before any view runs. Requests carrying a session or
+messages cookie still go through Django, so signed-in users get their own
+header and nobody misses a flash message. Admin saves of a CivilRightsPage
+or PageSection re-render just that page and the sitemap once the transaction
+commits.
+
+Pages are rendered as an anonymous visitor on https://<host>, where the host
+is PRERENDER_HOST or, when that is unset, the current Site's domain. Rendering
+refuses hosts that would bake wrong canonical links into the files (localhost,
+example.com, wildcard ALLOWED_HOSTS entries such as .onrender.com).
+"""
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from whitenoise.base import WhiteNoise
+
+try:
+    import brotli
+except ImportError:  # Optional - gzip variants only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_PATH = '/sitemap.xml'
+
+
+def is_enabled():
+    return getattr(settings, 'PRERENDER_PUBLIC_PAGES', False)
+
+
+def get_root() -> Path:
+    return Path(getattr(settings, 'PRERENDER_ROOT', settings.BASE_DIR / 'prerendered'))
+
+
+def get_host() -> str:
+    """
+    Public host the pages are rendered for (canonical links, sitemap URLs).
+
+    Raises:
+        ImproperlyConfigured: No usable host - set PRERENDER_HOST or the Site domain
+    """
+    from django.contrib.sites.models import Site
+    from django.core.exceptions import ImproperlyConfigured, ValidationError
+    from django.core.validators import validate_ipv46_address
+    from django.http.request import split_domain_port, validate_host
+
+    host = (getattr(settings, 'PRERENDER_HOST', '') or Site.objects.get_current().domain).strip().lower()
+    domain, _ = split_domain_port(host)
+    try:
+        validate_ipv46_address(domain)
+        is_ip = True
+    except ValidationError:
+        is_ip = False
+
+    if is_ip or '.' not in domain or domain.startswith('.') or domain in ('localhost', 'example.com'):
+        raise ImproperlyConfigured(
+            f"Can't pre-render public pages for host {host!r}. Set PRERENDER_HOST "
+            f"(e.g. 1983law.org) or the Site domain in the admin."
+        )
+    if not validate_host(host, settings.ALLOWED_HOSTS):
+        raise ImproperlyConfigured(f'Pre-render host {host!r} is not in ALLOWED_HOSTS.')
+    return host
+
+
+def public_page_paths() -> list:
+    """URL paths of the landing page and the hardcoded Know Your Rights pages."""
+    from django.urls import reverse
+    from config.sitemaps import KnowYourRightsSitemap
+
+    return [reverse(name) for name in ['public_pages:home', *KnowYourRightsSitemap().items()]]
+
+
+def cms_page_path(slug) -> str:
+    from django.urls import reverse
+    return reverse('public_pages:cms_page', kwargs={'slug': slug})
+
+
+def _file_for_path(path) -> Path:
+    if path.endswith('/'):
+        return get_root() / path.strip('/') / 'index.html'
+    return get_root() / path.lstrip('/')
+
+
+def render_path(path, host=None):
+    """
+    Render a URL path as an anonymous visitor on https://host (default: get_host()).
+
+    Returns:
+        Response body bytes, or None if the page isn't a plain 200 that is
+        safe to share (redirect, 404, or it embeds a CSRF token)
+    """
+    from django.contrib.auth.models import AnonymousUser
+    from django.http import Http404
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    request = RequestFactory().get(path, HTTP_HOST=host or get_host(), secure=True)
+    request.user = AnonymousUser()
+
+    match = resolve(path)
+    view = getattr(match.func, '__wrapped__', match.func)  # Skip the runtime page cache
+    try:
+        response = view(request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+    if hasattr(response, 'render'):
+        response = response.render()
+    if response.status_code != 200 or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return None
+    return response.content
+
+
+def _write_atomic(target: Path, content: bytes):
+    """Write via a temp file + rename so WhiteNoise never serves a partial file."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as tmp:
+        tmp.write(content)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, target)
+
+
+def write_page(path, content: bytes) -> Path:
+    """Write a rendered page and its compressed variants."""
+    target = _file_for_path(path)
+    _write_atomic(target, content)
+    _write_atomic(target.with_name(target.name + '.gz'), gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(target.with_name(target.name + '.br'), brotli.compress(content))
+    return target
+
+
+def remove_page(path):
+    """Delete a page's pre-rendered files (unpublished or deleted CMS page)."""
+    target = _file_for_path(path)
+    for suffix in ('', '.gz', '.br'):
+        candidate = target.with_name(target.name + suffix)
+        if candidate.exists():
+            candidate.unlink()
+
+
+def prerender_path(path, host=None) -> bool:
+    """Render and write one path; removes stale files if it no longer renders. Returns True if written."""
+    content = render_path(path, host)
+    if content is None:
+        remove_page(path)
+        return False
+    write_page(path, content)
+    return True
+
+
+def prerender_all(clear=False) -> dict:
+    """
+    Render every public page, published CMS page and the sitemap.
+
+    Returns:
+        {'written': [paths], 'skipped': [paths]}
+    """
+    from .models import CivilRightsPage
+
+    host = get_host()  # Before clearing, so a bad host leaves the current files in place
+    if clear and get_root().exists():
+        shutil.rmtree(get_root())
+
+    paths = public_page_paths()
+    paths += [cms_page_path(slug) for slug in
+              CivilRightsPage.objects.filter(is_published=True).values_list('slug', flat=True)]
+    paths.append(SITEMAP_PATH)
+
+    results = {'written': [], 'skipped': []}
+    for path in paths:
+        results['written' if prerender_path(path, host) else 'skipped'].append(path)
+    return results
+
+
+def schedule_page_update(slug, old_slug=None):
+    """
+    After the current transaction commits, re-render one CMS page (or remove
+    it if it is no longer published) and the sitemap. No-op unless
+    prerendering is enabled and the pages have been rendered once.
+    """
+    from django.db import transaction
+
+    if not is_enabled() or not get_root().exists():
+        return
+
+    def update():
+        try:
+            host = get_host()
+            if old_slug and old_slug != slug:
+                remove_page(cms_page_path(old_slug))
+            prerender_path(cms_page_path(slug), host)
+            prerender_path(SITEMAP_PATH, host)
+        except Exception:
+            logger.exception(f"Failed to re-render public page {slug}")
+
+    transaction.on_commit(update)
+
+
+class PrerenderedPagesMiddleware(WhiteNoise):
+    """
+    Serve pre-rendered public pages from PRERENDER_ROOT before Django's views.
+
+    Files are looked up on every request (WhiteNoise autorefresh), so
+    re-rendered pages are served without a restart. start.sh renders them
+    on deploy when PRERENDER_PUBLIC_PAGES is on.
+    """
+
+    def __init__(self, get_response):
+        from django.core.exceptions import MiddlewareNotUsed
+
+        if not is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        super().__init__(application=None, autorefresh=True, index_file=True, max_age=0)
+        self.add_files(str(get_root()))
+        self.bypass_cookies = (settings.SESSION_COOKIE_NAME, 'messages')
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and not any(
+            name in request.COOKIES for name in self.bypass_cookies
+        ):
+            static_file = self.find_file(request.path_info)
+            if static_file is not None:
+                from whitenoise.middleware import WhiteNoiseMiddleware
+                response = WhiteNoiseMiddleware.serve(static_file, request)
+                # XFrameOptionsMiddleware is further down the stack and never sees these
+                response['X-Frame-Options'] = getattr(settings, 'X_FRAME_OPTIONS', 'DENY').upper()
+                return response
+        return self.get_response(request)
@@ -0,0 +1,119 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, TestCase, override_settings
+
+from . import prerender
+from .cache import ContentVersion, cache_public_page
+from .models import CivilRightsPage
+
+
+class PublicPageCacheTests(TestCase):
+    """cache_public_page stores anonymous pages only."""
+
+    def setUp(self):
+        cache.clear()
+        ContentVersion.invalidate()
+        self.renders = 0
+
+    def get(self, path='/know-your-rights/', user=None, **headers):
+        request = RequestFactory().get(path, headers=headers)
+        request.user = user or AnonymousUser()
+        return request
+
+    def view(self, request):
+        self.renders += 1
+        return HttpResponse('<h1>Know Your Rights</h1>')
+
+    def test_anonymous_hit_runs_no_queries(self):
+        page = cache_public_page(self.view)
+        first = page(self.get())
+        with self.assertNumQueries(0):
+            second = page(self.get())
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_get(self):
+        page = cache_public_page(self.view)
+        etag = page(self.get())['ETag']
+        self.assertEqual(page(self.get(**{'If-None-Match': etag})).status_code, 304)
+
+    def test_pages_with_a_csrf_token_are_not_stored(self):
+        def form_view(request):
+            get_token(request)
+            return self.view(request)
+
+        page = cache_public_page(form_view)
+        page(self.get())
+        page(self.get())
+        self.assertEqual(self.renders, 2)
+
+    def test_signed_in_users_are_not_cached(self):
+        user = get_user_model().objects.create_user(email='member@example.com', password='pw')
+        page = cache_public_page(self.view)
+        page(self.get(user=user))
+        page(self.get(user=user))
+        page(self.get())
+        self.assertEqual(self.renders, 3)
+
+    def test_content_change_replaces_page(self):
+        page = cache_public_page(self.view)
+        page(self.get())
+        CivilRightsPage.objects.create(title='First Amendment', slug='first-amendment')
+        page(self.get())
+        self.assertEqual(self.renders, 2)
+
+    def test_tracking_query_strings_share_the_page(self):
+        page = cache_public_page(self.view)
+        page(self.get('/know-your-rights/?fbclid=abc'))
+        page(self.get('/know-your-rights/?utm_source=newsletter'))
+        page(self.get('/know-your-rights/'))
+        self.assertEqual(self.renders, 1)
+
+
+@override_settings(PRERENDER_HOST='', ALLOWED_HOSTS=['.onrender.com', '1983law.org', 'localhost'])
+class PrerenderHostTests(TestCase):
+    """Pages are only pre-rendered for a real public host."""
+
+    def setUp(self):
+        Site.objects.clear_cache()
+        self.addCleanup(Site.objects.clear_cache)
+
+    def set_site_domain(self, domain):
+        Site.objects.filter(pk=1).update(domain=domain)
+        Site.objects.clear_cache()
+
+    def test_defaults_to_the_site_domain(self):
+        self.set_site_domain('1983law.org')
+        self.assertEqual(prerender.get_host(), '1983law.org')
+        with override_settings(PRERENDER_HOST='1983LAW.org'):
+            self.assertEqual(prerender.get_host(), '1983law.org')
+
+    def test_rejects_placeholder_and_wildcard_hosts(self):
+        self.set_site_domain('example.com')
+        for host in ('', '.onrender.com', 'localhost', '127.0.0.1:8000', 'other.org'):
+            with self.subTest(host=host), override_settings(PRERENDER_HOST=host):
+                with self.assertRaises(ImproperlyConfigured):
+                    prerender.get_host()
+
+    def test_command_fails_without_touching_existing_files(self):
+        self.set_site_domain('example.com')
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        (root / 'index.html').write_text('<h1>Previous deploy</h1>')
+
+        with override_settings(PRERENDER_ROOT=root), self.assertRaises(CommandError):
+            call_command('prerender_public_pages', '--clear', stdout=StringIO())
+        self.assertEqual((root / 'index.html').read_text(), '<h1>Previous deploy</h1>')
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.http import Http404, HttpResponse
 from datetime import datetime, timedelta
 
+from .cache import cache_public_page, cached_nav_pages
 from .models import CivilRightsPage, PageSection
 
 
@@ -29,6 +30,7 @@ def robots_txt(request):
     return HttpResponse("\n".join(lines), content_type="text/plain")
 
 
+@cache_public_page
 def cms_page(request, slug):
     """
     Dynamic CMS page view.
@@ -45,13 +47,11 @@ def cms_page(request, slug):
 
 
 def get_nav_pages():
-    """Get pages that should appear in navigation."""
-    return CivilRightsPage.objects.filter(
-        is_published=True,
-        show_in_nav=True
-    ).order_by('order')
+    """Get pages that should appear in navigation (cached with the public pages)."""
+    return cached_nav_pages()
 
 
+@cache_public_page
 def landing_page(request):
     """
     Main public landing page with civil rights information.
@@ -192,36 +192,43 @@ def landing_page(request):
     return render(request, 'public_pages/landing.html', context)
 
 
+@cache_public_page
 def know_your_rights(request):
     """Comprehensive Know Your Rights page with detailed information."""
     return render(request, 'public_pages/know_your_rights.html')
 
 
+@cache_public_page
 def right_to_record(request):
     """Detailed page about the right to record police and government officials."""
     return render(request, 'public_pages/right_to_record.html')
 
 
+@cache_public_page
 def section_1983(request):
     """Detailed page explaining Section 1983 and how to use it."""
     return render(request, 'public_pages/section_1983.html')
 
 
+@cache_public_page
 def rights_violated(request):
     """Guide for what to do when your rights have been violated."""
     return render(request, 'public_pages/rights_violated.html')
 
 
+@cache_public_page
 def first_amendment_auditors(request):
     """Tribute page to First Amendment auditors protecting our freedoms."""
     return render(request, 'public_pages/first_amendment_auditors.html')
 
 
+@cache_public_page
 def fourth_amendment(request):
     """Detailed page about Fourth Amendment rights."""
     return render(request, 'public_pages/fourth_amendment.html')
 
 
+@cache_public_page
 def fifth_amendment(request):
     """Detailed page about Fifth Amendment rights."""
     return render(request, 'public_pages/fifth_amendment.html')
@@ -13,9 +13,18 @@ python manage.py seed_ai_prompts || echo "seed_ai_prompts had issues"
 
 echo "=== Seeding done ==="
 
+if [ "$PRERENDER_PUBLIC_PAGES" = "1" ]; then
+    echo "Pre-rendering public pages..."
+    python manage.py prerender_public_pages --clear || echo "prerender_public_pages had issues"
+fi
+
 echo "Testing Django imports..."
 python -c "import django; django.setup(); from config.wsgi import application; print('WSGI app loaded successfully')" || echo "Django import failed"
 
+# Background jobs are processed by a separate `python manage.py run_workers`
+# service (the Render worker, or the compose `worker` service)
+
 echo "PORT is: $PORT"
 echo "Starting gunicorn on port ${PORT:-8000}..."
-exec gunicorn --bind 0.0.0.0:${PORT:-8000} --timeout 120 --log-level debug --capture-output --access-logfile - --error-logfile - config.wsgi:application
+# Threads and timeout come from gunicorn.conf.py
+exec gunicorn -c gunicorn.conf.py --bind 0.0.0.0:${PORT:-8000} --log-level debug --capture-output --access-logfile - --error-logfile - config.wsgi:application
@@ -0,0 +1,75 @@
+/**
+ * Job Events - background job progress pushed over the user's event stream
+ * (/documents/events/), with polling as the fallback.
+ *
+ *   const watcher = JobEvents.watch({
+ *       match: (event) => event.type === 'pdf_progress' && event.document === slug,
+ *       onEvent: (event) => { ... },   // a matching event arrived
+ *       check: () => { ... },         // read the status endpoint once
+ *       pollInterval: 2000,           // fallback polling rate
+ *   });
+ *   watcher.stop();
+ *
+ * check() runs when the stream opens (to catch up on anything that finished
+ * before it connected), every 15 seconds as a safety net, and at pollInterval
+ * whenever the stream is unavailable.
+ */
+
+(function() {
+    'use strict';
+
+    const STREAM_URL = '/documents/events/';
+    const SAFETY_POLL_MS = 15000;
+
+    function watch({ match, onEvent, check, pollInterval = 3000 }) {
+        let source = null;
+        let timer = null;
+        let stopped = false;
+
+        function poll(interval) {
+            clearInterval(timer);
+            timer = setInterval(() => {
+                if (!stopped) check();
+            }, interval);
+        }
+
+        function stop() {
+            stopped = true;
+            clearInterval(timer);
+            if (source) source.close();
+        }
+
+        if (!window.EventSource) {
+            poll(pollInterval);
+            return { stop };
+        }
+
+        source = new EventSource(STREAM_URL);
+
+        source.addEventListener('open', () => {
+            if (stopped) return;
+            check();
+            poll(SAFETY_POLL_MS);
+        });
+
+        source.addEventListener('job', (e) => {
+            let event;
+            try {
+                event = JSON.parse(e.data);
+            } catch (err) {
+                return;
+            }
+            if (!stopped && match(event)) onEvent(event);
+        });
+
+        source.addEventListener('error', () => {
+            // EventSource reconnects on its own (the server closes the stream
+            // periodically); poll at the normal rate until it does
+            if (!stopped) poll(pollInterval);
+        });
+
+        return { stop };
+    }
+
+    window.JobEvents = { watch };
+})();
@@ -8,7 +8,7 @@
     let DOCUMENT_ID = '';
     let PARSE_URL = '';
     let STATUS_URL = '';
-    let pollingInterval = null;
+    let statusWatcher = null;
     let parsedSections = null; // Store all parsed sections for auto-apply
     let reliefSuggestions = null; // Store relief suggestions from AI
     let currentQuestions = []; // Store questions for re-analysis
@@ -251,48 +251,57 @@
     }
 
     function startPolling() {
-        // Clear any existing polling interval
-        if (pollingInterval) {
-            clearInterval(pollingInterval);
-        }
+        // Stop any existing watcher
+        stopPolling();
 
-        // Poll every 3 seconds
-        pollingInterval = setInterval(() => {
-            fetch(STATUS_URL, {
-                method: 'GET',
-                headers: {
-                    'X-Requested-With': 'XMLHttpRequest'
-                }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'completed') {
-                    // Stop polling
-                    stopPolling();
-                    // Update AI usage display in banner
-                    updateAIUsageBanner(data.ai_usage_display);
-                    // Show results
-                    reliefSuggestions = data.relief_suggestions || null;
-                    showResults(data.sections);
-                } else if (data.status === 'failed') {
-                    // Stop polling
-                    stopPolling();
-                    // Show error
-                    showError(data.error || 'Analysis failed. Please try again.');
-                }
-                // If still 'processing', continue polling
-            })
-            .catch(error => {
-                console.error('Polling error:', error);
-                // Don't stop polling on network error, it might be temporary
-            });
-        }, 3000);
+        // Completion is pushed over the job event stream; the status endpoint is read
+        // once when it arrives (and polled every 3 seconds if the stream is unavailable)
+        statusWatcher = JobEvents.watch({
+            match: (event) => event.type === 'parse_story' && event.document === DOCUMENT_ID,
+            onEvent: checkStatus,
+            check: checkStatus,
+            pollInterval: 3000,
+        });
+    }
+
+    function checkStatus() {
+        fetch(STATUS_URL, {
+            method: 'GET',
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (!statusWatcher) {
+                return;  // Already handled by an earlier check
+            }
+            if (data.status === 'completed') {
+                // Stop polling
+                stopPolling();
+                // Update AI usage display in banner
+                updateAIUsageBanner(data.ai_usage_display);
+                // Show results
+                reliefSuggestions = data.relief_suggestions || null;
+                showResults(data.sections);
+            } else if (data.status === 'failed') {
+                // Stop polling
+                stopPolling();
+                // Show error
+                showError(data.error || 'Analysis failed. Please try again.');
+            }
+            // If still 'processing', keep waiting
+        })
+        .catch(error => {
+            console.error('Polling error:', error);
+            // Don't stop polling on network error, it might be temporary
+        });
     }
 
     function stopPolling() {
-        if (pollingInterval) {
-            clearInterval(pollingInterval);
-            pollingInterval = null;
+        if (statusWatcher) {
+            statusWatcher.stop();
+            statusWatcher = null;
         }
     }
 